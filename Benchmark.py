@@ -0,0 +1,795 @@
+"""Benchmarks für den Budget-Rechner. Aufruf: python Benchmark.py [Name ...]
+Suite mit Baselines: python Benchmark.py suite [--speichern DATEI] [--vergleichen BASIS] bzw. vergleichen BASIS AKTUELL"""
+import io
+import os
+import json
+import platform
+import argparse
+import re
+import sys
+import time
+import random
+import shutil
+import tempfile
+import itertools
+import tracemalloc
+import subprocess
+import importlib.util
+try:
+    import resource # Nur unter Unix, misst die Speicherspitze der Kindprozesse
+except ImportError:
+    resource = None
+
+def budget_modul_laden():
+    """Lädt Budget-Rechner.py als Modul (der Bindestrich im Dateinamen verhindert einen normalen Import)."""
+    pfad = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Budget-Rechner.py")
+    spec = importlib.util.spec_from_file_location("budget_rechner", pfad)
+    modul = importlib.util.module_from_spec(spec)
+    sys.modules["budget_rechner"] = modul # Nötig, damit Worker-Prozesse die Funktionen finden
+    spec.loader.exec_module(modul)
+    return modul
+
+budget = budget_modul_laden()
+
+def zeit_messen(funktion, wiederholungen=3):
+    """Führt eine Funktion mehrmals aus und gibt die beste Laufzeit in Sekunden zurück."""
+    beste_zeit = None
+    for _ in range(wiederholungen):
+        start = time.perf_counter()
+        funktion()
+        dauer = time.perf_counter() - start
+        if beste_zeit is None or dauer < beste_zeit:
+            beste_zeit = dauer
+    return beste_zeit
+
+# --- BENCHMARKS ---
+
+def benchmark_brutto_zu_netto(anzahl=1_000_000):
+    """Vergleicht die Einzelberechnung in einer Schleife mit der Listen-Variante von brutto_zu_netto."""
+    zufall = random.Random(42)
+    einkommen = [zufall.uniform(0, 15000) for _ in range(anzahl)]
+    alter = [zufall.randint(18, 100) for _ in range(anzahl)]
+
+    def einzeln():
+        return [budget.brutto_zu_netto(e, a) for e, a in zip(einkommen, alter)]
+
+    def liste():
+        return budget.brutto_zu_netto_liste(einkommen, alter)
+
+    # Die Resultate müssen identisch sein (Stichprobe, da die Einzelschleife langsam ist).
+    netto, prozent = liste()
+    for i in range(0, anzahl, max(1, anzahl // 1000)):
+        assert budget.brutto_zu_netto(einkommen[i], alter[i]) == (netto[i], prozent[i])
+
+    zeit_einzeln = zeit_messen(einzeln, wiederholungen=1)
+    zeit_liste = zeit_messen(liste)
+    backend = "NumPy" if budget.np is not None else "Standardbibliothek"
+    print(f"brutto_zu_netto ({anzahl:,} Zeilen, {backend}):")
+    print(f"  Einzelschleife: {zeit_einzeln:.3f} s ({zeit_einzeln / anzahl * 1e9:.0f} ns/Zeile)")
+    print(f"  Listen-Variante: {zeit_liste:.3f} s ({zeit_liste / anzahl * 1e9:.0f} ns/Zeile)")
+    print(f"  Beschleunigung: {zeit_einzeln / zeit_liste:.1f}x")
+
+def benchmark_tarife(anzahl=1_000_000):
+    """Misst brutto_zu_netto_liste für jeden Tarif der Tarifdatei (der Wechsel darf nichts kosten)."""
+    zufall = random.Random(42)
+    einkommen = [zufall.uniform(0, 15000) for _ in range(anzahl)]
+    alter = [zufall.randint(18, 100) for _ in range(anzahl)]
+    print(f"Tarife ({anzahl:,} Zeilen):")
+    for kanton, (jahre, _) in budget.tarife_laden().items():
+        for jahr in jahre:
+            dauer = zeit_messen(lambda: budget.brutto_zu_netto_liste(einkommen, alter, budget.tarif_holen(kanton, jahr)))
+            print(f"  {kanton} {jahr}: {dauer:.3f} s ({dauer / anzahl * 1e9:.0f} ns/Zeile)")
+
+def konto_erzeugen(zufall, nummer, anzahl_kostenpunkte=6):
+    """Erzeugt einen zufälligen Account im Format von registrierung_finanzielle_daten."""
+    fixkosten = {posten: round(zufall.uniform(50, 2000), 2) for posten in budget.FIXKOSTEN}
+    variable_kosten = {f"Posten {i}": round(zufall.uniform(5, 500), 2) for i in range(max(0, anzahl_kostenpunkte - len(fixkosten)))}
+    benutzerdaten = {
+        "Vorname": f"Vorname{nummer}", "Name": f"Name{nummer}", "Alter": zufall.randint(18, 100),
+        "Aktuelles Gesamtvermögen": round(zufall.uniform(0, 200000), 2), "Finanzielle Reserve": round(zufall.uniform(0, 20000), 2),
+        "Einkommen Netto": round(zufall.uniform(2000, 12000), 2), "Einkommen Brutto": "nicht anwendbar",
+        "Fixkosten": fixkosten, "Variable Kosten": variable_kosten,
+        "Monatliche Gesamtkosten": sum(fixkosten.values()) + sum(variable_kosten.values()),
+    }
+    return budget.finanzen_berechnen(benutzerdaten)
+
+def alter_parser(dateiname):
+    """Die frühere Lade-Schleife aus daten_laden (Referenz für den Vergleich)."""
+    with open(dateiname, 'r') as file:
+        geladene_daten = {}
+        for line in file:
+            line = line.strip()
+            if not line or line.startswith("---"):
+                continue
+            if ":" in line:
+                key, value_str = line.split(":", 1)
+                key = key.strip()
+                value_str = value_str.strip()
+                if value_str.startswith("{") and value_str.endswith("}"):
+                    value = json.loads(value_str)
+                elif key in ["Aktuelles Gesamtvermögen", "Finanzielle Reserve", "Einkommen Netto", "Einkommen Brutto", "Monatliche Gesamtkosten", "Monatliches Ergebnis", "Alter"]:
+                    try:
+                        value = float(value_str)
+                        if key == "Alter": value = int(value)
+                    except ValueError:
+                        value = value_str
+                else:
+                    value = value_str
+                geladene_daten[key] = value
+    return geladene_daten
+
+def benchmark_parser(anzahl=100_000):
+    """Lädt viele Account-Dateien mit der alten Schleife und mit datei_parsen (aus Datei und aus dem Speicher)."""
+    zufall = random.Random(42)
+    verzeichnis = tempfile.mkdtemp(prefix="budget_parser_")
+    try:
+        dateien = []
+        for nummer in range(anzahl):
+            dateiname = os.path.join(verzeichnis, f"Name{nummer}_Vorname{nummer}.txt")
+            budget.datei_schreiben(dateiname, konto_erzeugen(zufall, nummer))
+            dateien.append(dateiname)
+        inhalte = []
+        for dateiname in dateien[:10000]:
+            with open(dateiname, 'r') as file:
+                inhalte.append(file.read())
+
+        for dateiname in dateien[:1000]:
+            assert budget.datei_parsen(dateiname) == alter_parser(dateiname)
+
+        zeit_alt = zeit_messen(lambda: [alter_parser(dateiname) for dateiname in dateien], wiederholungen=1)
+        zeit_neu = zeit_messen(lambda: [budget.datei_parsen(dateiname) for dateiname in dateien], wiederholungen=1)
+        zeit_speicher = zeit_messen(lambda: [budget.datei_parsen(io.StringIO(inhalt)) for inhalt in inhalte])
+        print(f"Parser ({anzahl:,} Dateien):")
+        print(f"  Alte Schleife: {zeit_alt:.2f} s ({zeit_alt / anzahl * 1e6:.1f} µs/Datei)")
+        print(f"  datei_parsen: {zeit_neu:.2f} s ({zeit_neu / anzahl * 1e6:.1f} µs/Datei), {zeit_alt / zeit_neu:.2f}x")
+        print(f"  datei_parsen aus dem Speicher: {zeit_speicher / len(inhalte) * 1e6:.1f} µs/Datei")
+    finally:
+        shutil.rmtree(verzeichnis)
+
+def benchmark_binaerformat(anzahl=10_000):
+    """Vergleicht das Laden von Text- und Binärdateien bei kleinen und grossen Accounts."""
+    zufall = random.Random(42)
+    print(f"Binärformat ({anzahl:,} Dateien):")
+    for kostenpunkte in (6, 200):
+        verzeichnis = tempfile.mkdtemp(prefix="budget_binaer_")
+        try:
+            textdateien, binaerdateien = [], []
+            for nummer in range(anzahl):
+                benutzerdaten = konto_erzeugen(zufall, nummer, kostenpunkte)
+                basis = os.path.join(verzeichnis, f"Name{nummer}_Vorname{nummer}")
+                budget.datei_schreiben(basis + budget.DATEI_ENDUNG, benutzerdaten)
+                budget.binaer_schreiben(basis + budget.DATEI_ENDUNG_BINAER, benutzerdaten)
+                textdateien.append(basis + budget.DATEI_ENDUNG)
+                binaerdateien.append(basis + budget.DATEI_ENDUNG_BINAER)
+            assert budget.konto_datei_laden(textdateien[0]) == budget.konto_datei_laden(binaerdateien[0])
+
+            zeit_text = zeit_messen(lambda: [budget.konto_datei_laden(dateiname) for dateiname in textdateien])
+            zeit_binaer = zeit_messen(lambda: [budget.konto_datei_laden(dateiname) for dateiname in binaerdateien])
+            print(f"  {kostenpunkte} Kostenpunkte: Text {zeit_text / anzahl * 1e6:.1f} µs/Datei, "
+                  f"Binär {zeit_binaer / anzahl * 1e6:.1f} µs/Datei ({zeit_text / zeit_binaer:.2f}x)")
+        finally:
+            shutil.rmtree(verzeichnis)
+
+def benchmark_kostenbuch(anzahl_posten=10_000, aenderungen=10_000):
+    """Misst das Nachführen der Gesamtkosten nach einzelnen Änderungen (früher: alles neu summieren)."""
+    zufall = random.Random(42)
+    kosten = {f"Posten {i}": zufall.uniform(5, 500) for i in range(anzahl_posten)}
+    posten = list(kosten)
+
+    def neu_summieren():
+        kopie = dict(kosten)
+        for i in range(aenderungen):
+            kopie[posten[i % anzahl_posten]] = float(i)
+            gesamt = sum(kopie.values())
+        return gesamt
+
+    def kostenliste():
+        benutzerdaten = {"Einkommen Netto": 5000.0, "Fixkosten": budget.Kostenliste(kosten)}
+        for i in range(aenderungen):
+            benutzerdaten["Fixkosten"][posten[i % anzahl_posten]] = float(i)
+            budget.finanzen_berechnen(benutzerdaten)
+        return benutzerdaten["Monatliche Gesamtkosten"]
+
+    zeit_alt = zeit_messen(neu_summieren, wiederholungen=1)
+    zeit_neu = zeit_messen(kostenliste)
+    print(f"Kostenbuch ({anzahl_posten:,} Posten, {aenderungen:,} Änderungen):")
+    print(f"  Neu summieren: {zeit_alt / aenderungen * 1e6:.1f} µs/Änderung")
+    print(f"  Kostenliste + finanzen_berechnen: {zeit_neu / aenderungen * 1e6:.1f} µs/Änderung")
+
+def benchmark_rappen(anzahl=1_000_000):
+    """Vergleicht das Summieren vieler Beträge als float mit der exakten Summe in Rappen (Zeit und Rundungsfehler)."""
+    zufall = random.Random(42)
+    betraege = [round(zufall.uniform(-5000, 5000), 2) for _ in range(anzahl)]
+    rappen = budget.rappen_array(betraege)
+    exakt = sum(round(betrag * 100) for betrag in betraege)
+    assert budget.rappen_summe(rappen) == exakt
+
+    zeit_float = zeit_messen(lambda: sum(betraege))
+    zeit_rappen = zeit_messen(lambda: budget.rappen_summe(rappen))
+    zeit_packen = zeit_messen(lambda: budget.rappen_array(betraege))
+    abweichung = abs(sum(betraege) * 100 - exakt)
+    backend = "NumPy" if budget.np is not None else "array('q')"
+    print(f"Rappen ({anzahl:,} Beträge, {backend}):")
+    print(f"  float-Summe: {zeit_float * 1e3:.1f} ms, Abweichung {abweichung:.2e} Rappen")
+    print(f"  Rappen-Summe: {zeit_rappen * 1e3:.1f} ms, exakt ({zeit_float / zeit_rappen:.1f}x)")
+    print(f"  Umwandlung in Rappen (einmalig bei der Eingabe): {zeit_packen * 1e3:.1f} ms")
+
+def benchmark_simulation(jahre=30, pfade=100_000):
+    """Misst die Monte-Carlo-Simulation (ganze Pfade als Arrays) für einen langen Zeitraum."""
+    simulieren = lambda: budget.vermoegen_simulieren(6000.0, 4500.0, 50000.0, jahre, ziel=500000.0, pfade=pfade, seed=42)
+    assert simulieren() == simulieren() # Gleicher Seed, gleiches Resultat
+    dauer = zeit_messen(simulieren)
+    simulation = simulieren()
+    backend = "NumPy" if budget.np is not None else "Standardbibliothek"
+    print(f"Simulation ({jahre} Jahre, {pfade:,} Pfade, {backend}): {dauer:.3f} s ({dauer / (pfade * jahre * 12) * 1e9:.1f} ns/Pfad-Monat)")
+    print(f"  Vermögen nach {jahre} Jahren: P5 {simulation.perzentile[5][-1]:,.0f}, P50 {simulation.perzentile[50][-1]:,.0f}, "
+          f"P95 {simulation.perzentile[95][-1]:,.0f}, Ziel erreicht: {simulation.ziel_wahrscheinlichkeit:.1%}")
+
+def benchmark_kostenprojektion(anzahl_posten=300, jahre=50):
+    """Misst den Aufbau der Kostenmatrix Posten × Monate mit Teuerung und Laufzeiten."""
+    zufall = random.Random(42)
+    fixkosten = {f"Posten {i}": round(zufall.uniform(5, 500), 2) for i in range(anzahl_posten)}
+    dynamik = {}
+    for posten in fixkosten:
+        angaben = {"wachstum": zufall.choice([0.0, 0.01, 0.02, 0.05])}
+        if zufall.random() < 0.2:
+            angaben["ab"] = f"{zufall.randint(2026, 2040)}-{zufall.randint(1, 12):02d}"
+        if zufall.random() < 0.2:
+            angaben["bis"] = f"{zufall.randint(2041, 2070)}-{zufall.randint(1, 12):02d}"
+        dynamik[posten] = angaben
+    benutzerdaten = {"Einkommen Netto": 60000.0, "Aktuelles Gesamtvermögen": 10000.0, "Fixkosten": fixkosten, "Kosten Dynamik": {"Fixkosten": dynamik}}
+
+    dauer = zeit_messen(lambda: budget.kosten_projektion(benutzerdaten, jahre * 12), wiederholungen=5)
+    backend = "NumPy" if budget.np is not None else "Standardbibliothek"
+    print(f"Kostenprojektion ({anzahl_posten} Posten × {jahre * 12} Monate, {backend}): {dauer * 1e3:.1f} ms")
+
+def benchmark_sparziele(anzahl_ziele=500, wiederholungen=100):
+    """Misst die Planung vieler Sparziele mit Prioritäten und Fristen (mit und ohne Kostenprojektion)."""
+    zufall = random.Random(42)
+    benutzerdaten = konto_erzeugen(zufall, 0)
+    benutzerdaten["Einkommen Netto"] = 12000.0
+    budget.finanzen_berechnen(benutzerdaten)
+    benutzerdaten[budget.SPARZIELE] = [{"name": f"Ziel {i}", "betrag": round(zufall.uniform(500, 50000), 2), "prioritaet": zufall.randint(1, 5),
+                                        "frist": f"{zufall.randint(2027, 2075)}-{zufall.randint(1, 12):02d}"} for i in range(anzahl_ziele)]
+    zeit_konstant = zeit_messen(lambda: [budget.konto_sparziele_planen(benutzerdaten) for _ in range(wiederholungen)]) / wiederholungen
+    budget.kosten_dynamik_setzen(benutzerdaten, "Fixkosten", budget.FIXKOSTEN[0], 0.02)
+    zeit_projektion = zeit_messen(lambda: [budget.konto_sparziele_planen(benutzerdaten) for _ in range(wiederholungen)]) / wiederholungen
+    print(f"Sparziele ({anzahl_ziele} Ziele, {budget.PROJEKTION_MONATE // 12} Jahre):")
+    print(f"  Gleichbleibende Sparquote: {zeit_konstant * 1e3:.2f} ms")
+    print(f"  Mit Kostenprojektion: {zeit_projektion * 1e3:.2f} ms")
+
+def benchmark_sensitivitaet():
+    """Misst ein grosses Sensitivitätsraster (kalt und mit gefülltem Netto-Cache) gegen die Einzelberechnung pro Variante."""
+    benutzerdaten = konto_erzeugen(random.Random(42), 0)
+    einkommen = [float(e) for e in range(2000, 20000, 100)]
+    alter = list(range(18, 101))
+    aenderungen = {art: [p / 100 for p in range(-20, 21, 5)] for art in budget.KOSTEN_ARTEN}
+    anzahl = len(einkommen) * len(alter) * 9 * 9
+
+    def einzeln(stichprobe=2000):
+        # Frühere Vorgehensweise: jede Variante einzeln durch brutto_zu_netto und finanzen_berechnen
+        zufall = random.Random(1)
+        for _ in range(stichprobe):
+            variante = dict(benutzerdaten, **{art: {p: b * (1 + zufall.choice(aenderungen[art])) for p, b in benutzerdaten[art].items()} for art in budget.KOSTEN_ARTEN})
+            variante["Einkommen Netto"] = budget.brutto_zu_netto(zufall.choice(einkommen), zufall.choice(alter))[0]
+            budget.finanzen_berechnen(variante)
+        return stichprobe
+
+    budget.NETTO_CACHE.leeren()
+    zeit_kalt = zeit_messen(lambda: budget.sensitivitaet_berechnen(benutzerdaten, einkommen, alter, aenderungen, ziel=50000.0), wiederholungen=1)
+    zeit_warm = zeit_messen(lambda: budget.sensitivitaet_berechnen(benutzerdaten, einkommen, alter, aenderungen, ziel=50000.0))
+    zeit_einzeln = zeit_messen(einzeln, wiederholungen=1) / 2000
+    statistik = budget.NETTO_CACHE.statistik()
+    print(f"Sensitivität ({anzahl:,} Varianten):")
+    print(f"  Einzeln (hochgerechnet): {zeit_einzeln * anzahl:.1f} s ({zeit_einzeln * 1e6:.1f} µs/Variante)")
+    print(f"  Raster, leerer Cache: {zeit_kalt * 1e3:.1f} ms")
+    print(f"  Raster, gefüllter Cache: {zeit_warm * 1e3:.1f} ms (Trefferquote {statistik['trefferquote']:.1%})")
+
+def benchmark_sitzungen(anzahl=2000):
+    """Spielt eine aufgezeichnete Sitzung (Login, Ergebnis, Zukunftsszenario) viele Male ohne Tastatur ab."""
+    verzeichnis = tempfile.mkdtemp(prefix="budget_sitzung_")
+    arbeitsverzeichnis = os.getcwd()
+    try:
+        os.chdir(verzeichnis)
+        benutzerdaten = konto_erzeugen(random.Random(42), 0)
+        benutzerdaten["Einkommen Netto"] = 12000.0
+        dateiname = budget.SPEICHER.speichern(budget.finanzen_berechnen(benutzerdaten))
+        eingaben = ["2", dateiname, "1", "3", "nein", "10", "nein", "3", "ja", "Auto", "30000"]
+        protokoll = budget.sitzung_abspielen(eingaben)
+        assert "Geschätztes Gesamtvermögen nach 10 Jahren" in protokoll and "Sparziel: 'Auto'" in protokoll
+
+        dauer = zeit_messen(lambda: [budget.sitzung_abspielen(eingaben) for _ in range(anzahl)])
+        with open(os.devnull, 'w') as nichts:
+            dauer_datei = zeit_messen(lambda: [budget.sitzung_abspielen(eingaben, nichts) for _ in range(anzahl)])
+        print(f"Sitzungen ({anzahl:,} Wiedergaben à {len(eingaben)} Eingaben, {len(protokoll.splitlines())} Zeilen Ausgabe):")
+        print(f"  In den Speicher: {anzahl / dauer:,.0f} Sitzungen/s ({dauer / anzahl * 1e6:.0f} µs/Sitzung)")
+        print(f"  Nach {os.devnull}: {anzahl / dauer_datei:,.0f} Sitzungen/s")
+    finally:
+        os.chdir(arbeitsverzeichnis)
+        shutil.rmtree(verzeichnis)
+
+def benchmark_menue(zyklen=100_000):
+    """Spielt sehr viele An- und Abmeldungen in einer Sitzung ab (konstante Stacktiefe und konstanter Speicher)."""
+    verzeichnis = tempfile.mkdtemp(prefix="budget_menue_")
+    arbeitsverzeichnis = os.getcwd()
+    rekursionslimit = sys.getrecursionlimit()
+    try:
+        os.chdir(verzeichnis)
+        dateiname = budget.SPEICHER.speichern(konto_erzeugen(random.Random(42), 0))
+
+        def sitzung(anzahl, mit_protokoll=False):
+            # Anmelden, Ergebnis anzeigen, abmelden und am Schluss beenden
+            eingaben = itertools.chain(itertools.chain.from_iterable(itertools.repeat(("2", dateiname, "1", "6"), anzahl)), ["3"])
+            if mit_protokoll:
+                return budget.sitzung_abspielen(eingaben)
+            with open(os.devnull, 'w') as nichts:
+                budget.sitzung_abspielen(eingaben, nichts)
+
+        sys.setrecursionlimit(200) # Mit dem früheren rekursiven Abmelden bricht die Sitzung nach wenigen Zyklen ab
+        protokoll = sitzung(1000, mit_protokoll=True)
+        anmeldungen = protokoll.count("erfolgreich geladen.")
+        assert anmeldungen == 1000, f"{anmeldungen} statt 1000 Anmeldungen im Protokoll"
+        assert protokoll.rstrip().endswith("Auf Wiedersehen!"), "Die Sitzung endete nicht über das Hauptmenü"
+        tracemalloc.start()
+        sitzung(1000)
+        speicher_kurz = tracemalloc.get_traced_memory()[1]
+        tracemalloc.reset_peak()
+        sitzung(10 * 1000)
+        speicher_lang = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        # Zehnmal mehr Zyklen dürfen kaum mehr Speicher brauchen (sonst wächst etwas pro An-/Abmeldung)
+        assert speicher_lang <= speicher_kurz * 1.2, f"Speicherspitze wächst mit den Zyklen: {speicher_kurz} -> {speicher_lang} Bytes"
+        dauer = zeit_messen(lambda: sitzung(zyklen), wiederholungen=1)
+        print(f"Menü ({zyklen:,} An-/Abmeldungen in einer Sitzung, Rekursionslimit 200):")
+        print(f"  {dauer:.2f} s ({dauer / zyklen * 1e6:.0f} µs/Zyklus)")
+        print(f"  Speicherspitze: {speicher_kurz / 1024:.0f} KiB bei 1'000 Zyklen, {speicher_lang / 1024:.0f} KiB bei 10'000 Zyklen")
+    finally:
+        sys.setrecursionlimit(rekursionslimit)
+        os.chdir(arbeitsverzeichnis)
+        shutil.rmtree(verzeichnis)
+
+def benchmark_kontoauszug(anzahl=1_000_000, anzahl_regeln=2000):
+    """Importiert einen grossen Kontoauszug (CSV) und vergleicht die Zuordnung mit einer Regex-Suche pro Regel und Zeile."""
+    zufall = random.Random(42)
+    regeln = dict(budget.IMPORT_STANDARD_REGELN)
+    for nummer in range(anzahl_regeln):
+        regeln[f"haendler{nummer}"] = ("Variable Kosten", f"Kategorie {nummer % 50}")
+    haendler = [f"{stichwort.upper()} {zufall.randint(1000, 9999)} {ort}" for stichwort in list(regeln)[:300]
+                for ort in ("ZUERICH", "BERN", "BASEL")] + [f"UNBEKANNT {nummer}" for nummer in range(100)]
+    verzeichnis = tempfile.mkdtemp(prefix="budget_import_")
+    try:
+        pfad = os.path.join(verzeichnis, "auszug.csv")
+        with open(pfad, 'w', encoding='utf-8') as datei:
+            datei.write("Datum;Buchungstext;Betrag;Saldo\n")
+            for _ in range(anzahl):
+                betrag = zufall.randint(-50000, 5000) / 100
+                datei.write(f"{zufall.randint(1, 28):02d}.{zufall.randint(1, 12):02d}.2025;{zufall.choice(haendler)};{betrag:.2f};0.00\n")
+
+        auszug = None
+        def importieren():
+            nonlocal auszug
+            auszug = budget.kontoauszug_lesen(pfad)
+        zeit_lesen = zeit_messen(importieren, wiederholungen=1)
+        zeit_zuordnen = zeit_messen(lambda: budget.kontoauszug_zuordnen(auszug, regeln))
+
+        # Frühere Vorgehensweise: jede Zeile gegen jede Regel als regulären Ausdruck prüfen (Stichprobe, hochgerechnet)
+        muster = [(re.compile(r"\b" + re.escape(stichwort) + r"\b", re.IGNORECASE), ziel) for stichwort, ziel in regeln.items()]
+        stichprobe = [zufall.choice(haendler) for _ in range(500)]
+        def regex_suche():
+            for text in stichprobe:
+                next((ziel for regex, ziel in muster if regex.search(text)), None)
+        zeit_regex = zeit_messen(regex_suche, wiederholungen=1) / len(stichprobe)
+
+        backend = "NumPy" if budget.np is not None else "Standardbibliothek"
+        print(f"Kontoauszug ({anzahl:,} Zeilen, {len(regeln):,} Regeln, {backend}):")
+        print(f"  Einlesen und summieren: {zeit_lesen:.2f} s ({anzahl / zeit_lesen:,.0f} Zeilen/s)")
+        print(f"  Zuordnen ({len(auszug.ausgaben):,} verschiedene Texte): {zeit_zuordnen * 1e3:.2f} ms")
+        print(f"  Regex pro Regel und Zeile (hochgerechnet): {zeit_regex * anzahl:.0f} s")
+    finally:
+        shutil.rmtree(verzeichnis)
+
+def benchmark_verlauf(anzahl_konten=100_000, jahre=20):
+    """Schreibt Monatsstände für viele Accounts über viele Jahre und misst Abfragen über alle Accounts und pro Account."""
+    if budget.np is None:
+        print("Verlauf: Benchmark benötigt NumPy für die Testdaten.")
+        return
+    np = budget.np
+    zufall = np.random.default_rng(42)
+    verzeichnis = tempfile.mkdtemp(prefix="budget_verlauf_")
+    try:
+        verlauf = budget.Verlauf(verzeichnis)
+        kennungen = [f"Name{nummer}_Vorname{nummer}" for nummer in range(anzahl_konten)]
+        erster_monat = budget.monat_nummer(2026 - jahre, 1)
+        einkommen = zufall.integers(300_000, 1_200_000, anzahl_konten)
+        vermoegen = zufall.integers(0, 10_000_000, anzahl_konten)
+        start = time.perf_counter()
+        for monat in range(erster_monat, erster_monat + jahre * 12):
+            kosten = (einkommen * zufall.uniform(0.5, 1.1, anzahl_konten)).astype(np.int64)
+            vermoegen += einkommen - kosten
+            werte = np.column_stack([vermoegen, einkommen, kosten // 2, kosten - kosten // 2, kosten, einkommen - kosten])
+            verlauf.monatsstaende_anhaengen(monat, kennungen, werte)
+        zeit_schreiben = time.perf_counter() - start
+        zeilen = verlauf.anzahl_zeilen()
+
+        def alle_konten():
+            monate, summen, _ = verlauf.monatssummen(budget.VERLAUF_KENNZAHLEN)
+            return budget.verlauf_auswerten(monate, summen)
+        zeit_alle = zeit_messen(alle_konten)
+        zeit_bereich = zeit_messen(lambda: verlauf.monatssummen(["Monatliche Gesamtkosten"], von=erster_monat + 12 * (jahre - 1)))
+        stichprobe = [kennungen[nummer] for nummer in zufall.integers(0, anzahl_konten, 1000)]
+        zeit_konto = zeit_messen(lambda: [budget.verlauf_auswerten(*verlauf.konto_staende(kennung)) for kennung in stichprobe]) / len(stichprobe)
+        # Ein einzelner Stand beim Speichern (ersetzt den Stand des letzten Monats)
+        zeit_anhaengen = zeit_messen(lambda: verlauf.anhaengen(kennungen[0], erster_monat + jahre * 12 - 1, [1, 2, 3, 4, 5, 6]), wiederholungen=20)
+
+        auswertung = alle_konten()
+        print(f"Verlauf ({anzahl_konten:,} Accounts × {jahre * 12} Monate = {zeilen:,} Stände, "
+              f"{sum(os.path.getsize(os.path.join(verzeichnis, name)) for name in os.listdir(verzeichnis)) / 2**20:,.0f} MiB):")
+        print(f"  Schreiben (ein Monatsabschluss pro Aufruf): {zeit_schreiben:.1f} s")
+        print(f"  Alle Accounts, {jahre} Jahre, 12-Monats-Kennzahlen: {zeit_alle * 1e3:.0f} ms "
+              f"(Sparquote zuletzt {auswertung.sparquote_12m[-1]:.1%})")
+        print(f"  Alle Accounts, letztes Jahr (Bereichsabfrage): {zeit_bereich * 1e3:.0f} ms")
+        print(f"  Ein Account, ganzer Verlauf mit Auswertung: {zeit_konto * 1e3:.2f} ms")
+        print(f"  Stand beim Speichern festhalten: {zeit_anhaengen * 1e3:.2f} ms")
+    finally:
+        shutil.rmtree(verzeichnis)
+
+def benchmark_konto_cache(anzahl=200, logins=20, kostenpunkte=200):
+    """Misst wiederholte Logins mit und ohne Account-Cache sowie das Speichern mit Sperre."""
+    zufall = random.Random(42)
+    verzeichnis = tempfile.mkdtemp(prefix="budget_cache_")
+    arbeitsverzeichnis = os.getcwd()
+    try:
+        dateinamen = []
+        for nummer in range(anzahl):
+            dateiname = os.path.join(verzeichnis, f"Name{nummer}_Vorname{nummer}{budget.DATEI_ENDUNG}")
+            budget.datei_schreiben(dateiname, konto_erzeugen(zufall, nummer, kostenpunkte))
+            dateinamen.append(dateiname)
+        mit_cache = budget.DateiSpeicher()
+        ohne_cache = budget.DateiSpeicher(cache_groesse=0)
+        assert mit_cache.laden(dateinamen[0]) == ohne_cache.laden(dateinamen[0])
+        zeit_mit = zeit_messen(lambda: [mit_cache.laden(dateiname) for _ in range(logins) for dateiname in dateinamen])
+        zeit_ohne = zeit_messen(lambda: [ohne_cache.laden(dateiname) for _ in range(logins) for dateiname in dateinamen])
+
+        def speichern():
+            for dateiname in dateinamen:
+                benutzerdaten = mit_cache.laden(dateiname)
+                benutzerdaten["Aktuelles Gesamtvermögen"] += 1
+                mit_cache.speichern(benutzerdaten)
+        os.chdir(verzeichnis) # speichern schreibt nach Name_Vorname.txt im aktuellen Verzeichnis
+        zeit_speichern = zeit_messen(speichern)
+        statistik = mit_cache.cache.statistik()
+        zugriffe = anzahl * logins
+        sperre = "fcntl" if budget.fcntl is not None else "keine"
+        print(f"Account-Cache ({anzahl} Accounts à {kostenpunkte} Kostenpunkte, je {logins} Logins):")
+        print(f"  Login ohne Cache: {zeit_ohne / zugriffe * 1e6:.1f} µs, mit Cache: {zeit_mit / zugriffe * 1e6:.1f} µs "
+              f"({zeit_ohne / zeit_mit:.1f}x, Trefferquote {statistik['trefferquote']:.1%})")
+        print(f"  Laden + Speichern (Sperre: {sperre}): {zeit_speichern / anzahl * 1e3:.2f} ms/Account")
+    finally:
+        os.chdir(arbeitsverzeichnis)
+        shutil.rmtree(verzeichnis)
+
+def benchmark_kontoindex(anzahl=100_000, abfragen=1000):
+    """Misst Präfix- und Tippfehlersuche im Account-Index im Vergleich zum Durchsuchen des Verzeichnisses."""
+    zufall = random.Random(42)
+    silben = ["ba", "ber", "ch", "del", "er", "gi", "hans", "ka", "li", "mei", "mo", "ner", "ri", "sch", "ta", "wy", "zu"]
+    def wort():
+        return "".join(zufall.choice(silben) for _ in range(zufall.randint(2, 4))).capitalize()
+    kennungen = sorted({f"{wort()}_{wort()}{budget.DATEI_ENDUNG}" for _ in range(anzahl)})
+    verzeichnis = tempfile.mkdtemp(prefix="budget_index_")
+    try:
+        for kennung in kennungen:
+            # Echte Accounts: der Index nimmt nur Dateien auf, die sich als Account laden lassen
+            name, _, vorname = kennung[:-len(budget.DATEI_ENDUNG)].partition("_")
+            budget.datei_schreiben(os.path.join(verzeichnis, kennung), {"Vorname": vorname, "Name": name, "Einkommen Netto": 5000.0})
+        start = time.perf_counter()
+        index = budget.Kontoindex(verzeichnis)
+        assert len(index) == len(kennungen), f"{len(index)} von {len(kennungen)} Accounts im Index"
+        zeit_aufbau = time.perf_counter() - start
+        zeit_einlesen = zeit_messen(lambda: len(budget.Kontoindex(verzeichnis)))
+
+        stichprobe = zufall.sample(kennungen, abfragen)
+        praefixe = [kennung[:zufall.randint(3, 8)] for kennung in stichprobe]
+        def tippfehler(text):
+            stelle = zufall.choice([stelle for stelle, zeichen in enumerate(text) if zeichen != "_"])
+            return text[:stelle] + zufall.choice("aeinrst") + text[stelle + 1:]
+        vertippt = [tippfehler(kennung[:-len(budget.DATEI_ENDUNG)]) for kennung in stichprobe]
+        zeit_scan = zeit_messen(lambda: [name for name in os.listdir(verzeichnis) if name.startswith(praefixe[0])], wiederholungen=1)
+        zeit_praefix = zeit_messen(lambda: [index.suchen(praefix) for praefix in praefixe]) / abfragen
+        assert all(index.suchen(praefix) for praefix in praefixe), "Präfixsuche ohne Treffer"
+        start = time.perf_counter()
+        index.aehnliche(vertippt[0])
+        zeit_varianten = time.perf_counter() - start
+        zeit_aehnlich = zeit_messen(lambda: [index.aehnliche(text) for text in vertippt]) / abfragen
+        gefunden = sum(kennung in index.aehnliche(text) for kennung, text in zip(stichprobe, vertippt))
+        assert gefunden == abfragen, f"Nur {gefunden} von {abfragen} vertippten Accounts gefunden"
+        print(f"Account-Index ({len(kennungen):,} Accounts):")
+        print(f"  Aufbau aus dem Verzeichnis: {zeit_aufbau:.2f} s, Einlesen der Indexdatei: {zeit_einlesen * 1e3:.0f} ms")
+        print(f"  Präfixsuche: {zeit_praefix * 1e6:.1f} µs (Verzeichnis durchsuchen: {zeit_scan * 1e3:.0f} ms)")
+        print(f"  Tippfehlersuche: {zeit_aehnlich * 1e6:.1f} µs, {gefunden / abfragen:.1%} unter den Vorschlägen "
+              f"(Namensverzeichnis beim ersten Aufruf: {zeit_varianten:.2f} s)")
+    finally:
+        shutil.rmtree(verzeichnis)
+
+def benchmark_profil(anzahl=1_000_000):
+    """Misst den Mehraufwand der Profil-Messung: ausgeschaltet (Originalfunktion) und eingeschaltet."""
+    zufall = random.Random(42)
+    betraege = [zufall.uniform(-1e6, 1e6) for _ in range(anzahl)]
+    konto = konto_erzeugen(zufall, 0, 20)
+    original = budget.format_waehrung
+
+    def formatieren():
+        format_waehrung = budget.format_waehrung
+        for betrag in betraege:
+            format_waehrung(betrag)
+    def berechnen():
+        for _ in range(anzahl // 10):
+            budget.finanzen_berechnen(konto)
+
+    zeit_format = zeit_messen(formatieren)
+    zeit_berechnen = zeit_messen(berechnen)
+    profil = budget.profil_starten()
+    try:
+        zeit_format_profil = zeit_messen(formatieren)
+        zeit_berechnen_profil = zeit_messen(berechnen)
+        werte = profil.messwerte()["funktionen"]
+    finally:
+        budget.profil_beenden()
+    assert budget.format_waehrung is original # Nach dem Beenden wieder die unveränderte Funktion
+    print(f"Profil ({anzahl:,} Aufrufe format_waehrung, {anzahl // 10:,} Aufrufe finanzen_berechnen):")
+    for name, ohne, mit, aufrufe in (("format_waehrung", zeit_format, zeit_format_profil, anzahl),
+                                     ("finanzen_berechnen", zeit_berechnen, zeit_berechnen_profil, anzahl // 10)):
+        print(f"  {name}: ausgeschaltet {ohne / aufrufe * 1e9:.0f} ns/Aufruf, eingeschaltet {mit / aufrufe * 1e9:.0f} ns/Aufruf "
+              f"(p50 {werte[name]['p50_s'] * 1e9:.0f} ns, p99 {werte[name]['p99_s'] * 1e9:.0f} ns)")
+
+def alte_waehrung(betrag):
+    """Die frühere Formatierung mit drei Ersetzungen (Referenz für den Vergleich)."""
+    return f"{betrag:,.2f} CHF".replace(",", "X").replace(".", ",").replace("X", ".")
+
+def alter_bericht(benutzerdaten, monat, ausgabe):
+    """Gleicher Text wie bericht_text, aber wie früher mit einem print pro Zeile und format_waehrung pro Betrag (Referenz)."""
+    breite = budget.BERICHT_BREITE - 22
+    print("=" * budget.BERICHT_BREITE, file=ausgabe)
+    print(f"MONATSBERICHT {monat}: {benutzerdaten['Vorname']} {benutzerdaten['Name']}", file=ausgabe)
+    print("=" * budget.BERICHT_BREITE, file=ausgabe)
+    for abschnitt, posten, betraege, mit_total in budget.bericht_abschnitte(benutzerdaten):
+        print(f"{abschnitt}:", file=ausgabe)
+        for nummer, (name, betrag) in enumerate(zip(posten, betraege)):
+            if mit_total and nummer == len(posten) - 1:
+                print("  " + "-" * (budget.BERICHT_BREITE - 2), file=ausgabe)
+            print(f"  {name:<{breite}.{breite}}{alte_waehrung(betrag):>20}", file=ausgabe)
+    print("=" * budget.BERICHT_BREITE, file=ausgabe)
+    print(file=ausgabe)
+
+def benchmark_berichte(anzahl=100_000, anzahl_betraege=1_000_000):
+    """Misst die Formatierung vieler Beträge und das Schreiben der Monatsberichte aller Accounts (Text, CSV, HTML)."""
+    zufall = random.Random(42)
+    verzeichnis = tempfile.mkdtemp(prefix="budget_berichte_")
+    try:
+        konten_verzeichnis = os.path.join(verzeichnis, "konten")
+        os.mkdir(konten_verzeichnis)
+        for nummer in range(anzahl):
+            budget.datei_schreiben(os.path.join(konten_verzeichnis, f"Name{nummer}_Vorname{nummer}{budget.DATEI_ENDUNG}"),
+                                   konto_erzeugen(zufall, nummer, 10))
+        # Über die Kommandozeile in einem eigenen Prozess, damit die Speicherspitze messbar ist. Das geschieht vor den
+        # übrigen Messungen, weil ein Kindprozess beim Start den Speicher dieses Prozesses mitzählt.
+        print(f"Monatsberichte für {anzahl:,} Accounts (python Budget-Rechner.py --berichte):")
+        for bericht_format, endung in budget.BERICHT_ENDUNGEN.items():
+            ziel = os.path.join(verzeichnis, "berichte" + endung)
+            start = time.perf_counter()
+            subprocess.run([sys.executable, budget.__file__, "--berichte", konten_verzeichnis, "--ausgabe", ziel],
+                           check=True, stdout=subprocess.DEVNULL)
+            dauer = time.perf_counter() - start
+            spitze = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024 if resource is not None else float("nan")
+            print(f"  {bericht_format}: {dauer:.1f} s ({anzahl / dauer:,.0f} Berichte/s), {os.path.getsize(ziel) / 1e6:.0f} MB, "
+                  f"Speicherspitze {spitze:.0f} MB")
+    finally:
+        shutil.rmtree(verzeichnis)
+
+    betraege = [zufall.uniform(-1e7, 1e7) for _ in range(anzahl_betraege)] + [0.0, -0.0, 1.115, 0.005, -0.004, float("inf")]
+    referenz = [alte_waehrung(betrag) for betrag in betraege]
+    assert [budget.format_waehrung(betrag) for betrag in betraege] == referenz == budget.format_waehrung_liste(betraege)
+    zeit_alt = zeit_messen(lambda: [alte_waehrung(betrag) for betrag in betraege])
+    zeit_neu = zeit_messen(lambda: [budget.format_waehrung(betrag) for betrag in betraege])
+    zeit_liste = zeit_messen(lambda: budget.format_waehrung_liste(betraege))
+    print(f"Beträge formatieren ({len(betraege):,}, Ausgabe identisch):")
+    print(f"  früher: {zeit_alt / len(betraege) * 1e9:.0f} ns, format_waehrung: {zeit_neu / len(betraege) * 1e9:.0f} ns, "
+          f"format_waehrung_liste: {zeit_liste / len(betraege) * 1e9:.0f} ns pro Betrag ({zeit_alt / zeit_liste:.1f}x)")
+
+    konten = [konto_erzeugen(zufall, nummer, 20) for nummer in range(1000)]
+    puffer = io.StringIO()
+    alter_bericht(konten[0], "2026-01", puffer)
+    assert puffer.getvalue() == budget.bericht_text(konten[0], "2026-01")
+    with open(os.devnull, "w", encoding="utf-8") as ausgabe:
+        zeit_alt = zeit_messen(lambda: [alter_bericht(benutzerdaten, "2026-01", ausgabe) for benutzerdaten in konten])
+        zeit_neu = zeit_messen(lambda: [ausgabe.write(budget.bericht_text(benutzerdaten, "2026-01")) for benutzerdaten in konten])
+    print(f"Monatsbericht (20 Kostenpunkte, gleicher Text): print pro Zeile {zeit_alt / len(konten) * 1e6:.1f} µs, "
+          f"ein String {zeit_neu / len(konten) * 1e6:.1f} µs pro Bericht ({zeit_alt / zeit_neu:.1f}x)")
+
+# --- SUITE MIT BASELINES ---
+# Eine feste Auswahl an Kennzahlen mit festen Zufallsdaten, jeweils als Sekunden pro Einheit (kleiner ist besser).
+# "suite --speichern basis.json" hält sie als Baseline fest, "suite --vergleichen basis.json" bzw.
+# "vergleichen basis.json aktuell.json" meldet alle Kennzahlen, die mehr als die Schwelle langsamer geworden sind.
+
+SUITE_POSTEN = (10, 100, 1_000, 10_000)
+
+def szenario_konto_erzeugen(zufall, nummer, anzahl_kostenpunkte):
+    """Wie konto_erzeugen, zusätzlich mit Teuerung und Laufzeiten für alle Kostenpunkte (für die Projektionen)."""
+    benutzerdaten = konto_erzeugen(zufall, nummer, anzahl_kostenpunkte)
+    for art in budget.KOSTEN_ARTEN:
+        for posten in benutzerdaten[art]:
+            ab = f"{zufall.randint(2026, 2040)}-{zufall.randint(1, 12):02d}" if zufall.random() < 0.2 else None
+            bis = f"{zufall.randint(2041, 2070)}-{zufall.randint(1, 12):02d}" if zufall.random() < 0.2 else None
+            budget.kosten_dynamik_setzen(benutzerdaten, art, posten, zufall.choice([0.0, 0.01, 0.02, 0.05]), ab, bis)
+    return benutzerdaten
+
+def suite_messen(anzahl_dateien=1_000):
+    """Führt alle Messungen der Suite aus: {Kennzahl: {"wert": Sekunden pro Einheit, "einheit": Einheit}}."""
+    messwerte = {}
+    def festhalten(name, sekunden, einheit):
+        messwerte[name] = {"wert": sekunden, "einheit": einheit}
+        print(f"  {name:<36} {sekunden * 1e6:>12.3f} µs/{einheit}")
+    zufall = random.Random(42)
+    print(f"Suite ({anzahl_dateien:,} Dateien, {'NumPy' if budget.np is not None else 'Standardbibliothek'}):")
+
+    betraege = [zufall.uniform(-1e7, 1e7) for _ in range(200_000)]
+    zeit = zeit_messen(lambda: [budget.format_waehrung(betrag) for betrag in betraege], wiederholungen=5)
+    festhalten("format_waehrung", zeit / len(betraege), "Aufruf")
+    zeit = zeit_messen(lambda: budget.format_waehrung_liste(betraege), wiederholungen=5)
+    festhalten("format_waehrung_liste", zeit / len(betraege), "Betrag")
+
+    einkommen = [zufall.uniform(0, 15000) for _ in range(100_000)]
+    alter = [zufall.randint(18, 100) for _ in range(100_000)]
+    zeit = zeit_messen(lambda: [budget.brutto_zu_netto(e, a) for e, a in zip(einkommen, alter)])
+    festhalten("brutto_zu_netto/einzeln", zeit / len(einkommen), "Zeile")
+    zeit = zeit_messen(lambda: budget.brutto_zu_netto_liste(einkommen, alter), wiederholungen=5)
+    festhalten("brutto_zu_netto/liste", zeit / len(einkommen), "Zeile")
+
+    # Ein Kostenpunkt wird geändert und das Ergebnis neu berechnet (wie im Menü "Kosten bearbeiten")
+    for anzahl_posten in SUITE_POSTEN:
+        benutzerdaten = konto_erzeugen(zufall, 0, anzahl_posten)
+        kosten = budget.kostenliste_holen(benutzerdaten, "Variable Kosten")
+        namen = list(kosten)
+        aenderungen = 10_000
+        def bearbeiten():
+            for runde in range(aenderungen):
+                kosten[namen[runde % len(namen)]] = float(runde % 500)
+                budget.finanzen_berechnen(benutzerdaten)
+        festhalten(f"finanzen_berechnen/{anzahl_posten}_posten", zeit_messen(bearbeiten) / aenderungen, "Änderung")
+
+    # Monatsbericht eines Accounts mit 20 Kostenpunkten als ein String
+    konten = [konto_erzeugen(zufall, nummer, 20) for nummer in range(1000)]
+    for bericht_format in ("text", "html"):
+        bericht = budget.BERICHT_FORMATE[bericht_format].bericht
+        zeit = zeit_messen(lambda: [bericht(benutzerdaten, "2026-01") for benutzerdaten in konten])
+        festhalten(f"bericht/{bericht_format}", zeit / len(konten), "Bericht")
+
+    # Szenarien: Kostenprojektion über 30 Jahre, Vermögensprognose und Reichweite darauf
+    for anzahl_posten in SUITE_POSTEN:
+        benutzerdaten = szenario_konto_erzeugen(zufall, 0, anzahl_posten)
+        def szenarien():
+            projektion = budget.projektion_holen(benutzerdaten, 30 * 12)
+            budget.vermoegen_prognose(benutzerdaten["Monatliches Ergebnis"], benutzerdaten["Aktuelles Gesamtvermögen"], 30, projektion)
+            budget.reichweite_berechnen(benutzerdaten["Monatliches Ergebnis"], benutzerdaten["Aktuelles Gesamtvermögen"], projektion)
+        festhalten(f"szenarien/{anzahl_posten}_posten", zeit_messen(szenarien), "Szenario")
+
+    # Speichern und Laden über das Datei-Backend (wie daten_speichern/daten_laden, ohne Rückfragen und ohne Cache)
+    arbeitsverzeichnis = os.getcwd()
+    for anzahl, anzahl_posten in ((anzahl_dateien, 10), (10, 10_000)):
+        konten = [konto_erzeugen(zufall, nummer, anzahl_posten) for nummer in range(anzahl)]
+        zeiten_speichern, zeiten_laden = [], []
+        for _ in range(3 if anzahl <= 10_000 else 1):
+            verzeichnis = tempfile.mkdtemp(prefix="budget_suite_")
+            try:
+                os.chdir(verzeichnis) # speichern schreibt nach Name_Vorname.txt im aktuellen Verzeichnis
+                speicher = budget.DateiSpeicher(cache_groesse=0)
+                start = time.perf_counter()
+                dateinamen = [speicher.speichern(benutzerdaten) for benutzerdaten in konten]
+                zeiten_speichern.append(time.perf_counter() - start)
+                start = time.perf_counter()
+                for dateiname in dateinamen:
+                    speicher.laden(dateiname)
+                zeiten_laden.append(time.perf_counter() - start)
+            finally:
+                os.chdir(arbeitsverzeichnis)
+                shutil.rmtree(verzeichnis)
+        festhalten(f"speichern/{anzahl}_dateien_{anzahl_posten}_posten", min(zeiten_speichern) / anzahl, "Datei")
+        festhalten(f"laden/{anzahl}_dateien_{anzahl_posten}_posten", min(zeiten_laden) / anzahl, "Datei")
+    return messwerte
+
+def suite_umgebung(anzahl_dateien):
+    """Angaben zur Messumgebung; Vergleiche zwischen verschiedenen Umgebungen sind nur bedingt aussagekräftig.
+    "referenz" ist die Laufzeit einer festen Python-Schleife und zeigt, ob die Maschine selbst gerade langsamer war."""
+    referenz = zeit_messen(lambda: sum(zahl * zahl for zahl in range(1_000_000)), wiederholungen=5)
+    return {"python": platform.python_version(), "numpy": getattr(budget.np, "__version__", None), "system": platform.platform(),
+            "prozessoren": os.cpu_count(), "dateien": anzahl_dateien, "referenz": referenz, "zeitpunkt": time.strftime("%Y-%m-%d %H:%M:%S")}
+
+def suite_vergleichen(basis, aktuell, schwelle=0.10):
+    """Vergleicht zwei Suite-Ergebnisse und gibt die Kennzahlen zurück, die um mehr als die Schwelle langsamer sind."""
+    for angabe in ("python", "numpy", "system", "dateien"):
+        if basis["umgebung"].get(angabe) != aktuell["umgebung"].get(angabe):
+            print(f"Hinweis: Andere Umgebung ({angabe}: {basis['umgebung'].get(angabe)} -> {aktuell['umgebung'].get(angabe)})")
+    maschine = aktuell["umgebung"]["referenz"] / basis["umgebung"]["referenz"]
+    if not 1 / (1 + schwelle) <= maschine <= 1 + schwelle:
+        print(f"Hinweis: Die Referenzschleife lief {maschine:.2f}x so lange wie bei der Baseline, die Werte sind kaum vergleichbar.")
+    print(f"{'Kennzahl':<36} {'Basis':>12} {'Aktuell':>12} {'Faktor':>7}")
+    langsamer = []
+    for name, wert in aktuell["messwerte"].items():
+        alt = basis["messwerte"].get(name)
+        if alt is None:
+            print(f"{name:<36} {'-':>12} {wert['wert'] * 1e6:>12.3f} {'neu':>7}")
+            continue
+        faktor = wert["wert"] / alt["wert"]
+        if faktor > 1 + schwelle:
+            langsamer.append(name)
+            markierung = "  LANGSAMER"
+        elif faktor < 1 / (1 + schwelle):
+            markierung = "  schneller"
+        else:
+            markierung = ""
+        print(f"{name:<36} {alt['wert'] * 1e6:>12.3f} {wert['wert'] * 1e6:>12.3f} {faktor:>6.2f}x{markierung}")
+    for name in basis["messwerte"].keys() - aktuell["messwerte"].keys():
+        print(f"{name:<36} fehlt in der aktuellen Messung")
+    print(f"{len(langsamer)} von {len(aktuell['messwerte'])} Kennzahlen mehr als {schwelle:.0%} langsamer (Werte in µs pro Einheit).")
+    return langsamer
+
+def suite_laden(pfad):
+    with open(pfad, 'r', encoding='utf-8') as datei:
+        return json.load(datei)
+
+def suite_starten(argumente):
+    """Kommandozeile der Suite; gibt den Exit-Code zurück (1, wenn eine Kennzahl langsamer geworden ist)."""
+    parser = argparse.ArgumentParser(prog="Benchmark.py suite", description="Benchmark-Suite mit JSON-Baselines")
+    parser.add_argument("--speichern", metavar="DATEI", help="Ergebnis als JSON speichern (z.B. als neue Baseline)")
+    parser.add_argument("--vergleichen", metavar="BASIS", help="Ergebnis mit einer gespeicherten Baseline vergleichen")
+    parser.add_argument("--schwelle", type=float, default=10.0, help="Erlaubte Verlangsamung in Prozent (Standard: 10)")
+    parser.add_argument("--dateien", type=int, default=1_000, help="Anzahl Dateien für Speichern/Laden (z.B. 100000)")
+    optionen = parser.parse_args(argumente)
+    ergebnis = {"umgebung": suite_umgebung(optionen.dateien), "messwerte": suite_messen(optionen.dateien)}
+    if optionen.speichern:
+        with open(optionen.speichern, 'w', encoding='utf-8') as datei:
+            json.dump(ergebnis, datei, ensure_ascii=False, indent=1)
+        print(f"Ergebnis gespeichert in {optionen.speichern}")
+    if optionen.vergleichen:
+        return 1 if suite_vergleichen(suite_laden(optionen.vergleichen), ergebnis, optionen.schwelle / 100) else 0
+    return 0
+
+def vergleichen_starten(argumente):
+    parser = argparse.ArgumentParser(prog="Benchmark.py vergleichen", description="Zwei gespeicherte Suite-Ergebnisse vergleichen")
+    parser.add_argument("basis")
+    parser.add_argument("aktuell")
+    parser.add_argument("--schwelle", type=float, default=10.0, help="Erlaubte Verlangsamung in Prozent (Standard: 10)")
+    optionen = parser.parse_args(argumente)
+    return 1 if suite_vergleichen(suite_laden(optionen.basis), suite_laden(optionen.aktuell), optionen.schwelle / 100) else 0
+
+BENCHMARKS = {
+    "brutto_zu_netto": benchmark_brutto_zu_netto,
+    "tarife": benchmark_tarife,
+    "parser": benchmark_parser,
+    "binaerformat": benchmark_binaerformat,
+    "kostenbuch": benchmark_kostenbuch,
+    "rappen": benchmark_rappen,
+    "simulation": benchmark_simulation,
+    "kostenprojektion": benchmark_kostenprojektion,
+    "sparziele": benchmark_sparziele,
+    "sensitivitaet": benchmark_sensitivitaet,
+    "sitzungen": benchmark_sitzungen,
+    "menue": benchmark_menue,
+    "kontoauszug": benchmark_kontoauszug,
+    "verlauf": benchmark_verlauf,
+    "konto_cache": benchmark_konto_cache,
+    "kontoindex": benchmark_kontoindex,
+    "profil": benchmark_profil,
+    "berichte": benchmark_berichte,
+}
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["suite"]:
+        sys.exit(suite_starten(sys.argv[2:]))
+    if sys.argv[1:2] == ["vergleichen"]:
+        sys.exit(vergleichen_starten(sys.argv[2:]))
+    namen = sys.argv[1:] or list(BENCHMARKS)
+    for name in namen:
+        if name not in BENCHMARKS:
+            print(f"Unbekannter Benchmark '{name}'. Verfügbar: {', '.join(BENCHMARKS)}")
+            sys.exit(1)
+        BENCHMARKS[name]()
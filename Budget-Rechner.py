@@ -1,584 +1,3957 @@
-import os #für das Hochladen späterer Dateien
-import json #Damit kann man die detaillierten Listen der Fix- und variablen Kosten in die Textdatei exportieren und später wieder in ein funktionsfähiges Python-Dictionary umwandeln.
-
-# Definiert die Standard-Fixkosten-Kategorien, die bei der Registrierung abgefragt werden.
-FIXKOSTEN = ["Wohnkosten (Miete/Hypothekarzins)", "Krankenkasse/Versicherungen", "Öffentlicher Verkehr/Auto", "Abos (Internet/Handy)"]
-# Datei-Endung für die Speicherung
-DATEI_ENDUNG = ".txt"
-
-def format_waehrung(betrag):
-    """Formatiert einen Betrag in das Schweizer Währungsformat (X'XXX.XX CHF)."""
-    # Verwendet die Tausendertrennzeichen-Logik des Originals, um CHF-Konventionen zu folgen.
-    return f"{betrag:,.2f} CHF".replace(",", "X").replace(".", ",").replace("X", ".")
-
-def eingabe_pruefung(anweisung, datentyp=float, positiv_erforderlich=True, min_wert=None, max_wert=None):
-    """Prüft, ob die Eingabe dem korrekten Datentyp entspricht und im gewünschten Bereich liegt."""
-    while True:
-        try:
-            eingabe = input(anweisung).strip().replace(',', '.') # Ersetzt Komma durch Punkt für Python-Float-Parsing
-            
-            if not eingabe:
-                raise ValueError("Eingabe darf nicht leer sein.")
-            
-            wert = datentyp(eingabe)
-
-            if positiv_erforderlich and wert < 0:
-                print("Fehler: Der Wert muss positiv sein.")
-                continue
-
-            if min_wert is not None and wert < min_wert:
-                print(f"Fehler: Der Wert muss mindestens {min_wert} sein.")
-                continue
-
-            if max_wert is not None and wert > max_wert:
-                print(f"Fehler: Der Wert darf maximal {max_wert} sein.")
-                continue
-
-            return wert
-
-        except ValueError:
-            typ_name = "Zahl" if datentyp in (float, int) else "Text"
-            print(f"Ungültige Eingabe. Bitte geben Sie eine gültige {typ_name} ein.")
-        except Exception as e:
-            print(f"Ein unerwarteter Fehler ist aufgetreten: {e}")
-
-def brutto_zu_netto(brutto_einkommen_monatlich, alter):
-    """Schätzt das Nettoeinkommen in der Schweiz (vereinfacht: AHV, BVG, Steuern)."""
-    
-    # 1. AHV/IV/EO/ALV: Konstante 6.2%
-    abzug_sozial = brutto_einkommen_monatlich * 0.062
-    
-    # 2. BVG (Pensionskasse) - Altersabhängig
-    if alter < 25: bvg_prozent = 0.0
-    elif alter <= 34: bvg_prozent = 0.04
-    elif alter <= 44: bvg_prozent = 0.07
-    else: bvg_prozent = 0.10
-        
-    abzug_bvg = brutto_einkommen_monatlich * bvg_prozent
-
-    # 3. Steuern - Einkommensabhängig (Pauschal)
-    brutto_einkommen_jahr = brutto_einkommen_monatlich * 12
-    if brutto_einkommen_jahr <= 60000: steuer_prozent = 0.05 
-    elif brutto_einkommen_jahr <= 100000: steuer_prozent = 0.10 
-    else: steuer_prozent = 0.15 
-
-    abzug_steuern = brutto_einkommen_monatlich * steuer_prozent
-
-    gesamtabzug = abzug_sozial + abzug_bvg + abzug_steuern
-    netto_einkommen = brutto_einkommen_monatlich - gesamtabzug
-    
-    gesamtabzug_prozent = 0.062 + bvg_prozent + steuer_prozent
-    
-    return netto_einkommen, gesamtabzug_prozent
-
-def finanzen_berechnen(benutzerdaten):
-    """Berechnet die monatliche Sparquote oder den Vermögensverzehr und aktualisiert das Dictionary."""
-    netto_einkommen = benutzerdaten.get("Einkommen Netto", 0.0)
-    gesamte_kosten = benutzerdaten.get("Monatliche Gesamtkosten", 0.0)
-
-    ergebnis = netto_einkommen - gesamte_kosten
-    benutzerdaten["Monatliches Ergebnis"] = ergebnis
-
-    if ergebnis > 0:
-        benutzerdaten["Ergebnis Art"] = "Monatliche Sparquote"
-    elif ergebnis < 0:
-        benutzerdaten["Ergebnis Art"] = "Monatlicher Vermögensverzehr"
-    else:   
-        benutzerdaten["Ergebnis Art"] = "Ausgeglichen" 
-    
-    return benutzerdaten
-
-# --- REGISTRIERUNG / HAUPT-ERFASSUNG ---
-
-def registrierung_persoenliche_daten(benutzerdaten):
-    """Erfasst Vorname, Nachname und Alter."""
-    print("\n--- Schritt 1: Persönliche Daten erfassen ---")
-    benutzerdaten["Vorname"] = input("Vorname: ").strip()
-    benutzerdaten["Name"] = input("Name: ").strip() # Korrigiert von 'Nachname' zu 'Name' (konsistent mit Speichern)
-    benutzerdaten["Alter"] = eingabe_pruefung("Alter (18-100): ", datentyp=int, min_wert=18, max_wert=100)
-    print("Persönliche Daten erfolgreich erfasst.")
-    return benutzerdaten
-        
-
-def registrierung_finanzielle_daten(benutzerdaten, vorgegebene_fixkosten): 
-    """Erfasst finanzielle Daten, berechnet Netto-Einkommen und Kosten."""
-    print("\n--- Schritt 2: Finanzielle Angaben erfassen ---")
-
-    # 1. Vermögen und Reserve
-    # BUG FIX: Hier wurde der Prompt-String zugewiesen, nicht das Ergebnis der Eingabeprüfung.
-    benutzerdaten["Aktuelles Gesamtvermögen"] = eingabe_pruefung("Aktuelles Gesamtvermögen in CHF: ")
-    benutzerdaten["Finanzielle Reserve"] = eingabe_pruefung("Finanzielle Reserve (Betrag für Notfälle) in CHF: ")
-
-    # 2. Einkommen
-    while True:
-        einkommen_wert = eingabe_pruefung("Monatliches Einkommen in CHF: ")
-        typ = input("Handelt es sich hierbei um ein 'brutto'- oder 'netto'-Einkommen? ").strip().lower()
-
-        if typ == 'brutto':
-            alter = benutzerdaten.get("Alter", 30)
-            netto_einkommen, abzug_prozent = brutto_zu_netto(einkommen_wert, alter)
-
-            benutzerdaten["Einkommen Brutto"] = einkommen_wert
-            benutzerdaten["Einkommen Netto"] = netto_einkommen
-            print(f"Totaler Abzug: {abzug_prozent*100:.2f}%")
-            print(f"Monatliches Nettoeinkommen: {format_waehrung(netto_einkommen)}")
-            break
-        elif typ == 'netto':
-            benutzerdaten["Einkommen Netto"] = einkommen_wert
-            benutzerdaten["Einkommen Brutto"] = "nicht anwendbar" 
-            print(f'--> Monatliches Nettoeinkommen: {format_waehrung(einkommen_wert)}')
-            break
-        else:
-            print("Ungültige Eingabe. Bitte geben Sie 'brutto' oder 'netto' ein.")
-
-    # 3. Fixkosten erfassen
-    print("\n--- Schritt 3: Fixkosten erfassen ---")
-    benutzerdaten["Fixkosten"] = {}
-    
-    for posten in vorgegebene_fixkosten:
-        wert = eingabe_pruefung(f'Monatliche Fixkosten für {posten} in CHF: ')
-        benutzerdaten["Fixkosten"][posten] = wert
-            
-    # 4. Variable Kosten (individuelle Posten)
-    print("\n--- Schritt 4: Variable Kosten erfassen ---")
-    benutzerdaten["Variable Kosten"] = {}
-    while True:
-        posten_name = input("Weiteren variablen Kostenpunkt benennen (z.B. 'Lebensmittel') oder 'ende' zum Abschliessen: ").strip()
-        if posten_name.lower() == 'ende':
-            break
-
-        wert = eingabe_pruefung(f"Monatliche Kosten für {posten_name} in CHF: ")
-        benutzerdaten["Variable Kosten"][posten_name] = wert
-
-    # Gesamtkosten berechnen
-    fixkosten_gesamt = sum(benutzerdaten["Fixkosten"].values())
-    variable_kosten_gesamt = sum(benutzerdaten["Variable Kosten"].values())
-    benutzerdaten["Monatliche Gesamtkosten"] = fixkosten_gesamt + variable_kosten_gesamt
-
-    # Berechnung des Ergebnisses und die Ausgabe
-    benutzerdaten = finanzen_berechnen(benutzerdaten)
-    ausgabe_basis_ergebnis(benutzerdaten)
-
-    return benutzerdaten
-
-# --- SPEICHERUNG / LADEN ---
-
-def daten_laden(benutzerdaten):
-    """Lädt die Daten aus einer Textdatei und stellt sie wieder her."""
-    print("\n--- Daten aus Textdatei laden ---")
-    dateiname = input("Name der zu ladenden Datei (z.B. 'Meier_Hans.txt'): ").strip()
-    
-    if not os.path.exists(dateiname):
-        print(f"Fehler: Datei '{dateiname}' wurde nicht gefunden.")
-        return None
-
-    try:
-        with open(dateiname, 'r') as file:
-            geladene_daten = {}
-            for line in file:
-                line = line.strip()
-                if not line or line.startswith("---"):
-                    continue
-                
-                if ":" in line:
-                    key, value_str = line.split(":", 1)
-                    key = key.strip()
-                    value_str = value_str.strip()
-                    
-                    # Logik: Prüfen, ob es sich um ein JSON-Dictionary (Kostenliste) handelt
-                    if value_str.startswith("{") and value_str.endswith("}"):
-                        value = json.loads(value_str)
-                    # Logik: Prüfen, ob es sich um eine Zahl (int/float) handelt, die RAW gespeichert wurde
-                    elif key in ["Aktuelles Gesamtvermögen", "Finanzielle Reserve", "Einkommen Netto", "Einkommen Brutto", "Monatliche Gesamtkosten", "Monatliches Ergebnis", "Alter"]:
-                        try:
-                            # Wir versuchen, den Wert direkt als Float zu parsen, da daten_speichern ihn RAW speichert.
-                            value = float(value_str)
-                            if key == "Alter": value = int(value)
-                        except ValueError:
-                            value = value_str # Fallback für "nicht anwendbar" oder Fehler
-                    # Logik: Standardmäßig als String behandeln
-                    else:
-                        value = value_str
-                        
-                    geladene_daten[key] = value
-
-            benutzerdaten.update(geladene_daten)
-            
-            # Wichtig: Nach dem Laden muss das Ergebnis neu berechnet werden, um 'Ergebnis Art' zu setzen.
-            if "Einkommen Netto" in benutzerdaten and "Monatliche Gesamtkosten" in benutzerdaten:
-                benutzerdaten = finanzen_berechnen(benutzerdaten)
-
-            print(f"Daten für {benutzerdaten.get('Vorname', '')} {benutzerdaten.get('Name', '')} erfolgreich geladen.")
-            return benutzerdaten
-
-    except Exception as e:
-        print(f"Fehler beim Lesen der Datei: {e}")
-        return None
-
-
-# Vorstellung durch Jana
-
-def daten_speichern(benutzerdaten):
-    """Speichert alle RAW-Daten (Zahlen als Zahlen, Listen als JSON-Strings) in einer Textdatei."""
-    if "Name" not in benutzerdaten or "Vorname" not in benutzerdaten:
-        print("Fehler: Name und Vorname fehlen. Speichern nicht möglich.")
-        return
-        
-    dateiname = f'{benutzerdaten["Name"]}_{benutzerdaten["Vorname"]}{DATEI_ENDUNG}'
-    
-    daten_zum_speichern = benutzerdaten.copy()
-
-    # Kosten-Dictionaries als JSON-String speichern
-    if "Fixkosten" in daten_zum_speichern:
-        daten_zum_speichern["Fixkosten"] = json.dumps(daten_zum_speichern["Fixkosten"])
-    if "Variable Kosten" in daten_zum_speichern:
-        # Key korrigiert und vereinheitlicht (Original hatte Inkonsistenzen)
-        daten_zum_speichern["Variable Kosten"] = json.dumps(daten_zum_speichern["Variable Kosten"])
-    
-    try:
-        with open(dateiname, 'w') as file:
-            file.write("--- Persönliche Daten ---\n")
-            
-            # Persönliche Daten (explizit zuerst)
-            for key in ["Vorname", "Name", "Alter"]:
-                if key in daten_zum_speichern:
-                    file.write(f"{key}: {daten_zum_speichern.pop(key)}\n")
-
-            file.write("\n--- Finanzielle Daten und Ergebnis ---\n")
-            # Alle übrigen Daten (Zahlen werden RAW gespeichert, um das Laden zu vereinfachen)
-            for key, value in daten_zum_speichern.items():
-                file.write(f"{key}: {value}\n")
-
-        print(f"\nDaten erfolgreich gespeichert in: *{dateiname}*")
-    
-    except Exception as e:
-        print(f"\nFehler beim Speichern der Datei: {e}")
-
-# --- ANPASSEN / SONDERSZENARIEN ---
-
-def zukunftsszenarien_berechnen(benutzerdaten):
-    """Berechnet die Szenarien C.1, C.2 und C.3."""
-    
-    # BUG FIX: Dictionary-Zugriff war fehlerhaft (benutzerdaten(...) statt benutzerdaten.get(...))
-    ergebnis = benutzerdaten.get("Monatliches Ergebnis", 0.0)
-    aktuelles_vermoegen = benutzerdaten.get("Aktuelles Gesamtvermögen", 0.0)
-    reserve = benutzerdaten.get("Finanzielle Reserve", 0.0)
-    
-    print("\n--- ZUKUNFTSSZENARIEN BERECHNEN ---")
-    
-    if ergebnis > 0:
-        # C.1/C.2: Sparquote vorhanden
-        print(f"Ihr Überschuss (Sparquote): {format_waehrung(ergebnis)}")
-        
-        wahl = input("Haben Sie ein spezifisches Sparziel (z.B. Auto)? (ja/nein): ").lower().strip()
-        
-        if wahl == 'ja':
-            # C.1: Spezifisches Sparziel
-            ziel_name = input("Name des Sparziels (z.B. 'Neues Auto'): ").strip()
-            ziel_kosten = eingabe_pruefung(f"Geschätzte Kosten für '{ziel_name}' in CHF: ")
-            
-            effektives_startkapital = aktuelles_vermoegen - reserve
-            zu_sparender_betrag = ziel_kosten - effektives_startkapital
-            
-            print("-" * 50)
-            if zu_sparender_betrag <= 0:
-                print(f"Gute Nachrichten: Sie können sich '{ziel_name}' (Kosten: {format_waehrung(ziel_kosten)}) sofort leisten,")
-                print(f"da Ihr freies Vermögen ({format_waehrung(effektives_startkapital)}) ausreicht.")
-                print(f"Restliches freies Vermögen danach: {format_waehrung(abs(zu_sparender_betrag))}")
-            else:
-                monate_benoetigt = zu_sparender_betrag / ergebnis
-                jahre = int(monate_benoetigt // 12)
-                monate = round(monate_benoetigt % 12) 
-                
-                print(f"Sparziel: '{ziel_name}' (Kosten: {format_waehrung(ziel_kosten)})")
-                print(f"Sie müssen noch {format_waehrung(zu_sparender_betrag)} ansparen.")
-                print(f"Benötigte Zeit, um das Sparziel zu erreichen: ca. {jahre} Jahre und {monate} Monate.")
-            print("-" * 50)
-            
-        else:
-            # C.2: Allgemeiner Vermögensaufbau
-            jahre_eingabe = eingabe_pruefung("Für wie viele Jahre soll der Vermögensaufbau berechnet werden?: ", datentyp=int, min_wert=1)
-            
-            gespart_in_jahren = ergebnis * jahre_eingabe * 12
-            gesamtvermoegen_prognose = aktuelles_vermoegen + gespart_in_jahren
-            
-            print("-" * 50)
-            print(f"Prognose (Vermögensaufbau in {jahre_eingabe} Jahren):")
-            print(f"Angesparter Betrag durch Sparquote: {format_waehrung(gespart_in_jahren)}")
-            print(f"Geschätztes Gesamtvermögen nach {jahre_eingabe} Jahren: {format_waehrung(gesamtvermoegen_prognose)}")
-            print("-" * 50)
-            
-    elif ergebnis < 0:
-        # C.3: Vermögensverzehr besteht
-        verzehr_monatlich = abs(ergebnis)
-        vermoegen_fuer_verzehr = aktuelles_vermoegen
-        
-        if vermoegen_fuer_verzehr <= 0:
-            reichweite_monate = 0
-            print("Ihr Verzehr kann aktuell nicht abgedeckt werden.")
-        else:
-            reichweite_monate = vermoegen_fuer_verzehr / verzehr_monatlich
-
-        jahre = int(reichweite_monate // 12)
-        monate = round(reichweite_monate % 12)
-
-        print(f"Ihr monatlicher Vermögensverzehr beträgt: {format_waehrung(verzehr_monatlich)}")
-        print("-" * 50)
-        print("Was passiert, wenn das Einkommen plötzlich wegfällt?")
-        print(f"Ihr bestehendes Vermögen ({format_waehrung(vermoegen_fuer_verzehr)}) reicht, um Ihre Ausgabesituation")
-        print(f"noch für ca. {jahre} Jahre und {monate} Monate abzudecken.")
-        print("-" * 50)
-    
-    else:
-        print("Ihr Budget ist ausgeglichen. Keine Spar-/Verzehrs-Szenarien berechenbar.")
-
-def daten_anpassen(benutzerdaten, vorgegebene_fixkosten):
-    """Ermöglicht die Anpassung der finanziellen Daten."""
-    
-    if not benutzerdaten:
-        print("Keine Daten geladen. Bitte registrieren Sie sich zuerst oder laden Sie eine Datei.")
-        return benutzerdaten
-
-    while True:
-        print("\n--- DATEN ANPASSEN ---")
-        print("1. Aktuelles Gesamtvermögen anpassen")
-        print("2. Finanzielle Reserve anpassen")
-        print("3. Monatliches Einkommen anpassen (Brutto/Netto neu eingeben)")
-        print("4. Fixkosten anpassen/ergänzen/löschen")
-        print("5. Variable Kosten anpassen/ergänzen/löschen")
-        print("6. Zurück zum Hauptmenü")
-        
-        wahl = input("Ihre Wahl (1-6): ").strip()
-
-        if wahl == '1':
-            benutzerdaten["Aktuelles Gesamtvermögen"] = eingabe_pruefung("Neues Gesamtvermögen in CHF: ")
-        elif wahl == '2':
-            benutzerdaten["Finanzielle Reserve"] = eingabe_pruefung("Neue finanzielle Reserve in CHF: ")
-        elif wahl == '3':
-            # BUG FIX: Der Aufruf musste das zweite Argument (vorgegebene_fixkosten) enthalten.
-            registrierung_finanzielle_daten(benutzerdaten, vorgegebene_fixkosten)
-        elif wahl == '4':
-            bearbeite_kosten(benutzerdaten, "Fixkosten")
-        elif wahl == '5':
-            bearbeite_kosten(benutzerdaten, "Variable Kosten")
-        elif wahl == '6':
-            # Nach jeder Änderung wird das Ergebnis neu berechnet
-            benutzerdaten = finanzen_berechnen(benutzerdaten)
-            ausgabe_basis_ergebnis(benutzerdaten)
-            return benutzerdaten
-        else:
-            print("Ungültige Wahl.")
-            continue
-            
-        # Nach jeder Änderung die Gesamtkosten und das Ergebnis neu berechnen
-        fixkosten_gesamt = sum(benutzerdaten.get("Fixkosten", {}).values())
-        variable_kosten_gesamt = sum(benutzerdaten.get("Variable Kosten", {}).values())
-        
-        benutzerdaten["Monatliche Gesamtkosten"] = fixkosten_gesamt + variable_kosten_gesamt
-        benutzerdaten = finanzen_berechnen(benutzerdaten)
-        ausgabe_basis_ergebnis(benutzerdaten) # Zeigt das aktuelle Ergebnis nach der Änderung
-
-def bearbeite_kosten(benutzerdaten, kosten_art):
-    """Hilfsfunktion zum Bearbeiten von Fix- oder variablen Kosten."""
-    kosten_dict = benutzerdaten.get(kosten_art, {})
-    
-    if kosten_dict == {}:
-        benutzerdaten[kosten_art] = {}
-        kosten_dict = benutzerdaten[kosten_art]
-
-    while True:
-        print(f"\n--- {kosten_art} bearbeiten ---")
-        if not kosten_dict:
-            print("Aktuell sind keine Kostenpunkte erfasst.")
-        else:
-            print("Aktuelle Kostenpunkte:")
-            for idx, (posten, wert) in enumerate(kosten_dict.items()):
-                print(f"{idx+1}. {posten}: {format_waehrung(wert)}")
-        
-        print("\nOptionen:")
-        print("A. Neuen Posten hinzufügen")
-        print("B. Bestehenden Posten ändern")
-        print("C. Bestehenden Posten löschen")
-        print("D. Zurück zur Datenanpassung")
-        
-        wahl = input("Ihre Wahl (A/B/C/D): ").upper().strip()
-        
-        if wahl == 'A':
-            posten_name = input("Name des neuen Postens: ").strip()
-            if posten_name:
-                wert = eingabe_pruefung(f"Monatliche Kosten für {posten_name} in CHF: ")
-                kosten_dict[posten_name] = wert
-                print(f"Posten '{posten_name}' hinzugefügt.")
-        
-        elif wahl == 'B':
-            if not kosten_dict:
-                print("Keine Posten zum Ändern.")
-                continue
-            posten_zu_aendern = input("Name des Postens, den Sie ändern möchten: ").strip()
-            if posten_zu_aendern in kosten_dict:
-                neuer_wert = eingabe_pruefung(f"Neuer Wert für {posten_zu_aendern} in CHF: ")
-                kosten_dict[posten_zu_aendern] = neuer_wert
-                print(f"Posten '{posten_zu_aendern}' aktualisiert.")
-            else:
-                print("Posten nicht gefunden.")
-                
-        elif wahl == 'C':
-            if not kosten_dict:
-                print("Keine Posten zum Löschen.")
-                continue
-            posten_zu_loeschen = input("Name des Postens, den Sie löschen möchten: ").strip()
-            if posten_zu_loeschen in kosten_dict:
-                del kosten_dict[posten_zu_loeschen]
-                print(f"Posten '{posten_zu_loeschen}' gelöscht.")
-            else:
-                print("Posten nicht gefunden.")
-                
-        elif wahl == 'D':
-            benutzerdaten[kosten_art] = kosten_dict 
-            return
-            
-        else:
-            print("Ungültige Wahl.")
-
-# Vorstellung durch Rouven 
-
-# --- AUSGABE-FUNKTIONEN ---
-
-def ausgabe_basis_ergebnis(benutzerdaten):
-    """Zeigt das aktuelle monatliche Budgetergebnis an."""
-    ergebnis = benutzerdaten.get("Monatliches Ergebnis", 0.0)
-    netto = benutzerdaten.get("Einkommen Netto", 0.0)
-    kosten = benutzerdaten.get("Monatliche Gesamtkosten", 0.0)
-    ergebnis_art = benutzerdaten.get("Ergebnis Art")
-
-    print("\n"+"="*60)
-    print("AKTUELLES BUDGET-ERGEBNIS")
-    print("="*60)
-    print(f"Monatliches Nettoeinkommen: {format_waehrung(netto)}")
-    print(f"Monatliche Gesamtkosten: {format_waehrung(kosten)}")
-    print("-" * 60)
-    input("""Drücken Sie die "Enter"-Taste, um fortzufahren""") #hilft zur Ansicht, dass nicht direkt das Haupt-Menü im Terminal geöffnet wird
-
-    if ergebnis > 0:
-        print(f"{ergebnis_art}: {format_waehrung(ergebnis)}")
-    elif ergebnis < 0:
-        print(f"{ergebnis_art}: {format_waehrung(abs(ergebnis))}")
-    else:
-        print(ergebnis_art)
-    print("="*60)
-
-def haupt_menue(benutzerdaten, vorgegebene_fixkosten):
-    """Menü für registrierte/geladene Benutzer."""
-    
-    while True:
-        print(f"\nWillkommen zurück, {benutzerdaten.get('Vorname', 'User')}! (Hauptmenü)")
-        print("1. Aktuelles Budget-Ergebnis anzeigen")
-        print("2. Finanzielle Daten anpassen")
-        print("3. Zukunftsszenarien berechnen (Sparen/Verzehr)")
-        print("4. Änderungen speichern (Textdatei exportieren)")
-        print("5. Account löschen und abmelden")
-        print("6. Abmelden (Zurück zum Start)")
-        
-        wahl = input("Ihre Wahl (1-6): ").strip()
-        
-        if wahl == '1':
-            ausgabe_basis_ergebnis(benutzerdaten)
-        elif wahl == '2':
-            # BUG FIX: Muss die fixen Kosten für den Unter-Flow mitgeben
-            benutzerdaten = daten_anpassen(benutzerdaten, vorgegebene_fixkosten)
-        elif wahl == '3':
-            zukunftsszenarien_berechnen(benutzerdaten)
-        elif wahl == '4':
-            daten_speichern(benutzerdaten)
-        elif wahl == '5':
-            if daten_loeschen(benutzerdaten):
-                return None
-        elif wahl == '6':
-            print("Abgemeldet. Zurück zum Startbildschirm.")
-            start_programm()    
-        else:
-            print("Ungültige Wahl.")
-
-def daten_loeschen(benutzerdaten):
-    """Löscht die gespeicherte Textdatei und den aktuellen Account."""
-    if "Name" not in benutzerdaten or "Vorname" not in benutzerdaten:
-        print("Kein Account geladen, es gibt nichts zu löschen.")
-        return False
-        
-    dateiname = f'{benutzerdaten["Name"]}_{benutzerdaten["Vorname"]}{DATEI_ENDUNG}'
-    
-    bestaetigung = input(f"Sind Sie sicher, dass Sie Ihren Account und die Datei '{dateiname}' löschen möchten? (ja/nein): ").lower().strip()
-    
-    if bestaetigung == 'ja':
-        try:
-            if os.path.exists(dateiname):
-                os.remove(dateiname)
-                print(f"Account und Datei '{dateiname}' erfolgreich gelöscht.")
-                return True
-            else:
-                print(f"Warnung: Die Datei '{dateiname}' existiert nicht (mehr) auf dem System.")
-                return True
-        except Exception as e:
-            print(f"Fehler beim Löschen der Datei: {e}")
-            return False
-    else:
-        print("Löschvorgang abgebrochen.")
-        return False
-
-
-# --- PROGRAMM START (HAUPT-LOOP) ---
-
-def start_programm():
-    """Startet das Programm und die Hauptschleife."""
-    
-    benutzerdaten = None
-    vorgegebene_fixkosten = FIXKOSTEN # Nutzt die vordefinierte Konstante
-    
-    print("\n" + "="*60)
-    print("WILKOMMEN ZUM BUDGET-PLANER")
-    print("="*60)
-
-    while True:
-        
-        if benutzerdaten:
-            # Wenn Daten geladen sind, direkt ins Hauptmenü
-            benutzerdaten = haupt_menue(benutzerdaten, vorgegebene_fixkosten)
-            continue
-        
-        # Startbildschirm (wenn keine Daten geladen)
-        print("\nHauptmenü:")
-        print("1. Neu registrieren und Daten erfassen")
-        print("2. Bestehende Textdatei hochladen/einloggen")
-        print("3. Programm beenden")
-
-        wahl = input("Ihre Wahl (1/2/3): ").strip()
-
-        if wahl == '1':
-            # Szenario Registrierung
-            benutzerdaten = {}
-            benutzerdaten = registrierung_persoenliche_daten(benutzerdaten)
-            benutzerdaten = registrierung_finanzielle_daten(benutzerdaten, vorgegebene_fixkosten)
-            daten_speichern(benutzerdaten)
-            
-        elif wahl == '2':
-            # Szenario Login (Dateiupload)
-            benutzerdaten = {}
-            geladene_daten = daten_laden(benutzerdaten)
-            if geladene_daten:
-                benutzerdaten = geladene_daten
-                # finanzen_berechnen wird bereits in daten_laden aufgerufen, aber wir rufen es zur Sicherheit erneut auf.
-                benutzerdaten = finanzen_berechnen(benutzerdaten)
-                ausgabe_basis_ergebnis(benutzerdaten)
-            else:
-                benutzerdaten = None
-                
-        elif wahl == '3':
-            print("Programm wird beendet. Auf Wiedersehen!")
-            break
-        else:
-            print("Ungültige Wahl. Bitte geben Sie 1, 2 oder 3 ein.")
-
-if __name__ == "__main__":
-    start_programm()
-
+import os #für das Hochladen späterer Dateien
+import json #Damit kann man die detaillierten Listen der Fix- und variablen Kosten in die Textdatei exportieren und später wieder in ein funktionsfähiges Python-Dictionary umwandeln.
+import sys
+import atexit
+import gc
+import math
+import random
+import csv
+import time
+import argparse
+import multiprocessing
+import sqlite3
+import struct
+import io
+import mmap
+import operator
+import re
+import functools
+import cProfile
+import html
+import asyncio
+import signal
+from array import array
+from bisect import bisect_left, insort
+from heapq import heapify, heappop
+from itertools import repeat, accumulate, product, islice, count
+from collections import namedtuple, OrderedDict
+from collections.abc import Mapping, MutableMapping
+from contextlib import contextmanager, nullcontext
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from http import HTTPStatus
+from urllib.parse import unquote, urlsplit
+
+try:
+    import numpy as np # Optional: beschleunigt Massenberechnungen, das Programm läuft auch ohne NumPy
+except ImportError:
+    np = None
+try:
+    import fcntl # Sperren beim Speichern und Löschen; fehlt unter Windows, dann wird ohne Sperre gearbeitet
+except ImportError:
+    fcntl = None
+
+# Die beiden Kostenarten eines Accounts (je ein Dictionary Posten -> monatlicher Betrag)
+KOSTEN_ARTEN = ["Fixkosten", "Variable Kosten"]
+# Definiert die Standard-Fixkosten-Kategorien, die bei der Registrierung abgefragt werden.
+FIXKOSTEN = ["Wohnkosten (Miete/Hypothekarzins)", "Krankenkasse/Versicherungen", "Öffentlicher Verkehr/Auto", "Abos (Internet/Handy)"]
+# Datei-Endung für die Speicherung
+DATEI_ENDUNG = ".txt"
+DATEI_ENDUNG_BINAER = ".bin"
+
+# Datei mit den Steuer- und BVG-Tarifen pro Kanton und Jahr (liegt neben dem Programm)
+TARIF_DATEI = os.path.join(os.path.dirname(os.path.abspath(__file__)), "steuertarife.json")
+STANDARD_KANTON = "Standard"
+# Eingebauter Tarif, falls die Tarifdatei fehlt. Obergrenzen gelten jeweils "bis und mit", darüber gilt der nächste Satz.
+STANDARD_TARIF = {
+    "sozialabzug": 0.062, # AHV/IV/EO/ALV
+    "bvg": {"grenzen": [24, 34, 44], "saetze": [0.0, 0.04, 0.07, 0.10]},
+    "steuer": {"art": "pauschal", "grenzen": [60000, 100000], "saetze": [0.05, 0.10, 0.15]},
+}
+# Ab dieser Anzahl Zeilen lohnt sich NumPy, darunter überwiegt der Aufwand für die Umwandlung in Arrays.
+NUMPY_MINDESTGROESSE = 64
+
+def format_waehrung(betrag):
+    """Formatiert einen Betrag in das Schweizer Währungsformat (X'XXX.XX CHF)."""
+    # Verwendet die Tausendertrennzeichen-Logik des Originals, um CHF-Konventionen zu folgen.
+    # "_" als Tausendertrennzeichen erspart den Umweg über einen Platzhalter (zwei statt drei Ersetzungen).
+    return f"{betrag:_.2f} CHF".replace(".", ",").replace("_", ".")
+
+def format_waehrung_liste(betraege):
+    """Formatiert viele Beträge auf einmal (Liste, Array oder NumPy-Array), gleiche Ausgabe wie format_waehrung."""
+    if np is not None and isinstance(betraege, np.ndarray):
+        betraege = betraege.tolist()
+    elif not isinstance(betraege, (list, tuple)):
+        betraege = list(betraege)
+    # Alle Beträge werden in einen einzigen String formatiert, ersetzt wird dann nur einmal für alle zusammen.
+    return ("{:_.2f} CHF\n" * len(betraege)).format(*betraege).replace(".", ",").replace("_", ".").split("\n")[:-1]
+
+# --- EIN- UND AUSGABE ---
+
+class Ausgabepuffer:
+    """Sammelt die Bildschirmausgaben und schreibt sie gebündelt in einen Datenstrom (Standard: sys.stdout)."""
+    __slots__ = ("ziel", "maximale_groesse", "_teile", "_groesse")
+
+    def __init__(self, ziel=None, maximale_groesse=65536):
+        self.ziel = ziel # None = das jeweils aktuelle sys.stdout
+        self.maximale_groesse = maximale_groesse
+        self._teile = []
+        self._groesse = 0
+
+    def schreiben(self, text):
+        self._teile.append(text)
+        self._groesse += len(text)
+        if self._groesse >= self.maximale_groesse:
+            self.leeren()
+
+    def leeren(self):
+        """Schreibt alle gesammelten Ausgaben auf einmal in den Datenstrom."""
+        if not self._teile:
+            return
+        ziel = self.ziel if self.ziel is not None else sys.stdout
+        ziel.write("".join(self._teile))
+        ziel.flush()
+        self._teile.clear()
+        self._groesse = 0
+
+class InteraktiveEingabe:
+    """Liest jede Eingabe von der Tastatur. Mit einer Liste als 'aufzeichnung' werden die Eingaben zum späteren Abspielen mitgeschrieben."""
+
+    def __init__(self, aufzeichnung=None):
+        self.aufzeichnung = aufzeichnung
+
+    def lesen(self, anweisung, ausgabe):
+        ausgabe.leeren() # Alles bisher Ausgegebene muss vor der Frage sichtbar sein
+        wert = input(anweisung)
+        if self.aufzeichnung is not None:
+            self.aufzeichnung.append(wert)
+        return wert
+
+    def pause(self, anweisung, ausgabe):
+        ausgabe.leeren()
+        input(anweisung)
+
+class AufzeichnungsEingabe:
+    """Spielt aufgezeichnete Eingaben der Reihe nach ab, ohne bei "Enter"-Pausen anzuhalten."""
+
+    def __init__(self, eingaben):
+        self._eingaben = iter(eingaben)
+
+    @classmethod
+    def aus_datei(cls, pfad):
+        """Liest eine Aufzeichnung: JSON-Liste (.json) oder eine Eingabe pro Zeile."""
+        with open(pfad, 'r', encoding='utf-8') as datei:
+            if pfad.endswith(".json"):
+                return cls([str(wert) for wert in json.load(datei)])
+            return cls(datei.read().splitlines())
+
+    def lesen(self, anweisung, ausgabe):
+        wert = next(self._eingaben, None)
+        if wert is None:
+            raise EOFError("Keine aufgezeichneten Eingaben mehr vorhanden.")
+        ausgabe.schreiben(f"{anweisung}{wert}\n") # Protokoll wie im Terminal
+        return wert
+
+    def pause(self, anweisung, ausgabe):
+        pass
+
+class StdinEingabe(AufzeichnungsEingabe):
+    """Liest alle Eingaben auf einmal von der Standardeingabe (z.B. über eine Pipe)."""
+
+    def __init__(self, quelle=None):
+        super().__init__((quelle or sys.stdin).read().splitlines())
+
+# Aktiver Eingabe-Treiber und Ausgabepuffer, alle Fragen und Meldungen des Programms laufen darüber.
+EINGABE = InteraktiveEingabe()
+AUSGABE = Ausgabepuffer()
+
+def anzeigen(*werte, sep=" ", end="\n"):
+    """Schreibt eine Meldung in den Ausgabepuffer (gleiche Parameter wie print)."""
+    AUSGABE.schreiben(sep.join(map(str, werte)) + end)
+
+def abfragen(anweisung=""):
+    """Liest eine Eingabe über den aktiven Eingabe-Treiber (gleich wie input)."""
+    return EINGABE.lesen(anweisung, AUSGABE)
+
+def pause(anweisung):
+    """Wartet auf die "Enter"-Taste, beim Abspielen einer Aufzeichnung wird nicht angehalten."""
+    EINGABE.pause(anweisung, AUSGABE)
+
+def _ausgabe_leeren():
+    AUSGABE.leeren()
+
+atexit.register(_ausgabe_leeren) # Restliche Ausgaben auch bei sys.exit() schreiben
+
+def eingabe_pruefung(anweisung, datentyp=float, positiv_erforderlich=True, min_wert=None, max_wert=None):
+    """Prüft, ob die Eingabe dem korrekten Datentyp entspricht und im gewünschten Bereich liegt."""
+    while True:
+        try:
+            eingabe = abfragen(anweisung).strip().replace(',', '.') # Ersetzt Komma durch Punkt für Python-Float-Parsing
+            
+            if not eingabe:
+                raise ValueError("Eingabe darf nicht leer sein.")
+            
+            wert = datentyp(eingabe)
+            if datentyp in (float, int) and not betrag_gueltig(wert):
+                raise ValueError("Zahl nicht endlich oder zu gross.") # z.B. "inf", "nan" oder "1e300"
+
+            if positiv_erforderlich and wert < 0:
+                anzeigen("Fehler: Der Wert muss positiv sein.")
+                continue
+
+            if min_wert is not None and wert < min_wert:
+                anzeigen(f"Fehler: Der Wert muss mindestens {min_wert} sein.")
+                continue
+
+            if max_wert is not None and wert > max_wert:
+                anzeigen(f"Fehler: Der Wert darf maximal {max_wert} sein.")
+                continue
+
+            return wert
+
+        except EOFError:
+            raise # Keine Eingaben mehr: nicht endlos nachfragen
+        except ValueError:
+            typ_name = "Zahl" if datentyp in (float, int) else "Text"
+            anzeigen(f"Ungültige Eingabe. Bitte geben Sie eine gültige {typ_name} ein.")
+        except Exception as e:
+            anzeigen(f"Ein unerwarteter Fehler ist aufgetreten: {e}")
+
+# --- CACHE ---
+
+_FEHLT = object() # Markiert fehlende Einträge (None kann ein gültiger Wert sein)
+
+class LruCache:
+    """Begrenzter Cache: ist er voll, wird der am längsten nicht verwendete Eintrag verworfen. Zählt Treffer und Fehlschläge."""
+    __slots__ = ("maximale_groesse", "_eintraege", "treffer", "fehlschlaege")
+
+    def __init__(self, maximale_groesse=4096):
+        self.maximale_groesse = maximale_groesse
+        self._eintraege = OrderedDict()
+        self.treffer = 0
+        self.fehlschlaege = 0
+
+    def holen(self, key, standard=None):
+        """Gibt den Eintrag zurück (und markiert ihn als zuletzt verwendet) oder standard, wenn er fehlt."""
+        wert = self._eintraege.get(key, _FEHLT)
+        if wert is _FEHLT:
+            self.fehlschlaege += 1
+            return standard
+        self._eintraege.move_to_end(key)
+        self.treffer += 1
+        return wert
+
+    def ablegen(self, key, wert):
+        self._eintraege[key] = wert
+        self._eintraege.move_to_end(key)
+        if len(self._eintraege) > self.maximale_groesse:
+            self._eintraege.popitem(last=False)
+
+    def entfernen(self, key):
+        self._eintraege.pop(key, None)
+
+    def leeren(self):
+        self._eintraege.clear()
+
+    def __len__(self):
+        return len(self._eintraege)
+
+    def trefferquote(self):
+        """Anteil der Zugriffe, die aus dem Cache bedient wurden (0.0 ohne Zugriffe)."""
+        zugriffe = self.treffer + self.fehlschlaege
+        return self.treffer / zugriffe if zugriffe else 0.0
+
+    def statistik(self):
+        return {"treffer": self.treffer, "fehlschlaege": self.fehlschlaege, "trefferquote": self.trefferquote(),
+                "eintraege": len(self._eintraege), "maximale_groesse": self.maximale_groesse}
+
+# --- STEUER- UND BVG-TARIFE ---
+
+# Vorkompilierter Tarif: sortierte Grenzen und Sätze, bei progressiven Tarifen zusätzlich die Steuer bis zur Stufe.
+# "arrays" enthält dieselben Tabellen als NumPy-Arrays (oder None ohne NumPy).
+Tarif = namedtuple("Tarif", ["sozialabzug", "bvg_grenzen", "bvg_saetze", "steuer_art", "steuer_grenzen", "steuer_saetze", "steuer_untergrenzen", "steuer_kumuliert", "arrays"])
+
+_TARIFE = None # Wird beim ersten Zugriff einmalig aus der Tarifdatei geladen: {Kanton: ([Jahre], [Tarife])}
+
+def tarif_kompilieren(daten):
+    """Prüft eine Tarifdefinition und wandelt sie in sortierte Grenz- und Satzlisten für die Binärsuche um."""
+    bvg, steuer = daten["bvg"], daten["steuer"]
+    for stufen in (bvg, steuer):
+        if list(stufen["grenzen"]) != sorted(stufen["grenzen"]) or len(stufen["saetze"]) != len(stufen["grenzen"]) + 1:
+            raise ValueError("Tarif ungültig: Grenzen müssen aufsteigend sein und es braucht einen Satz mehr als Grenzen.")
+    if steuer.get("art", "pauschal") not in ("pauschal", "progressiv"):
+        raise ValueError(f"Unbekannte Steuerart '{steuer['art']}'.")
+
+    # Für progressive Tarife: Untergrenze jeder Stufe und die bis dorthin aufgelaufene Steuer
+    untergrenzen = [0.0] + [float(g) for g in steuer["grenzen"]]
+    kumuliert = [0.0]
+    for i in range(1, len(untergrenzen)):
+        kumuliert.append(kumuliert[-1] + (untergrenzen[i] - untergrenzen[i - 1]) * steuer["saetze"][i - 1])
+
+    sozialabzug, steuer_art = float(daten["sozialabzug"]), steuer.get("art", "pauschal")
+    bvg_grenzen, bvg_saetze = list(bvg["grenzen"]), [float(satz) for satz in bvg["saetze"]]
+    steuer_grenzen, steuer_saetze = list(steuer["grenzen"]), [float(satz) for satz in steuer["saetze"]]
+
+    arrays = None
+    if np is not None:
+        arrays = Tarif(sozialabzug, np.asarray(bvg_grenzen, dtype=np.float64), np.asarray(bvg_saetze), steuer_art, np.asarray(steuer_grenzen, dtype=np.float64),
+                       np.asarray(steuer_saetze), np.asarray(untergrenzen), np.asarray(kumuliert), None)
+    return Tarif(sozialabzug, bvg_grenzen, bvg_saetze, steuer_art, steuer_grenzen, steuer_saetze, untergrenzen, kumuliert, arrays)
+
+def tarife_laden(pfad=TARIF_DATEI):
+    """Lädt alle Tarife einmalig aus der Tarifdatei und kompiliert sie (ohne Datei gilt der eingebaute Standard-Tarif)."""
+    global _TARIFE
+    tarife = {}
+    if os.path.exists(pfad):
+        with open(pfad, 'r', encoding='utf-8') as file:
+            for kanton, jahrgaenge in json.load(file).items():
+                jahre = sorted(jahrgaenge, key=int)
+                tarife[kanton] = ([int(jahr) for jahr in jahre], [tarif_kompilieren(jahrgaenge[jahr]) for jahr in jahre])
+    if STANDARD_KANTON not in tarife:
+        tarife[STANDARD_KANTON] = ([0], [tarif_kompilieren(STANDARD_TARIF)])
+    _TARIFE = tarife
+    NETTO_CACHE.leeren() # Zwischengespeicherte Nettoeinkommen gelten nur für die alten Tarife
+    return tarife
+
+def tarif_holen(kanton=STANDARD_KANTON, jahr=None):
+    """Gibt den kompilierten Tarif eines Kantons für ein Jahr zurück (es gilt der letzte Tarif bis und mit diesem Jahr)."""
+    tarife = _TARIFE if _TARIFE is not None else tarife_laden()
+    if kanton not in tarife:
+        raise ValueError(f"Für den Kanton '{kanton}' ist kein Tarif vorhanden.")
+    jahre, kompilierte_tarife = tarife[kanton]
+    if jahr is None:
+        return kompilierte_tarife[-1]
+    index = bisect_left(jahre, jahr + 1) - 1 # Binärsuche nach dem letzten Jahr <= jahr
+    if index < 0:
+        raise ValueError(f"Für den Kanton '{kanton}' gibt es vor {jahre[0]} keinen Tarif.")
+    return kompilierte_tarife[index]
+
+def brutto_zu_netto_liste(einkommen_liste, alter_liste, tarif=None):
+    """Schätzt Nettoeinkommen und Abzugssatz für ganze Listen von Bruttoeinkommen und Altern (Alter in ganzen Jahren)."""
+    tarif = tarif or tarif_holen()
+    sozial = tarif.sozialabzug
+    progressiv = tarif.steuer_art == "progressiv"
+
+    if tarif.arrays is not None and len(einkommen_liste) >= NUMPY_MINDESTGROESSE:
+        tarif = tarif.arrays
+        einkommen = np.asarray(einkommen_liste, dtype=np.float64)
+        alter = np.asarray(alter_liste)
+        if einkommen.shape != alter.shape:
+            raise ValueError("Einkommen und Alter müssen gleich viele Einträge haben.")
+        
+        # Stufenwahl per Binärsuche über die Grenzen (searchsorted entspricht bisect_left)
+        bvg_prozent = tarif.bvg_saetze[np.searchsorted(tarif.bvg_grenzen, alter, side='left')]
+        einkommen_jahr = einkommen * 12
+        stufe = np.searchsorted(tarif.steuer_grenzen, einkommen_jahr, side='left')
+        
+        if progressiv:
+            # Grenzsteuer: aufgelaufene Steuer der tieferen Stufen plus Satz der Stufe auf den Rest
+            steuer_jahr = tarif.steuer_kumuliert[stufe] + (einkommen_jahr - tarif.steuer_untergrenzen[stufe]) * tarif.steuer_saetze[stufe]
+            gesamtabzug = einkommen * sozial + einkommen * bvg_prozent + steuer_jahr / 12
+            gesamtabzug_prozent = np.divide(gesamtabzug, einkommen, out=np.full_like(einkommen, sozial), where=einkommen != 0)
+            return einkommen - gesamtabzug, gesamtabzug_prozent
+        
+        # Gleiche Rechenreihenfolge wie im Einzelfall, damit die Resultate identisch sind.
+        steuer_prozent = tarif.steuer_saetze[stufe]
+        gesamtabzug = einkommen * sozial + einkommen * bvg_prozent + einkommen * steuer_prozent
+        return einkommen - gesamtabzug, sozial + bvg_prozent + steuer_prozent
+    
+    # Ohne NumPy: Binärsuche mit bisect, die Stufen werden über map() direkt in C bestimmt.
+    einkommen = array('d', einkommen_liste)
+    bvg_saetze, steuer_saetze = tarif.bvg_saetze, tarif.steuer_saetze
+    bvg_prozent = array('d', map(bvg_saetze.__getitem__, map(bisect_left, repeat(tarif.bvg_grenzen), alter_liste)))
+    einkommen_jahr = array('d', map(operator.mul, einkommen, repeat(12)))
+    stufe = array('l', map(bisect_left, repeat(tarif.steuer_grenzen), einkommen_jahr))
+    if len(bvg_prozent) != len(einkommen):
+        raise ValueError("Einkommen und Alter müssen gleich viele Einträge haben.")
+    
+    if progressiv:
+        untergrenzen, kumuliert = tarif.steuer_untergrenzen, tarif.steuer_kumuliert
+        gesamtabzug = [e * sozial + e * b + (kumuliert[i] + (j - untergrenzen[i]) * steuer_saetze[i]) / 12 for e, b, j, i in zip(einkommen, bvg_prozent, einkommen_jahr, stufe)]
+        netto_einkommen = array('d', map(operator.sub, einkommen, gesamtabzug))
+        gesamtabzug_prozent = array('d', [g / e if e != 0 else sozial for g, e in zip(gesamtabzug, einkommen)])
+        return netto_einkommen, gesamtabzug_prozent
+    
+    steuer_prozent = array('d', map(steuer_saetze.__getitem__, stufe))
+    netto_einkommen = array('d', [e - (e * sozial + e * b + e * s) for e, b, s in zip(einkommen, bvg_prozent, steuer_prozent)])
+    gesamtabzug_prozent = array('d', [sozial + b + s for b, s in zip(bvg_prozent, steuer_prozent)])
+    return netto_einkommen, gesamtabzug_prozent
+
+def brutto_zu_netto(brutto_einkommen_monatlich, alter, tarif=None):
+    """Schätzt das Nettoeinkommen in der Schweiz (vereinfacht: AHV, BVG, Steuern)."""
+    # Einzelfall direkt per bisect, mit derselben Rechnung wie der Zweig ohne NumPy in brutto_zu_netto_liste
+    sozial, bvg_grenzen, bvg_saetze, steuer_art, steuer_grenzen, steuer_saetze, untergrenzen, kumuliert, _ = tarif or tarif_holen()
+    einkommen = float(brutto_einkommen_monatlich)
+    bvg_prozent = bvg_saetze[bisect_left(bvg_grenzen, alter)]
+    einkommen_jahr = einkommen * 12
+    stufe = bisect_left(steuer_grenzen, einkommen_jahr)
+    steuer_prozent = steuer_saetze[stufe]
+    if steuer_art == "progressiv":
+        steuer_jahr = kumuliert[stufe] + (einkommen_jahr - untergrenzen[stufe]) * steuer_prozent
+        gesamtabzug = einkommen * sozial + einkommen * bvg_prozent + steuer_jahr / 12
+        return einkommen - gesamtabzug, gesamtabzug / einkommen if einkommen != 0 else sozial
+    return einkommen - (einkommen * sozial + einkommen * bvg_prozent + einkommen * steuer_prozent), sozial + bvg_prozent + steuer_prozent
+
+# Bereits berechnete Nettoeinkommen pro (Kanton, Jahr, Bruttoeinkommen, Alter), z.B. für die Sensitivitätsanalyse
+NETTO_CACHE = LruCache(65536)
+
+def netto_liste_gecacht(einkommen_liste, alter_liste, kanton=STANDARD_KANTON, jahr=None):
+    """Wie brutto_zu_netto_liste, aber nur die Nettoeinkommen. Bekannte Kombinationen kommen aus NETTO_CACHE,
+    die fehlenden werden gemeinsam in einem Aufruf berechnet."""
+    netto = [0.0] * len(einkommen_liste)
+    fehlend = []
+    for index, (einkommen, alter) in enumerate(zip(einkommen_liste, alter_liste)):
+        wert = NETTO_CACHE.holen((kanton, jahr, einkommen, alter), _FEHLT)
+        if wert is _FEHLT:
+            fehlend.append(index)
+        else:
+            netto[index] = wert
+    if fehlend:
+        berechnet, _ = brutto_zu_netto_liste([einkommen_liste[i] for i in fehlend], [alter_liste[i] for i in fehlend], tarif_holen(kanton, jahr))
+        for index, wert in zip(fehlend, berechnet):
+            netto[index] = float(wert)
+            NETTO_CACHE.ablegen((kanton, jahr, einkommen_liste[index], alter_liste[index]), netto[index])
+    return netto
+
+# --- GELDBETRÄGE IN RAPPEN ---
+# Intern wird mit ganzen Rappen (int, als int64 in array('q') bzw. NumPy) gerechnet, damit Summen und
+# Hochrechnungen exakt bleiben. In CHF (float) umgewandelt wird nur bei Ein- und Ausgabe.
+
+BETRAG_MAX = 1e12 # Grösster Betrag in CHF; auch Summen vieler Beträge bleiben damit sicher im int64-Bereich der Rappen
+
+def ist_zahl(wert):
+    """True für int und float (z.B. 6000 aus JSON oder einer Binärdatei), aber nicht für True/False."""
+    return isinstance(wert, (int, float)) and not isinstance(wert, bool)
+
+def betrag_gueltig(betrag):
+    """Prüft, ob ein Betrag endlich ist und sich als Rappen in int64 rechnen lässt."""
+    return math.isfinite(betrag) and abs(betrag) <= BETRAG_MAX
+
+def betrag_zu_rappen(betrag):
+    """Wandelt einen Betrag in CHF in ganze Rappen um (auf den nächsten Rappen gerundet)."""
+    return round(betrag * 100)
+
+def rappen_zu_betrag(rappen):
+    """Wandelt ganze Rappen in einen Betrag in CHF um."""
+    return rappen / 100
+
+def betrag_runden(betrag):
+    """Rundet einen Betrag in CHF auf ganze Rappen."""
+    return round(betrag * 100) / 100
+
+def rappen_array(betraege):
+    """Packt viele Beträge in CHF als Rappen in ein int64-Array (NumPy, falls vorhanden, sonst array('q'))."""
+    if np is not None and len(betraege) >= NUMPY_MINDESTGROESSE:
+        # rint rundet wie round() auf die nächste gerade Zahl, die Resultate sind also identisch.
+        return np.rint(np.asarray(betraege, dtype=np.float64) * 100).astype(np.int64)
+    return array('q', map(betrag_zu_rappen, betraege))
+
+def rappen_summe(rappen):
+    """Summiert ein Rappen-Array exakt (als Python-int, ohne Rundungsfehler)."""
+    if np is not None and isinstance(rappen, np.ndarray):
+        return int(rappen.sum(dtype=np.int64))
+    return sum(rappen)
+
+# --- KOSTENBUCH ---
+
+class Kostenliste(MutableMapping):
+    """Kostenpunkte einer Kostenart (Posten -> monatlicher Betrag) mit laufend nachgeführter Summe.
+
+    Verhält sich wie ein Dictionary mit Beträgen in CHF, die Beträge liegen aber als ganze Rappen in
+    einem array('q'). Die Summe wird bei jedem Hinzufügen, Ändern und Löschen exakt angepasst, statt
+    jedes Mal alle Posten neu zu summieren.
+    """
+    __slots__ = ("_index", "_rappen", "_frei", "summe_rappen")
+
+    def __init__(self, kosten=None):
+        self._index = {} # Posten -> Platz im array (die Reihenfolge entspricht der Erfassung)
+        self._rappen = array('q')
+        self._frei = [] # Plätze gelöschter Posten, die wiederverwendet werden
+        self.summe_rappen = 0
+        if kosten:
+            self.update(kosten)
+
+    @property
+    def summe(self):
+        """Summe aller Posten in CHF."""
+        return self.summe_rappen / 100
+
+    def __getitem__(self, posten):
+        return self._rappen[self._index[posten]] / 100
+
+    def __setitem__(self, posten, betrag):
+        if not betrag_gueltig(betrag):
+            raise ValueError(f"Ungültiger Betrag {betrag!r} für '{posten}'.")
+        rappen = betrag_zu_rappen(betrag)
+        platz = self._index.get(posten)
+        if platz is None:
+            if self._frei:
+                platz = self._frei.pop()
+                self._rappen[platz] = rappen
+            else:
+                platz = len(self._rappen)
+                self._rappen.append(rappen)
+            self._index[posten] = platz
+            self.summe_rappen += rappen
+        else:
+            self.summe_rappen += rappen - self._rappen[platz]
+            self._rappen[platz] = rappen
+
+    def __delitem__(self, posten):
+        platz = self._index.pop(posten)
+        self.summe_rappen -= self._rappen[platz]
+        self._rappen[platz] = 0
+        self._frei.append(platz)
+
+    def __iter__(self):
+        return iter(self._index)
+
+    def __len__(self):
+        return len(self._index)
+
+    def __repr__(self):
+        return f"Kostenliste({self.als_dict()!r})"
+
+    def rappen_werte(self):
+        """Gibt die Beträge in Rappen in der Reihenfolge der Posten zurück (für das Binärformat)."""
+        rappen = self._rappen
+        return [rappen[platz] for platz in self._index.values()]
+
+    def als_dict(self):
+        """Gibt die Kostenpunkte als normales Dictionary in CHF zurück (für JSON und das Speichern)."""
+        rappen = self._rappen
+        return {posten: rappen[platz] / 100 for posten, platz in self._index.items()}
+
+def kostenliste_holen(benutzerdaten, kosten_art):
+    """Gibt die Kostenliste einer Kostenart zurück und wandelt ein (z.B. geladenes) Dictionary bei Bedarf um."""
+    kosten = benutzerdaten.get(kosten_art)
+    if not isinstance(kosten, Kostenliste):
+        kosten = Kostenliste(kosten)
+        benutzerdaten[kosten_art] = kosten
+    return kosten
+
+def _als_dict(wert):
+    """Wandelt (auch verschachtelte) Mappings wie Kostenlisten in normale Dictionaries um, Listen werden kopiert."""
+    if isinstance(wert, Mapping):
+        return {key: _als_dict(inhalt) for key, inhalt in wert.items()}
+    if isinstance(wert, list):
+        return [_als_dict(inhalt) for inhalt in wert]
+    return wert
+
+def gesamtkosten_berechnen(benutzerdaten):
+    """Setzt die monatlichen Gesamtkosten aus den laufenden Summen der Kostenlisten und gibt sie in Rappen zurück."""
+    if any(art in benutzerdaten for art in KOSTEN_ARTEN):
+        gesamt_rappen = sum(kostenliste_holen(benutzerdaten, art).summe_rappen for art in KOSTEN_ARTEN if art in benutzerdaten)
+        benutzerdaten["Monatliche Gesamtkosten"] = rappen_zu_betrag(gesamt_rappen)
+        return gesamt_rappen
+    return betrag_zu_rappen(benutzerdaten.get("Monatliche Gesamtkosten", 0.0))
+
+def finanzen_berechnen(benutzerdaten):
+    """Berechnet die monatliche Sparquote oder den Vermögensverzehr und aktualisiert das Dictionary."""
+    netto_rappen = betrag_zu_rappen(benutzerdaten.get("Einkommen Netto", 0.0))
+    kosten_rappen = gesamtkosten_berechnen(benutzerdaten)
+
+    ergebnis = netto_rappen - kosten_rappen # Exakt in Rappen
+    benutzerdaten["Monatliches Ergebnis"] = rappen_zu_betrag(ergebnis)
+
+    if ergebnis > 0:
+        benutzerdaten["Ergebnis Art"] = "Monatliche Sparquote"
+    elif ergebnis < 0:
+        benutzerdaten["Ergebnis Art"] = "Monatlicher Vermögensverzehr"
+    else:   
+        benutzerdaten["Ergebnis Art"] = "Ausgeglichen" 
+    
+    return benutzerdaten
+
+# --- REGISTRIERUNG / HAUPT-ERFASSUNG ---
+
+def registrierung_persoenliche_daten(benutzerdaten):
+    """Erfasst Vorname, Nachname und Alter."""
+    anzeigen("\n--- Schritt 1: Persönliche Daten erfassen ---")
+    benutzerdaten["Vorname"] = abfragen("Vorname: ").strip()
+    benutzerdaten["Name"] = abfragen("Name: ").strip() # Korrigiert von 'Nachname' zu 'Name' (konsistent mit Speichern)
+    benutzerdaten["Alter"] = eingabe_pruefung("Alter (18-100): ", datentyp=int, min_wert=18, max_wert=100)
+    anzeigen("Persönliche Daten erfolgreich erfasst.")
+    return benutzerdaten
+        
+
+def registrierung_finanzielle_daten(benutzerdaten, vorgegebene_fixkosten): 
+    """Erfasst finanzielle Daten, berechnet Netto-Einkommen und Kosten."""
+    anzeigen("\n--- Schritt 2: Finanzielle Angaben erfassen ---")
+
+    # 1. Vermögen und Reserve
+    # BUG FIX: Hier wurde der Prompt-String zugewiesen, nicht das Ergebnis der Eingabeprüfung.
+    benutzerdaten["Aktuelles Gesamtvermögen"] = betrag_runden(eingabe_pruefung("Aktuelles Gesamtvermögen in CHF: "))
+    benutzerdaten["Finanzielle Reserve"] = betrag_runden(eingabe_pruefung("Finanzielle Reserve (Betrag für Notfälle) in CHF: "))
+
+    # 2. Einkommen
+    while True:
+        einkommen_wert = betrag_runden(eingabe_pruefung("Monatliches Einkommen in CHF: "))
+        typ = abfragen("Handelt es sich hierbei um ein 'brutto'- oder 'netto'-Einkommen? ").strip().lower()
+
+        if typ == 'brutto':
+            alter = benutzerdaten.get("Alter", 30)
+            netto_einkommen, abzug_prozent = brutto_zu_netto(einkommen_wert, alter)
+            netto_einkommen = betrag_runden(netto_einkommen) # Gespeichert wird auf den Rappen genau
+
+            benutzerdaten["Einkommen Brutto"] = einkommen_wert
+            benutzerdaten["Einkommen Netto"] = netto_einkommen
+            anzeigen(f"Totaler Abzug: {abzug_prozent*100:.2f}%")
+            anzeigen(f"Monatliches Nettoeinkommen: {format_waehrung(netto_einkommen)}")
+            break
+        elif typ == 'netto':
+            benutzerdaten["Einkommen Netto"] = einkommen_wert
+            benutzerdaten["Einkommen Brutto"] = "nicht anwendbar" 
+            anzeigen(f'--> Monatliches Nettoeinkommen: {format_waehrung(einkommen_wert)}')
+            break
+        else:
+            anzeigen("Ungültige Eingabe. Bitte geben Sie 'brutto' oder 'netto' ein.")
+
+    # 3. Fixkosten erfassen
+    anzeigen("\n--- Schritt 3: Fixkosten erfassen ---")
+    benutzerdaten["Fixkosten"] = Kostenliste()
+    
+    for posten in vorgegebene_fixkosten:
+        wert = eingabe_pruefung(f'Monatliche Fixkosten für {posten} in CHF: ')
+        benutzerdaten["Fixkosten"][posten] = wert
+            
+    # 4. Variable Kosten (individuelle Posten)
+    anzeigen("\n--- Schritt 4: Variable Kosten erfassen ---")
+    benutzerdaten["Variable Kosten"] = Kostenliste()
+    while True:
+        posten_name = abfragen("Weiteren variablen Kostenpunkt benennen (z.B. 'Lebensmittel') oder 'ende' zum Abschliessen: ").strip()
+        if posten_name.lower() == 'ende':
+            break
+
+        wert = eingabe_pruefung(f"Monatliche Kosten für {posten_name} in CHF: ")
+        benutzerdaten["Variable Kosten"][posten_name] = wert
+
+    # Berechnung der Gesamtkosten (laufende Summen der Kostenlisten), des Ergebnisses und die Ausgabe
+    benutzerdaten = finanzen_berechnen(benutzerdaten)
+    ausgabe_basis_ergebnis(benutzerdaten)
+
+    return benutzerdaten
+
+# --- SPEICHERUNG / LADEN ---
+
+def _zahl_oder_text(text):
+    """Wandelt gespeicherte Zahlen um, lässt aber Texte wie "nicht anwendbar" stehen."""
+    try:
+        wert = float(text)
+    except ValueError:
+        return text
+    if not betrag_gueltig(wert):
+        raise ValueError(f"Ungültiger Betrag '{text}' (nicht endlich oder zu gross).")
+    return wert
+
+def _ganzzahl_oder_text(text):
+    try:
+        return int(float(text))
+    except ValueError:
+        return text
+
+def _json_oder_text(text):
+    """JSON-Dictionaries (Kostenlisten) und -Listen (Sparziele) werden wieder zu Python-Objekten, alles andere bleibt Text."""
+    if (text.startswith("{") and text.endswith("}")) or (text.startswith("[") and text.endswith("]")):
+        return json.loads(text)
+    return text
+
+# Schema der Textdatei: Feld -> Umwandlungsfunktion. Unbekannte Felder werden mit _json_oder_text gelesen.
+TEXT_SCHEMA = {
+    "Alter": _ganzzahl_oder_text,
+    "Aktuelles Gesamtvermögen": _zahl_oder_text,
+    "Finanzielle Reserve": _zahl_oder_text,
+    "Einkommen Netto": _zahl_oder_text,
+    "Einkommen Brutto": _zahl_oder_text, # Kann auch "nicht anwendbar" sein
+    "Monatliche Gesamtkosten": _zahl_oder_text,
+    "Monatliches Ergebnis": _zahl_oder_text,
+    "Fixkosten": _json_oder_text,
+    "Variable Kosten": _json_oder_text,
+}
+
+def datei_parsen(quelle):
+    """Liest gespeicherte Daten ohne Benutzerinteraktion ein (Dateipfad oder geöffnete Datei/StringIO) und gibt ein Dictionary zurück."""
+    if hasattr(quelle, "read"):
+        inhalt = quelle.read()
+    else:
+        with open(quelle, 'r') as file:
+            inhalt = file.read()
+
+    geladene_daten = {}
+    schema_holen = TEXT_SCHEMA.get
+    # Ein Durchgang über alle Zeilen; Zeilen ohne ":" (Leerzeilen, Überschriften) fallen automatisch weg.
+    for line in inhalt.splitlines():
+        key, trenner, value_str = line.partition(":")
+        if not trenner:
+            continue
+        key = key.strip()
+        if key.startswith("---"):
+            continue
+        geladene_daten[key] = schema_holen(key, _json_oder_text)(value_str.strip())
+    return geladene_daten
+
+def datei_schreiben(dateiname, benutzerdaten):
+    """Schreibt alle RAW-Daten (Zahlen als Zahlen, Listen als JSON-Strings) in eine Textdatei."""
+    daten_zum_speichern = benutzerdaten.copy()
+
+    # Kosten-Dictionaries (und andere verschachtelte Felder wie "Kosten Dynamik" oder "Sparziele") als JSON-String speichern
+    for key, value in daten_zum_speichern.items():
+        if isinstance(value, (Mapping, list)):
+            daten_zum_speichern[key] = json.dumps(_als_dict(value))
+    
+    with open(dateiname, 'w') as file:
+        file.write("--- Persönliche Daten ---\n")
+        
+        # Persönliche Daten (explizit zuerst)
+        for key in ["Vorname", "Name", "Alter"]:
+            if key in daten_zum_speichern:
+                file.write(f"{key}: {daten_zum_speichern.pop(key)}\n")
+
+        file.write("\n--- Finanzielle Daten und Ergebnis ---\n")
+        # Alle übrigen Daten (Zahlen werden RAW gespeichert, um das Laden zu vereinfachen)
+        for key, value in daten_zum_speichern.items():
+            file.write(f"{key}: {value}\n")
+
+# --- BINÄRFORMAT ---
+# Aufbau einer Binärdatei (alle Zahlen little-endian):
+#   Kopf:    Kennung b"BUDB", Schema-Version (H), Feldmaske (H), 7 Zahlenfelder als double (BINAER_ZAHLEN)
+#   Texte:   Vorname und Name, je Länge (H) + UTF-8
+#   Kosten:  pro Kostenart Anzahl n (I) und Länge der Namen (I), dann alle Namen als UTF-8 (mit \\0 getrennt)
+#            und die n Beträge als ganze Rappen (q, int64). So lässt sich ein ganzer Block mit einem Aufruf entpacken.
+#            Schema-Version 1 speicherte die Beträge als double in CHF und wird weiterhin gelesen.
+#   Weitere: Länge (I) + JSON mit allen übrigen Feldern (z.B. "Ergebnis Art")
+
+BINAER_KENNUNG = b"BUDB"
+BINAER_VERSION = 2
+BINAER_ZAHLEN = ["Alter", "Aktuelles Gesamtvermögen", "Finanzielle Reserve", "Einkommen Netto", "Einkommen Brutto", "Monatliche Gesamtkosten", "Monatliches Ergebnis"]
+BINAER_TEXTE = ["Vorname", "Name"]
+# Bits der Feldmaske: zuerst die Zahlenfelder, dann Texte und Kostenarten (gesetzt = Feld vorhanden)
+BINAER_BITS = {key: 1 << bit for bit, key in enumerate(BINAER_ZAHLEN + BINAER_TEXTE + KOSTEN_ARTEN)}
+BINAER_KOPF = struct.Struct(f"<4sHH{len(BINAER_ZAHLEN)}d")
+_LAENGE_H = struct.Struct("<H")
+_LAENGE_I = struct.Struct("<I")
+_KOSTEN_KOPF = struct.Struct("<II")
+
+def _text_packen(puffer, text):
+    daten = text.encode('utf-8')
+    puffer += _LAENGE_H.pack(len(daten))
+    puffer += daten
+
+def binaer_schreiben(dateiname, benutzerdaten):
+    """Speichert die Daten im kompakten Binärformat."""
+    maske = 0
+    zahlen = []
+    for key in BINAER_ZAHLEN:
+        wert = benutzerdaten.get(key)
+        if isinstance(wert, (int, float)):
+            maske |= BINAER_BITS[key]
+            zahlen.append(float(wert))
+        else:
+            zahlen.append(0.0)
+    for key in BINAER_TEXTE + KOSTEN_ARTEN:
+        if key in benutzerdaten:
+            maske |= BINAER_BITS[key]
+
+    puffer = bytearray(BINAER_KOPF.pack(BINAER_KENNUNG, BINAER_VERSION, maske, *zahlen))
+    for key in BINAER_TEXTE:
+        _text_packen(puffer, str(benutzerdaten.get(key, "")))
+    for art in KOSTEN_ARTEN:
+        kosten = benutzerdaten.get(art, {})
+        namen = "\0".join(kosten).encode('utf-8')
+        puffer += _KOSTEN_KOPF.pack(len(kosten), len(namen))
+        puffer += namen
+        rappen = kosten.rappen_werte() if isinstance(kosten, Kostenliste) else map(betrag_zu_rappen, kosten.values())
+        puffer += struct.pack(f"<{len(kosten)}q", *rappen)
+
+    # Alles, was nicht im festen Schema steht (auch Zahlenfelder mit Text wie "nicht anwendbar")
+    weitere = {key: wert for key, wert in benutzerdaten.items()
+               if key not in BINAER_TEXTE and key not in KOSTEN_ARTEN and not (key in BINAER_ZAHLEN and maske & BINAER_BITS[key])}
+    weitere_daten = json.dumps(weitere).encode('utf-8')
+    puffer += _LAENGE_I.pack(len(weitere_daten))
+    puffer += weitere_daten
+
+    with open(dateiname, 'wb') as file:
+        file.write(puffer)
+
+def binaer_auswerten(puffer):
+    """Wertet einen Puffer im Binärformat aus (bytes, memoryview oder mmap)."""
+    try:
+        kennung, version, maske, *zahlen = BINAER_KOPF.unpack_from(puffer, 0)
+        if kennung != BINAER_KENNUNG:
+            raise ValueError("Keine Binärdatei des Budget-Planers.")
+        if version > BINAER_VERSION:
+            raise ValueError(f"Schema-Version {version} wird nicht unterstützt (maximal {BINAER_VERSION}).")
+
+        benutzerdaten = {}
+        position = BINAER_KOPF.size
+        for key in BINAER_TEXTE:
+            laenge, = _LAENGE_H.unpack_from(puffer, position)
+            position += 2
+            if maske & BINAER_BITS[key]:
+                benutzerdaten[key] = str(puffer[position:position + laenge], 'utf-8')
+            position += laenge
+        for key, wert in zip(BINAER_ZAHLEN, zahlen):
+            if maske & BINAER_BITS[key]:
+                benutzerdaten[key] = int(wert) if key == "Alter" else wert
+        for art in KOSTEN_ARTEN:
+            anzahl, laenge = _KOSTEN_KOPF.unpack_from(puffer, position)
+            position += _KOSTEN_KOPF.size
+            namen = str(puffer[position:position + laenge], 'utf-8').split("\0") if anzahl else []
+            position += laenge
+            if version == 1:
+                betraege = struct.unpack_from(f"<{anzahl}d", puffer, position)
+            else:
+                betraege = map(operator.truediv, struct.unpack_from(f"<{anzahl}q", puffer, position), repeat(100))
+            position += 8 * anzahl
+            if len(namen) != anzahl:
+                raise ValueError("Binärdatei ist beschädigt (Anzahl Kostenpunkte stimmt nicht).")
+            kosten = dict(zip(namen, betraege))
+            if maske & BINAER_BITS[art]:
+                benutzerdaten[art] = kosten
+        laenge, = _LAENGE_I.unpack_from(puffer, position)
+        position += 4
+        if laenge > 2: # "{}" braucht nicht geparst zu werden
+            benutzerdaten.update(json.loads(str(puffer[position:position + laenge], 'utf-8')))
+        return benutzerdaten
+    except struct.error:
+        raise ValueError("Binärdatei ist unvollständig oder beschädigt.")
+
+def _binaer_mmap_lesen(file):
+    """Bildet eine geöffnete Binärdatei per mmap in den Speicher ab und wertet sie ohne Kopie aus."""
+    with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as speicher:
+        puffer = memoryview(speicher)
+        try:
+            return binaer_auswerten(puffer)
+        finally:
+            puffer.release() # Muss vor dem Schliessen von mmap freigegeben werden
+
+def binaer_lesen(dateiname):
+    """Liest eine Binärdatei über mmap direkt aus dem Puffer (ohne Umweg über Text)."""
+    with open(dateiname, 'rb') as file:
+        return _binaer_mmap_lesen(file)
+
+def _snapshot_laden(dateiname):
+    """Lädt nur den gespeicherten Stand und erkennt dabei an den ersten vier Bytes, ob er im Text- oder Binärformat vorliegt."""
+    with open(dateiname, 'rb') as file:
+        if file.read(len(BINAER_KENNUNG)) == BINAER_KENNUNG:
+            return _binaer_mmap_lesen(file)
+        file.seek(0)
+        text = io.TextIOWrapper(file)
+        try:
+            return datei_parsen(text)
+        finally:
+            text.detach() # Die Datei wird vom with-Block geschlossen
+
+def konto_pruefen(benutzerdaten):
+    """Löst einen ValueError aus, wenn die Daten keinen Account ergeben (z.B. ein Monatsbericht mit Endung .txt)."""
+    for key in ("Name", "Vorname"):
+        if not isinstance(benutzerdaten.get(key), str) or not benutzerdaten[key]:
+            raise ValueError(f"Keine Account-Datei: Feld '{key}' fehlt")
+    if not ist_zahl(benutzerdaten.get("Einkommen Netto")):
+        raise ValueError("Keine Account-Datei: Feld 'Einkommen Netto' fehlt oder ist keine Zahl")
+
+def konto_datei_laden(dateiname):
+    """Lädt eine Account-Datei (Text- oder Binärformat) und spielt das zugehörige Änderungsjournal nach."""
+    benutzerdaten = _snapshot_laden(dateiname)
+    journal_anwenden(benutzerdaten, dateiname + JOURNAL_ENDUNG)
+    konto_pruefen(benutzerdaten)
+    return benutzerdaten
+
+def dateien_konvertieren(verzeichnis):
+    """Wandelt alle Textdateien eines Verzeichnisses ins Binärformat um (die Textdateien bleiben erhalten)."""
+    anzahl_ok = 0
+    anzahl_fehler = 0
+    index = Kontoindex(verzeichnis) # Damit die neuen .bin-Dateien beim Login vorgeschlagen werden
+    for dateiname in batch_dateien_finden(verzeichnis):
+        if not dateiname.endswith(DATEI_ENDUNG):
+            continue
+        try:
+            binaer_name = dateiname[:-len(DATEI_ENDUNG)] + DATEI_ENDUNG_BINAER
+            binaer_schreiben(binaer_name, konto_datei_laden(dateiname))
+            anzahl_ok += 1
+        except Exception as e:
+            anzahl_fehler += 1
+            print(f"Warnung: Datei '{dateiname}' übersprungen ({e})", file=sys.stderr)
+            continue
+        try:
+            index.hinzufuegen(binaer_name)
+        except OSError as e:
+            print(f"Warnung: Account-Index nicht aktualisiert ({e})", file=sys.stderr)
+    anzeigen(f"{anzahl_ok} Dateien ins Binärformat umgewandelt, {anzahl_fehler} Dateien übersprungen.")
+    return anzahl_ok, anzahl_fehler
+
+# --- ÄNDERUNGSJOURNAL ---
+# Statt bei jedem Speichern die ganze Datei neu zu schreiben, werden nur die Änderungen als JSON-Zeilen
+# an Name_Vorname.txt.journal angehängt. Beim Laden wird das Journal auf den gespeicherten Stand angewendet.
+# Wird das Journal grösser als der Stand selbst, wird es in eine neue Datei übernommen (Kompaktierung).
+
+JOURNAL_ENDUNG = ".journal"
+JOURNAL_MIN_BYTES = 4096 # Kleinere Journale werden nie kompaktiert
+def _stand_kopieren(benutzerdaten):
+    """Kopiert die Daten so weit, dass spätere Änderungen an Kostenlisten und verschachtelten Feldern den Stand nicht verändern."""
+    return {key: _als_dict(wert) for key, wert in benutzerdaten.items()}
+
+def aenderungen_ermitteln(alter_stand, benutzerdaten):
+    """Vergleicht zwei Stände und gibt die Änderungen als Journal-Einträge zurück (leer, wenn nichts geändert wurde)."""
+    eintraege = []
+    for key, wert in benutzerdaten.items():
+        alter_wert = alter_stand.get(key)
+        if key in KOSTEN_ARTEN and isinstance(wert, Mapping) and isinstance(alter_wert, Mapping):
+            # Kostenlisten postenweise vergleichen, damit eine Änderung nur einen Eintrag erzeugt
+            for posten in alter_wert.keys() - wert.keys():
+                eintraege.append({"kosten": key, "posten": posten, "geloescht": True})
+            for posten, betrag in wert.items():
+                if posten not in alter_wert or alter_wert[posten] != betrag:
+                    eintraege.append({"kosten": key, "posten": posten, "wert": betrag})
+        elif key not in alter_stand or alter_wert != wert:
+            eintraege.append({"feld": key, "wert": _als_dict(wert)})
+    for key in alter_stand.keys() - benutzerdaten.keys():
+        eintraege.append({"feld": key, "geloescht": True})
+    return eintraege
+
+def journal_anwenden(benutzerdaten, journal_pfad):
+    """Wendet alle Einträge eines Journals auf die Daten an. Eine abgebrochene letzte Zeile wird ignoriert."""
+    try:
+        file = open(journal_pfad, 'r', encoding='utf-8')
+    except FileNotFoundError:
+        return
+    with file:
+        for zeile in file:
+            try:
+                eintrag = json.loads(zeile)
+            except ValueError:
+                break # Absturz während des Schreibens: alles danach ist unvollständig
+            if "kosten" in eintrag:
+                kosten = benutzerdaten.setdefault(eintrag["kosten"], {})
+                if eintrag.get("geloescht"):
+                    kosten.pop(eintrag["posten"], None)
+                else:
+                    kosten[eintrag["posten"]] = eintrag["wert"]
+            elif eintrag.get("geloescht"):
+                benutzerdaten.pop(eintrag["feld"], None)
+            else:
+                benutzerdaten[eintrag["feld"]] = eintrag["wert"]
+
+def journal_anhaengen(journal_pfad, eintraege):
+    """Hängt alle Einträge eines Speichervorgangs mit einem einzigen Schreib- und fsync-Aufruf an und gibt die neue Grösse zurück."""
+    zeilen = "".join(json.dumps(eintrag, ensure_ascii=False) + "\n" for eintrag in eintraege).encode('utf-8')
+    with open(journal_pfad, 'ab+') as file:
+        groesse = file.seek(0, os.SEEK_END)
+        if groesse:
+            file.seek(-1, os.SEEK_END)
+            if file.read(1) != b"\n":
+                # Abgebrochene letzte Zeile entfernen, sonst würde sie mit dem neuen Eintrag verschmelzen
+                file.seek(0)
+                file.truncate(file.read().rfind(b"\n") + 1)
+        file.seek(0, os.SEEK_END)
+        file.write(zeilen)
+        file.flush()
+        os.fsync(file.fileno())
+        return file.tell()
+
+def atomar_schreiben(dateiname, benutzerdaten, binaer=False):
+    """Schreibt den Stand zuerst in eine temporäre Datei und ersetzt dann das Original, damit ein Absturz nichts zerstört."""
+    temp_name = dateiname + ".tmp"
+    if binaer:
+        binaer_schreiben(temp_name, benutzerdaten)
+    else:
+        datei_schreiben(temp_name, benutzerdaten)
+    with open(temp_name, 'rb') as file:
+        os.fsync(file.fileno())
+    os.replace(temp_name, dateiname)
+    # Das Journal ist nun im Stand enthalten
+    if os.path.exists(dateiname + JOURNAL_ENDUNG):
+        os.remove(dateiname + JOURNAL_ENDUNG)
+
+# --- ACCOUNT-INDEX ---
+# Damit ein Account auch ohne den genauen Dateinamen gefunden wird, führt DateiSpeicher ein Verzeichnis aller Accounts
+# in "konten.index": eine Zeile pro Änderung ("+Meier_Hans.txt" bzw. "-Meier_Hans.txt"), die beim Einlesen nachgespielt
+# wird. Fehlt die Datei, wird sie einmalig aus dem Verzeichnisinhalt aufgebaut: aufgenommen werden nur Dateien namens
+# Name_Vorname.txt bzw. .bin, die sich als Account laden lassen (keine Monatsberichte o.ä.). Gesucht wird per Binärsuche in einer
+# sortierten Liste ("meier hans" und "hans meier"). Bei Tippfehlern werden alle Varianten der Eingabe mit genau einem
+# Tippfehler gebildet und im Verzeichnis der Namen und Vornamen nachgeschlagen (ein Wörterbuchzugriff pro Variante).
+
+KONTOINDEX_DATEI = "konten.index"
+KONTOINDEX_VORSCHLAEGE = 10
+KONTOINDEX_MIN_ZEILEN = 1000 # Kleinere Indexdateien werden nie kompaktiert
+KONTO_DATEINAME = re.compile(r"[^._][^_]*_[^.]+(?:" + re.escape(DATEI_ENDUNG) + "|" + re.escape(DATEI_ENDUNG_BINAER) + ")")
+
+def ist_konto_datei(pfad):
+    """Prüft, ob eine Datei wie ein gespeicherter Account heisst (Name_Vorname.txt/.bin) und sich als Account laden lässt."""
+    if not KONTO_DATEINAME.fullmatch(os.path.basename(pfad)):
+        return False
+    try:
+        konto_datei_laden(pfad)
+    except Exception:
+        return False
+    return True
+
+def suchtext(text):
+    """Normalisiert einen Dateinamen oder eine Eingabe für die Suche: 'Meier_Hans.txt' -> 'meier hans'."""
+    text = os.path.basename(text.strip())
+    for endung in (DATEI_ENDUNG, DATEI_ENDUNG_BINAER):
+        if text.endswith(endung):
+            text = text[:-len(endung)]
+    return " ".join(text.replace("_", " ").casefold().split())
+
+def _namen_teilen(text):
+    """Teilt einen Dateinamen oder eine Eingabe in Name und Vorname (am ersten '_', sonst am ersten Leerzeichen)."""
+    text = os.path.basename(text.strip())
+    name, trenner, vorname = text.partition("_")
+    if not trenner:
+        name, _, vorname = text.strip().partition(" ")
+    return suchtext(name), suchtext(vorname)
+
+def _konto_namen(kennung):
+    """Wie _namen_teilen, aber schneller für Dateinamen aus dem Index (ohne Pfad und Leerzeichen am Rand)."""
+    if kennung.endswith((DATEI_ENDUNG, DATEI_ENDUNG_BINAER)):
+        kennung = kennung.rpartition(".")[0]
+    name, _, vorname = kennung.casefold().partition("_")
+    if " " in name or " " in vorname or "_" in vorname:
+        return " ".join(name.split()), " ".join(vorname.replace("_", " ").split())
+    return name, vorname
+
+def tippfehler_varianten(wort, alphabet):
+    """Alle Wörter, die aus wort durch genau einen Tippfehler entstehen (Zeichen löschen, vertauschen, ersetzen oder einfügen)."""
+    teile = [(wort[:stelle], wort[stelle:]) for stelle in range(len(wort) + 1)]
+    varianten = {links + rechts[1:] for links, rechts in teile if rechts}
+    varianten.update(links + rechts[1] + rechts[0] + rechts[2:] for links, rechts in teile if len(rechts) > 1)
+    varianten.update(links + zeichen + rechts[1:] for links, rechts in teile if rechts for zeichen in alphabet)
+    varianten.update(links + zeichen + rechts for links, rechts in teile for zeichen in alphabet)
+    varianten.discard(wort)
+    return varianten
+
+class Kontoindex:
+    """Alle Account-Dateien eines Verzeichnisses mit Präfix- und Tippfehlersuche über Name und Vorname."""
+
+    def __init__(self, verzeichnis=os.curdir):
+        self.verzeichnis = verzeichnis
+        self.pfad = os.path.join(verzeichnis, KONTOINDEX_DATEI)
+        self._kennungen = set()
+        self._sortiert = [] # "suchtext\0Dateiname", sortiert (\0 ordnet vor jedem Zeichen, wie ein Tupel)
+        self._woerter = None # Name bzw. Vorname -> [(Name, Vorname, Dateiname)], erst bei der ersten Tippfehlersuche aufgebaut
+        self._alphabet = set() # Alle Zeichen, die in Namen vorkommen (für die Tippfehler-Varianten)
+        self._groesse = None # Grösse der Indexdatei beim letzten Einlesen (None = noch nicht eingelesen)
+        self._zeilen = 0
+
+    @staticmethod
+    def _eintraege(kennung):
+        name, vorname = _konto_namen(kennung)
+        return {f"{name} {vorname}\0{kennung}", f"{vorname} {name}\0{kennung}"} if vorname else {f"{name}\0{kennung}"}
+
+    def _setzen(self, kennungen):
+        self._kennungen = set(kennungen)
+        self._sortiert = sorted({eintrag for kennung in self._kennungen for eintrag in self._eintraege(kennung)})
+        self._woerter = None
+
+    def _schreiben(self, kennungen):
+        """Schreibt den Index neu (über eine temporäre Datei, damit er bei einem Absturz nicht verloren geht)."""
+        with datei_sperren(self.pfad):
+            temp_name = self.pfad + ".tmp"
+            with open(temp_name, 'w', encoding='utf-8') as datei:
+                datei.write("".join(f"+{kennung}\n" for kennung in kennungen))
+            os.replace(temp_name, self.pfad)
+            self._groesse = os.path.getsize(self.pfad)
+            self._zeilen = len(kennungen)
+
+    def _aktualisieren(self):
+        """Liest die Indexdatei neu ein, wenn ein anderer Prozess sie geändert hat; fehlt sie, wird sie aufgebaut."""
+        try:
+            groesse = os.path.getsize(self.pfad)
+        except FileNotFoundError:
+            kennungen = sorted(os.path.basename(pfad) for pfad in batch_dateien_finden(self.verzeichnis) if ist_konto_datei(pfad))
+            self._setzen(kennungen)
+            try:
+                self._schreiben(kennungen)
+            except OSError:
+                self._groesse = None # Schreibgeschütztes Verzeichnis: Der Index gilt nur für diesen Prozess
+            return
+        if groesse == self._groesse:
+            return
+        with open(self.pfad, 'r', encoding='utf-8') as datei:
+            zeilen = datei.read().split("\n")[:-1] # Eine beim Schreiben abgebrochene letzte Zeile zählt nicht
+        kennungen = {}
+        for zeile in zeilen:
+            if zeile.startswith("+"):
+                kennungen[zeile[1:]] = None
+            elif zeile.startswith("-"):
+                kennungen.pop(zeile[1:], None)
+        self._setzen(kennungen)
+        self._groesse = groesse
+        self._zeilen = len(zeilen)
+
+    def _anhaengen(self, zeile):
+        with datei_sperren(self.pfad):
+            with open(self.pfad, 'a', encoding='utf-8') as datei:
+                vorher = datei.tell()
+                datei.write(zeile + "\n")
+            # Hat inzwischen ein anderer Prozess etwas angehängt, wird der Index beim nächsten Zugriff neu eingelesen
+            self._groesse = os.path.getsize(self.pfad) if vorher == self._groesse else None
+            self._zeilen += 1
+
+    def _woerter_aufbauen(self):
+        self._woerter, self._alphabet = {}, set()
+        for kennung in self._kennungen:
+            self._woerter_ergaenzen(kennung)
+
+    def _woerter_ergaenzen(self, kennung):
+        name, vorname = _konto_namen(kennung)
+        for wort in {name, vorname}:
+            konten = self._woerter.get(wort)
+            if konten is None:
+                konten = self._woerter[wort] = []
+                self._alphabet.update(wort)
+            konten.append((name, vorname, kennung))
+
+    def hinzufuegen(self, kennung):
+        kennung = os.path.basename(kennung)
+        self._aktualisieren()
+        if kennung in self._kennungen:
+            return
+        self._anhaengen("+" + kennung)
+        self._kennungen.add(kennung)
+        for eintrag in self._eintraege(kennung):
+            insort(self._sortiert, eintrag)
+        if self._woerter is not None:
+            self._woerter_ergaenzen(kennung)
+
+    def entfernen(self, kennung):
+        kennung = os.path.basename(kennung)
+        self._aktualisieren()
+        if kennung not in self._kennungen:
+            return
+        self._anhaengen("-" + kennung)
+        self._kennungen.discard(kennung)
+        for eintrag in self._eintraege(kennung):
+            index = bisect_left(self._sortiert, eintrag)
+            if index < len(self._sortiert) and self._sortiert[index] == eintrag:
+                del self._sortiert[index]
+        self._woerter = None
+        if self._zeilen > max(KONTOINDEX_MIN_ZEILEN, 2 * len(self._kennungen)):
+            self._schreiben(sorted(self._kennungen)) # Kompaktierung: gelöschte Accounts entfernen
+
+    def __len__(self):
+        self._aktualisieren()
+        return len(self._kennungen)
+
+    def suchen(self, text, anzahl=KONTOINDEX_VORSCHLAEGE):
+        """Dateinamen, deren 'Name Vorname' oder 'Vorname Name' mit dem Text beginnt (alphabetisch)."""
+        self._aktualisieren()
+        praefix = suchtext(text)
+        if not praefix:
+            return []
+        treffer = {}
+        index = bisect_left(self._sortiert, praefix)
+        while index < len(self._sortiert) and len(treffer) < anzahl:
+            eintrag = self._sortiert[index]
+            if not eintrag.startswith(praefix):
+                break
+            treffer[eintrag[eintrag.index("\0") + 1:]] = None
+            index += 1
+        return list(treffer)
+
+    def _nahe_woerter(self, wort):
+        """Bekannte Namen/Vornamen mit höchstens einem Tippfehler: {Wort: Distanz}."""
+        nahe = {variante: 1 for variante in tippfehler_varianten(wort, self._alphabet) if variante in self._woerter}
+        if wort in self._woerter:
+            nahe[wort] = 0
+        return nahe
+
+    def aehnliche(self, text, anzahl=KONTOINDEX_VORSCHLAEGE):
+        """Dateinamen mit höchstens einem Tippfehler in Name und Vorname zusammen (auch in vertauschter Reihenfolge)."""
+        self._aktualisieren()
+        if self._woerter is None:
+            self._woerter_aufbauen()
+        name, vorname = _namen_teilen(text)
+        if not name:
+            return []
+        bewertet = {}
+        nahe_name = self._nahe_woerter(name)
+        if not vorname:
+            # Nur ein Wort eingegeben: Accounts, bei denen Name oder Vorname passt
+            for wort, distanz in nahe_name.items():
+                for _, _, kennung in self._woerter[wort]:
+                    bewertet[kennung] = min(distanz, bewertet.get(kennung, distanz))
+        else:
+            nahe_vorname = self._nahe_woerter(vorname)
+            for erstes, zweites in ((nahe_name, nahe_vorname), (nahe_vorname, nahe_name)):
+                for wort, distanz in erstes.items():
+                    for konto_name, konto_vorname, kennung in self._woerter[wort]:
+                        gesamt = distanz + zweites.get(konto_vorname if konto_name == wort else None, 2)
+                        if gesamt <= 1:
+                            bewertet[kennung] = min(gesamt, bewertet.get(kennung, gesamt))
+        return [kennung for kennung, _ in sorted(bewertet.items(), key=lambda eintrag: (eintrag[1], eintrag[0]))[:anzahl]]
+
+    def vorschlaege(self, text, anzahl=KONTOINDEX_VORSCHLAEGE):
+        """Accounts, die mit der Eingabe beginnen, sonst solche mit einem Tippfehler."""
+        return self.suchen(text, anzahl) or self.aehnliche(text, anzahl)
+
+# --- SPEICHER-BACKENDS ---
+# Die Menü-Funktionen greifen nur über SPEICHER auf die gespeicherten Accounts zu.
+# Jedes Backend bietet: kennung(benutzerdaten), laden(kennung), speichern(benutzerdaten), loeschen(benutzerdaten),
+# vorschlaege(eingabe) (passende Accounts, wenn die Eingabe beim Login keinen Account trifft)
+# sowie verlauf_verzeichnis (wo die Monatsstände seiner Accounts liegen, siehe Abschnitt VERLAUF).
+
+SPERR_DATEI = ".budget.lock" # Eine Sperrdatei pro Verzeichnis (für alle Accounts, den Index bzw. den Verlauf darin)
+VERLAUF_VERZEICHNIS = "verlauf" # Monatsstände der Account-Dateien (siehe Abschnitt VERLAUF)
+KONTO_CACHE_GROESSE = 256 # Anzahl geladener Accounts, die im Speicher bleiben
+
+@contextmanager
+def datei_sperren(dateiname, exklusiv=True):
+    """Hält eine Advisory-Sperre (fcntl.flock) auf die Sperrdatei im Verzeichnis von dateiname, solange der with-Block läuft.
+    Andere Prozesse warten so lange; ohne fcntl wird nicht gesperrt. Die Sperre gilt für das ganze Verzeichnis und darf
+    deshalb nicht verschachtelt werden (eine zweite Sperre desselben Prozesses würde auf die erste warten)."""
+    if fcntl is None:
+        yield
+        return
+    with open(os.path.join(os.path.dirname(dateiname) or os.curdir, SPERR_DATEI), 'a') as file:
+        fcntl.flock(file.fileno(), fcntl.LOCK_EX if exklusiv else fcntl.LOCK_SH)
+        yield
+
+def _datei_signatur(dateiname):
+    """Änderungszeit und Grösse der Datei und ihres Journals (None, wenn die Datei fehlt)."""
+    try:
+        stand = os.stat(dateiname)
+    except FileNotFoundError:
+        return None
+    try:
+        journal = os.stat(dateiname + JOURNAL_ENDUNG)
+        journal = (journal.st_mtime_ns, journal.st_size)
+    except FileNotFoundError:
+        journal = None
+    return stand.st_mtime_ns, stand.st_size, journal
+
+class DateiSpeicher:
+    """Speichert jeden Account als eigene Datei (Name_Vorname.txt oder im Binärformat Name_Vorname.bin) plus Änderungsjournal."""
+
+    def __init__(self, binaer=False, cache_groesse=KONTO_CACHE_GROESSE):
+        self.binaer = binaer
+        self._stand = {} # Zuletzt geladener/gespeicherter Stand pro Datei (für die Erkennung von Änderungen)
+        # (Pfad, Signatur) -> Stand: Ändert ein anderer Prozess die Datei oder das Journal, passt die Signatur nicht mehr
+        self.cache = LruCache(cache_groesse)
+        self.index = Kontoindex() # Alle Account-Dateien im aktuellen Verzeichnis, für die Suche beim Login
+        self.verlauf_verzeichnis = VERLAUF_VERZEICHNIS # Monatsstände neben den Account-Dateien
+
+    def kennung(self, benutzerdaten):
+        endung = DATEI_ENDUNG_BINAER if self.binaer else DATEI_ENDUNG
+        return f'{benutzerdaten["Name"]}_{benutzerdaten["Vorname"]}{endung}'
+
+    def laden(self, kennung):
+        """Gibt die Daten zurück oder None, falls die Datei nicht existiert. Das Format wird automatisch erkannt.
+        Unveränderte Dateien kommen aus dem Cache, ohne sie erneut zu lesen."""
+        schluessel = os.path.abspath(kennung)
+        signatur = _datei_signatur(kennung)
+        if signatur is None:
+            return None
+        stand = self.cache.holen((schluessel, signatur))
+        if stand is None:
+            with datei_sperren(kennung, exklusiv=False):
+                signatur = _datei_signatur(kennung)
+                if signatur is None:
+                    return None
+                stand = _stand_kopieren(konto_datei_laden(kennung))
+            self.cache.ablegen((schluessel, signatur), stand)
+        self._stand[schluessel] = stand
+        return _stand_kopieren(stand)
+
+    def speichern(self, benutzerdaten):
+        """Speichert nur die Änderungen seit dem letzten Stand; gibt None zurück, wenn es nichts zu speichern gab."""
+        dateiname = self.kennung(benutzerdaten)
+        schluessel = os.path.abspath(dateiname)
+        alter_stand = self._stand.get(schluessel)
+
+        with datei_sperren(dateiname):
+            neu = not os.path.exists(dateiname)
+            if alter_stand is None or neu:
+                atomar_schreiben(dateiname, benutzerdaten, self.binaer)
+            else:
+                eintraege = aenderungen_ermitteln(alter_stand, benutzerdaten)
+                if not eintraege:
+                    return None
+                journal_groesse = journal_anhaengen(dateiname + JOURNAL_ENDUNG, eintraege)
+                if journal_groesse > max(JOURNAL_MIN_BYTES, os.path.getsize(dateiname)):
+                    atomar_schreiben(dateiname, benutzerdaten, self.binaer) # Kompaktierung
+            signatur = _datei_signatur(dateiname)
+
+        self._stand[schluessel] = _stand_kopieren(benutzerdaten)
+        self.cache.ablegen((schluessel, signatur), self._stand[schluessel]) # Ein erneutes Login liest die Datei nicht neu
+        if neu:
+            self._index_aendern(self.index.hinzufuegen, dateiname)
+        return dateiname
+
+    def _index_aendern(self, aenderung, dateiname):
+        """Ein Fehler im Index soll das Speichern oder Löschen des Accounts selbst nicht scheitern lassen."""
+        try:
+            aenderung(dateiname)
+        except OSError as e:
+            print(f"Warnung: Account-Index nicht aktualisiert ({e})", file=sys.stderr)
+
+    def vorschlaege(self, eingabe):
+        """Gespeicherte Accounts, die zur Eingabe passen (Anfang von Name/Vorname oder ein Tippfehler)."""
+        return self.index.vorschlaege(eingabe)
+
+    def loeschen(self, benutzerdaten):
+        """Löscht die Datei samt Journal und gibt zurück, ob sie vorhanden war."""
+        dateiname = self.kennung(benutzerdaten)
+        self._stand.pop(os.path.abspath(dateiname), None)
+        with datei_sperren(dateiname):
+            if os.path.exists(dateiname + JOURNAL_ENDUNG):
+                os.remove(dateiname + JOURNAL_ENDUNG)
+            vorhanden = os.path.exists(dateiname)
+            if vorhanden:
+                os.remove(dateiname)
+        if vorhanden:
+            self._index_aendern(self.index.entfernen, dateiname)
+        return vorhanden
+
+class SqliteSpeicher:
+    """Speichert alle Accounts in einer SQLite-Datenbank (Kostenpunkte in einer eigenen Tabelle)."""
+
+    # Felder mit eigener Spalte (für Abfragen über alle Accounts), alle übrigen landen als JSON in "weitere"
+    SPALTEN = {"Alter": "alter_jahre", "Aktuelles Gesamtvermögen": "vermoegen", "Finanzielle Reserve": "reserve",
+               "Einkommen Netto": "einkommen_netto", "Monatliche Gesamtkosten": "gesamtkosten", "Monatliches Ergebnis": "ergebnis"}
+
+    def __init__(self, pfad):
+        self.verlauf_verzeichnis = os.path.splitext(pfad)[0] + "_" + VERLAUF_VERZEICHNIS # z.B. konten.db -> konten_verlauf
+        # Der Server greift aus seinem I/O-Thread zu (immer nur ein Thread gleichzeitig, siehe ApiServer)
+        self.verbindung = sqlite3.connect(pfad, check_same_thread=False)
+        self.verbindung.execute("PRAGMA journal_mode=WAL") # Leser blockieren Schreiber nicht
+        self.verbindung.execute("PRAGMA synchronous=NORMAL")
+        self.verbindung.execute("PRAGMA foreign_keys=ON")
+        spalten = ", ".join(f"{spalte} REAL" for spalte in self.SPALTEN.values())
+        with self.verbindung:
+            self.verbindung.execute(f"""CREATE TABLE IF NOT EXISTS konten (
+                id INTEGER PRIMARY KEY, kennung TEXT NOT NULL UNIQUE, name TEXT NOT NULL, vorname TEXT NOT NULL,
+                {spalten}, weitere TEXT NOT NULL)""")
+            self.verbindung.execute("CREATE INDEX IF NOT EXISTS konten_name ON konten (name, vorname)")
+            # Für die Präfixsuche mit LIKE (ohne Gross-/Kleinschreibung) braucht SQLite Indizes mit COLLATE NOCASE
+            self.verbindung.execute("CREATE INDEX IF NOT EXISTS konten_name_suche ON konten (name COLLATE NOCASE, vorname COLLATE NOCASE)")
+            self.verbindung.execute("CREATE INDEX IF NOT EXISTS konten_vorname_suche ON konten (vorname COLLATE NOCASE, name COLLATE NOCASE)")
+            self.verbindung.execute("""CREATE TABLE IF NOT EXISTS kosten (
+                konto_id INTEGER NOT NULL REFERENCES konten (id) ON DELETE CASCADE, art TEXT NOT NULL,
+                posten TEXT NOT NULL, betrag REAL NOT NULL, position INTEGER NOT NULL, PRIMARY KEY (konto_id, art, posten))""")
+
+    def kennung(self, benutzerdaten):
+        return f'{benutzerdaten["Name"]}_{benutzerdaten["Vorname"]}'
+
+    @staticmethod
+    def _ohne_endung(kennung):
+        kennung = os.path.basename(kennung.strip())
+        for endung in (DATEI_ENDUNG, DATEI_ENDUNG_BINAER):
+            if kennung.endswith(endung):
+                kennung = kennung[:-len(endung)]
+        return kennung
+
+    def vorschlaege(self, eingabe, anzahl=KONTOINDEX_VORSCHLAEGE):
+        """Accounts, deren 'Name Vorname' oder 'Vorname Name' mit der Eingabe beginnt (LIKE 'praefix%' über die Namensindizes)."""
+        text = self._ohne_endung(eingabe)
+        erstes, trenner, zweites = text.partition("_")
+        if not trenner:
+            erstes, _, zweites = text.partition(" ")
+        if not erstes.strip():
+            return []
+        muster = [wort.strip().replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%" for wort in (erstes, zweites)]
+        treffer = {}
+        for spalte, andere in (("name", "vorname"), ("vorname", "name")):
+            abfrage = (f"SELECT kennung FROM konten WHERE {spalte} LIKE ? ESCAPE '\\' AND {andere} LIKE ? ESCAPE '\\' "
+                       f"ORDER BY {spalte} COLLATE NOCASE, {andere} COLLATE NOCASE LIMIT ?")
+            for (kennung,) in self.verbindung.execute(abfrage, (*muster, anzahl)):
+                treffer[kennung] = None
+        return sorted(treffer, key=str.casefold)[:anzahl]
+
+    def laden(self, kennung):
+        """Gibt die Daten zurück oder None, falls der Account nicht existiert ('Meier_Hans.txt' und 'Meier_Hans' sind gleichwertig)."""
+        kennung = self._ohne_endung(kennung)
+        spalten = ", ".join(self.SPALTEN.values())
+        zeile = self.verbindung.execute(f"SELECT id, name, vorname, {spalten}, weitere FROM konten WHERE kennung = ?", (kennung,)).fetchone()
+        if zeile is None:
+            return None
+
+        konto_id, name, vorname, *werte, weitere = zeile
+        benutzerdaten = {"Vorname": vorname, "Name": name}
+        for key, wert in zip(self.SPALTEN, werte):
+            if wert is not None:
+                benutzerdaten[key] = int(wert) if key == "Alter" else wert
+        benutzerdaten.update(json.loads(weitere))
+        for art in KOSTEN_ARTEN:
+            if art in benutzerdaten:
+                benutzerdaten[art] = {} # Die Kostenpunkte selbst stehen in der Tabelle "kosten"
+        for art, posten, betrag in self.verbindung.execute("SELECT art, posten, betrag FROM kosten WHERE konto_id = ? ORDER BY art, position", (konto_id,)):
+            benutzerdaten.setdefault(art, {})[posten] = betrag
+        return benutzerdaten
+
+    def _konto_schreiben(self, benutzerdaten):
+        """Schreibt einen Account innerhalb der laufenden Transaktion."""
+        werte = [benutzerdaten.get(key) if isinstance(benutzerdaten.get(key), (int, float)) else None for key in self.SPALTEN]
+        weitere = {key: wert for key, wert in benutzerdaten.items() if key not in ("Name", "Vorname") and key not in KOSTEN_ARTEN and (key not in self.SPALTEN or not isinstance(wert, (int, float)))}
+        # Leere Kosten-Dictionaries merken, damit sie beim Laden wieder vorhanden sind
+        for art in KOSTEN_ARTEN:
+            if art in benutzerdaten:
+                weitere[art] = {}
+        spalten = ", ".join(self.SPALTEN.values())
+        platzhalter = ", ".join("?" * len(self.SPALTEN))
+        aktualisieren = ", ".join(f"{spalte} = excluded.{spalte}" for spalte in self.SPALTEN.values())
+        konto_id = self.verbindung.execute(
+            f"""INSERT INTO konten (kennung, name, vorname, {spalten}, weitere) VALUES (?, ?, ?, {platzhalter}, ?)
+                ON CONFLICT (kennung) DO UPDATE SET {aktualisieren}, weitere = excluded.weitere RETURNING id""",
+            (self.kennung(benutzerdaten), benutzerdaten["Name"], benutzerdaten["Vorname"], *werte, json.dumps(weitere))).fetchone()[0]
+
+        self.verbindung.execute("DELETE FROM kosten WHERE konto_id = ?", (konto_id,))
+        self.verbindung.executemany("INSERT INTO kosten (konto_id, art, posten, betrag, position) VALUES (?, ?, ?, ?, ?)",
+                                    [(konto_id, art, posten, betrag, position)
+                                     for art in KOSTEN_ARTEN
+                                     for position, (posten, betrag) in enumerate(benutzerdaten.get(art, {}).items())])
+
+    def speichern(self, benutzerdaten):
+        with self.verbindung:
+            self._konto_schreiben(benutzerdaten)
+        return self.kennung(benutzerdaten)
+
+    def speichern_mehrere(self, konten):
+        """Speichert viele Accounts in einer einzigen Transaktion."""
+        with self.verbindung:
+            for benutzerdaten in konten:
+                self._konto_schreiben(benutzerdaten)
+
+    def loeschen(self, benutzerdaten):
+        """Löscht den Account (inkl. Kostenpunkte) und gibt zurück, ob er vorhanden war."""
+        with self.verbindung:
+            geloescht = self.verbindung.execute("DELETE FROM konten WHERE kennung = ?", (self.kennung(benutzerdaten),)).rowcount
+        return geloescht > 0
+
+    def schliessen(self):
+        self.verbindung.close()
+
+SPEICHER = DateiSpeicher() # Aktives Backend, wird über die Kommandozeile (--datenbank) umgestellt
+
+def text_dateien_migrieren(verzeichnis, speicher, paket_groesse=1000):
+    """Importiert alle Textdateien eines Verzeichnisses paketweise (eine Transaktion pro Paket) in ein SQLite-Backend."""
+    paket = []
+    anzahl_ok = 0
+    anzahl_fehler = 0
+    for dateiname in batch_dateien_finden(verzeichnis):
+        try:
+            benutzerdaten = konto_datei_laden(dateiname)
+        except Exception as e:
+            anzahl_fehler += 1
+            print(f"Warnung: Datei '{dateiname}' übersprungen ({e})", file=sys.stderr)
+            continue
+        paket.append(benutzerdaten)
+        if len(paket) >= paket_groesse:
+            speicher.speichern_mehrere(paket)
+            anzahl_ok += len(paket)
+            paket = []
+    if paket:
+        speicher.speichern_mehrere(paket)
+        anzahl_ok += len(paket)
+    anzeigen(f"{anzahl_ok} Accounts migriert, {anzahl_fehler} Dateien übersprungen.")
+    return anzahl_ok, anzahl_fehler
+
+def vorschlag_waehlen(eingabe):
+    """Bietet bei einem unbekannten Dateinamen passende Accounts zur Auswahl an und gibt den gewählten zurück (sonst None)."""
+    vorschlaege = SPEICHER.vorschlaege(eingabe) if eingabe else []
+    if not vorschlaege:
+        anzeigen(f"Fehler: Datei '{eingabe}' wurde nicht gefunden.")
+        return None
+    anzeigen(f"Datei '{eingabe}' wurde nicht gefunden. Meinten Sie:")
+    for nummer, vorschlag in enumerate(vorschlaege, 1):
+        anzeigen(f"{nummer}. {vorschlag}")
+    wahl = abfragen(f"Ihre Wahl (1-{len(vorschlaege)}, Enter = Abbrechen): ").strip()
+    if wahl.isdigit() and 1 <= int(wahl) <= len(vorschlaege):
+        return vorschlaege[int(wahl) - 1]
+    anzeigen("Laden abgebrochen.")
+    return None
+
+def daten_laden(benutzerdaten):
+    """Lädt die Daten aus einer Textdatei und stellt sie wieder her."""
+    anzeigen("\n--- Daten aus Textdatei laden ---")
+    dateiname = abfragen("Name der zu ladenden Datei (z.B. 'Meier_Hans.txt'): ").strip()
+    
+    try:
+        geladene_daten = SPEICHER.laden(dateiname)
+        if geladene_daten is None:
+            dateiname = vorschlag_waehlen(dateiname)
+            if dateiname is None:
+                return None
+            geladene_daten = SPEICHER.laden(dateiname)
+            if geladene_daten is None:
+                anzeigen(f"Fehler: Datei '{dateiname}' wurde nicht gefunden.")
+                return None
+        benutzerdaten.update(geladene_daten)
+        
+        # Wichtig: Nach dem Laden muss das Ergebnis neu berechnet werden, um 'Ergebnis Art' zu setzen.
+        if "Einkommen Netto" in benutzerdaten and "Monatliche Gesamtkosten" in benutzerdaten:
+            benutzerdaten = finanzen_berechnen(benutzerdaten)
+
+        anzeigen(f"Daten für {benutzerdaten.get('Vorname', '')} {benutzerdaten.get('Name', '')} erfolgreich geladen.")
+        return benutzerdaten
+
+    except Exception as e:
+        anzeigen(f"Fehler beim Lesen der Datei: {e}")
+        return None
+
+
+# Vorstellung durch Jana
+
+def daten_speichern(benutzerdaten):
+    """Speichert alle Daten über das aktive Speicher-Backend (Standard: Textdatei)."""
+    if "Name" not in benutzerdaten or "Vorname" not in benutzerdaten:
+        anzeigen("Fehler: Name und Vorname fehlen. Speichern nicht möglich.")
+        return
+    
+    try:
+        dateiname = SPEICHER.speichern(benutzerdaten)
+        if dateiname is None:
+            anzeigen("\nKeine Änderungen seit dem letzten Speichern.")
+        else:
+            anzeigen(f"\nDaten erfolgreich gespeichert in: *{dateiname}*")
+    
+    except Exception as e:
+        anzeigen(f"\nFehler beim Speichern der Datei: {e}")
+        return
+
+    try:
+        verlauf_festhalten(benutzerdaten)
+    except OSError as e:
+        anzeigen(f"Warnung: Der Monatsstand konnte nicht im Verlauf festgehalten werden ({e}).")
+
+# --- VERLAUF (MONATLICHE STÄNDE) ---
+# Bei jedem Speichern wird der Stand des Accounts für den aktuellen Monat festgehalten. Die Stände aller Accounts liegen
+# spaltenweise im Verzeichnis "verlauf": pro Spalte eine Datei mit ganzen Zahlen fester Breite (int64, Beträge in Rappen),
+# eine Zeile pro Account und Monat. Neue Stände werden angehängt, ein zweiter Stand im selben Monat ersetzt den ersten.
+# Abfragen bilden die Spalten per mmap ab, statt sie einzulesen. Schreiber sperren den ganzen Verlauf exklusiv über
+# die Sperrdatei des Verzeichnisses, Leser geteilt. Das Verzeichnis gehört zum Speicher-Backend (verlauf_verzeichnis).
+#   konten.txt                  eine Kennung pro Zeile (Zeilennummer = Konto-Nummer)
+#   letzte.q                    pro Konto-Nummer die letzte Zeile + 1 (0 = noch kein Stand)
+#   konto.q, monat.q, vorher.q  Konto-Nummer, Monat (Jahr * 12 + Monat - 1) und vorherige Zeile desselben Accounts (-1 = keine)
+#   <kennzahl>.q                eine Spalte pro Kennzahl
+#   unsortiert                  vorhanden, sobald ein Stand für einen früheren Monat angehängt wurde (sonst ist monat.q
+#                               aufsteigend und Monatsbereiche lassen sich per Binärsuche finden)
+
+VERLAUF_KENNZAHLEN = ["Aktuelles Gesamtvermögen", "Einkommen Netto", "Fixkosten", "Variable Kosten", "Monatliche Gesamtkosten", "Monatliches Ergebnis"]
+_VERLAUF_SPALTEN = ["konto", "monat", "vorher"] + VERLAUF_KENNZAHLEN
+_ZAHL = struct.Struct("<q")
+
+# Lückenlose Monatsreihe eines Accounts (oder aller Accounts zusammen) mit den gleitenden Kennzahlen über 12 Monate
+VerlaufAuswertung = namedtuple("VerlaufAuswertung", ["monate", "vermoegen", "ausgaben_12m", "sparquote_12m", "sparquote_vorjahr"])
+
+def monat_nummer(jahr, monat):
+    return jahr * 12 + monat - 1
+
+def monat_text(nummer):
+    jahr, monat = divmod(nummer, 12)
+    return f"{jahr:04d}-{monat + 1:02d}"
+
+def aktueller_monat():
+    jetzt = time.localtime()
+    return monat_nummer(jetzt.tm_year, jetzt.tm_mon)
+
+def verlauf_kennung(benutzerdaten):
+    """Kennung eines Accounts im Verlauf (unabhängig vom Speicher-Backend und Dateiformat)."""
+    return f'{benutzerdaten["Name"]}_{benutzerdaten["Vorname"]}'
+
+def verlauf_werte(benutzerdaten):
+    """Die Kennzahlen eines Accounts in Rappen (fehlende Angaben zählen als 0)."""
+    werte = []
+    for kennzahl in VERLAUF_KENNZAHLEN:
+        if kennzahl in KOSTEN_ARTEN:
+            werte.append(kostenliste_holen(benutzerdaten, kennzahl).summe_rappen)
+        else:
+            wert = benutzerdaten.get(kennzahl)
+            werte.append(betrag_zu_rappen(wert) if isinstance(wert, (int, float)) else 0)
+    return werte
+
+def _zahlen_schreiben(pfad, zeile, daten):
+    """Schreibt int64-Werte (als Bytes) ab einer Zeile in eine Spaltendatei und legt sie bei Bedarf an."""
+    with open(pfad, 'r+b' if os.path.exists(pfad) else 'w+b') as datei:
+        datei.seek(zeile * _ZAHL.size)
+        datei.write(daten)
+
+def _zahl_lesen(pfad, zeile):
+    """Liest einen einzelnen Wert einer Spalte (None, wenn es die Zeile nicht gibt)."""
+    try:
+        with open(pfad, 'rb') as datei:
+            datei.seek(zeile * _ZAHL.size)
+            daten = datei.read(_ZAHL.size)
+    except FileNotFoundError:
+        return None
+    return _ZAHL.unpack(daten)[0] if len(daten) == _ZAHL.size else None
+
+def _spalte_abbilden(pfad, anzahl):
+    """Bildet die ersten 'anzahl' Werte einer Spaltendatei per mmap ohne Kopie ab (als NumPy-Array bzw. memoryview)."""
+    if anzahl == 0:
+        return np.zeros(0, dtype=np.int64) if np is not None else array('q')
+    with open(pfad, 'rb') as datei:
+        speicher = mmap.mmap(datei.fileno(), 0, access=mmap.ACCESS_READ)
+    if np is not None:
+        return np.frombuffer(speicher, dtype='<i8', count=anzahl) # Schneller als numpy.memmap beim Zugriff auf einzelne Werte
+    if sys.byteorder == "little":
+        return memoryview(speicher).cast('q')[:anzahl] # Hält das mmap offen, solange die Spalte gebraucht wird
+    werte = array('q', speicher[:anzahl * _ZAHL.size])
+    werte.byteswap()
+    return werte
+
+class Verlauf:
+    """Monatliche Stände aller Accounts in spaltenweisen Dateien (Aufbau siehe oben)."""
+
+    def __init__(self, verzeichnis=VERLAUF_VERZEICHNIS):
+        self.verzeichnis = verzeichnis
+        self._konten = {}
+        self._konten_groesse = 0 # Grösse von konten.txt beim letzten Einlesen
+        self._abbildungen = {} # Spalte -> abgebildete Werte; bleiben offen, damit bereits gelesene Seiten gemappt bleiben
+
+    def _pfad(self, spalte):
+        return os.path.join(self.verzeichnis, spalte.lower().replace(" ", "_") + ".q")
+
+    def _spalte(self, spalte, anzahl):
+        """Die ersten 'anzahl' Werte einer Spalte; neu abgebildet wird nur, wenn die Spalte seither gewachsen ist."""
+        werte = self._abbildungen.get(spalte)
+        if werte is None or len(werte) < anzahl:
+            werte = _spalte_abbilden(self._pfad(spalte), anzahl)
+            if not isinstance(werte, array): # Kopien (Big-Endian ohne NumPy) sähen spätere Überschreibungen nicht
+                self._abbildungen[spalte] = werte
+        return werte[:anzahl]
+
+    def konten(self):
+        """Kennung -> Konto-Nummer (wird neu eingelesen, wenn ein anderer Prozess Accounts ergänzt hat)."""
+        pfad = os.path.join(self.verzeichnis, "konten.txt")
+        try:
+            groesse = os.path.getsize(pfad)
+        except OSError:
+            return self._konten
+        if groesse != self._konten_groesse:
+            with open(pfad, 'r', encoding='utf-8') as datei:
+                self._konten = {kennung: nummer for nummer, kennung in enumerate(datei.read().splitlines())}
+            self._konten_groesse = groesse
+        return self._konten
+
+    def _sperren(self, exklusiv=True):
+        """Sperrt den ganzen Verlauf: Anhängen exklusiv (Nummern vergeben, Zeilen und 'letzte' schreiben), Abfragen geteilt."""
+        if not exklusiv and not os.path.isdir(self.verzeichnis):
+            return nullcontext() # Noch kein Verlauf: nichts zu lesen, also auch nichts anlegen
+        os.makedirs(self.verzeichnis, exist_ok=True)
+        return datei_sperren(os.path.join(self.verzeichnis, "konten.txt"), exklusiv)
+
+    def _nummern_vergeben(self, kennungen):
+        konten = self.konten()
+        neue = [kennung for kennung in dict.fromkeys(kennungen) if kennung not in konten]
+        if neue:
+            pfad = os.path.join(self.verzeichnis, "konten.txt")
+            with open(pfad, 'a', encoding='utf-8') as datei:
+                datei.write("".join(kennung + "\n" for kennung in neue))
+            for kennung in neue:
+                konten[kennung] = len(konten)
+            self._konten_groesse = os.path.getsize(pfad)
+        return [konten[kennung] for kennung in kennungen]
+
+    def anzahl_zeilen(self):
+        """Anzahl vollständig geschriebener Zeilen (eine beim Schreiben abgebrochene Zeile zählt nicht)."""
+        try:
+            return min(os.path.getsize(self._pfad(spalte)) for spalte in _VERLAUF_SPALTEN) // _ZAHL.size
+        except OSError:
+            return 0
+
+    def _reihenfolge_pruefen(self, zeile, monat):
+        """Markiert den Verlauf als unsortiert, wenn ein Monat vor dem zuletzt angehängten folgt."""
+        if zeile > 0 and monat < _zahl_lesen(self._pfad("monat"), zeile - 1):
+            open(os.path.join(self.verzeichnis, "unsortiert"), 'a').close()
+
+    def sortiert(self):
+        return not os.path.exists(os.path.join(self.verzeichnis, "unsortiert"))
+
+    def anhaengen(self, kennung, monat, werte):
+        """Hält den Stand eines Accounts für einen Monat fest und gibt die Zeile zurück."""
+        with self._sperren():
+            return self._anhaengen(kennung, monat, werte)
+
+    def _anhaengen(self, kennung, monat, werte):
+        nummer = self._nummern_vergeben([kennung])[0]
+        letzte = (_zahl_lesen(self._pfad("letzte"), nummer) or 0) - 1
+        if letzte >= 0 and _zahl_lesen(self._pfad("monat"), letzte) == monat:
+            zeile = letzte
+            spalten, inhalt = VERLAUF_KENNZAHLEN, werte
+        else:
+            zeile = self.anzahl_zeilen()
+            spalten, inhalt = _VERLAUF_SPALTEN, [nummer, monat, letzte, *werte]
+            self._reihenfolge_pruefen(zeile, monat)
+        for spalte, wert in zip(spalten, inhalt):
+            _zahlen_schreiben(self._pfad(spalte), zeile, _ZAHL.pack(wert))
+        _zahlen_schreiben(self._pfad("letzte"), nummer, _ZAHL.pack(zeile + 1))
+        return zeile
+
+    def monatsstaende_anhaengen(self, monat, kennungen, werte):
+        """Hält für viele Accounts den Stand desselben Monats fest (z.B. Monatsabschluss), werte = eine Zeile pro Kennung."""
+        with self._sperren():
+            if np is None:
+                for kennung, zeile in zip(kennungen, werte):
+                    self._anhaengen(kennung, monat, zeile)
+            else:
+                self._monatsstaende_anhaengen(monat, kennungen, werte)
+
+    def _monatsstaende_anhaengen(self, monat, kennungen, werte):
+        nummern = np.array(self._nummern_vergeben(kennungen), dtype=np.int64)
+        werte = np.asarray(werte, dtype='<i8').reshape(len(nummern), len(VERLAUF_KENNZAHLEN))
+        anzahl = self.anzahl_zeilen()
+        letzte = np.zeros(len(self.konten()), dtype='<i8')
+        if os.path.exists(self._pfad("letzte")):
+            gespeichert = np.fromfile(self._pfad("letzte"), dtype='<i8')[:len(letzte)]
+            letzte[:len(gespeichert)] = gespeichert
+        vorher = letzte[nummern] - 1
+        gleicher_monat = vorher >= 0
+        gleicher_monat[gleicher_monat] = self._spalte("monat", anzahl)[vorher[gleicher_monat]] == monat
+
+        if gleicher_monat.any():
+            zeilen = vorher[gleicher_monat]
+            for spalte, werte_spalte in zip(VERLAUF_KENNZAHLEN, werte[gleicher_monat].T):
+                ersetzen = np.memmap(self._pfad(spalte), dtype='<i8', mode='r+', shape=(anzahl,))
+                ersetzen[zeilen] = werte_spalte
+                ersetzen.flush()
+                del ersetzen
+        neu = ~gleicher_monat
+        neue_nummern = nummern[neu]
+        if len(neue_nummern):
+            self._reihenfolge_pruefen(anzahl, monat)
+        spalten = [neue_nummern, np.full(len(neue_nummern), monat, dtype='<i8'), vorher[neu], *werte[neu].T]
+        for spalte, inhalt in zip(_VERLAUF_SPALTEN, spalten):
+            _zahlen_schreiben(self._pfad(spalte), anzahl, np.ascontiguousarray(inhalt, dtype='<i8').tobytes())
+        letzte[neue_nummern] = np.arange(anzahl + 1, anzahl + 1 + len(neue_nummern))
+        _zahlen_schreiben(self._pfad("letzte"), 0, letzte.tobytes())
+
+    def konto_staende(self, kennung, von=None, bis=None):
+        """Die Stände eines Accounts (Monate von/bis als Nummer, je inklusive): (Monate, {Kennzahl: Werte in Rappen})."""
+        with self._sperren(exklusiv=False):
+            return self._konto_staende(kennung, von, bis)
+
+    def _konto_staende(self, kennung, von, bis):
+        nummer = self.konten().get(kennung)
+        letzte = None if nummer is None else _zahl_lesen(self._pfad("letzte"), nummer)
+        anzahl = self.anzahl_zeilen()
+        monate_spalte = self._spalte("monat", anzahl)
+        vorher_spalte = self._spalte("vorher", anzahl)
+        # Rückwärts der Kette der Zeilen dieses Accounts entlang, ohne die anderen Accounts zu lesen
+        zeilen = []
+        zeile = (letzte or 0) - 1
+        while 0 <= zeile < anzahl:
+            monat = monate_spalte[zeile]
+            if von is not None and monat < von:
+                break
+            if bis is None or monat <= bis:
+                zeilen.append(zeile)
+            zeile = int(vorher_spalte[zeile])
+        zeilen.reverse()
+        monate = [int(monate_spalte[zeile]) for zeile in zeilen]
+        werte = {}
+        for kennzahl in VERLAUF_KENNZAHLEN:
+            spalte = self._spalte(kennzahl, anzahl)
+            werte[kennzahl] = spalte[zeilen].tolist() if np is not None else [spalte[zeile] for zeile in zeilen]
+        return monate, werte
+
+    def monatssummen(self, kennzahlen, von=None, bis=None):
+        """Summen von Kennzahlen über alle Accounts pro Monat: (Monate, {Kennzahl: Summen in Rappen}, Anzahl Accounts pro Monat)."""
+        with self._sperren(exklusiv=False):
+            return self._monatssummen(kennzahlen, von, bis)
+
+    def _monatssummen(self, kennzahlen, von, bis):
+        anzahl = self.anzahl_zeilen()
+        monate_spalte = self._spalte("monat", anzahl)
+        if np is not None and self.sortiert():
+            # Aufsteigende Monate: Bereich und Monatsgrenzen per Binärsuche, Summen pro Abschnitt ohne Kopie der Spalten
+            anfang = 0 if von is None else int(np.searchsorted(monate_spalte, von, side='left'))
+            ende = anzahl if bis is None else int(np.searchsorted(monate_spalte, bis, side='right'))
+            if anfang >= ende:
+                return [], {kennzahl: [] for kennzahl in kennzahlen}, []
+            bereich = monate_spalte[anfang:ende]
+            alle_monate = np.arange(bereich[0], bereich[-1] + 1)
+            grenzen = np.searchsorted(bereich, alle_monate, side='left')
+            anzahl_konten = np.diff(np.append(grenzen, len(bereich)))
+            vorhanden = anzahl_konten > 0
+            grenzen = grenzen[vorhanden]
+            summen = {kennzahl: np.add.reduceat(self._spalte(kennzahl, anzahl)[anfang:ende], grenzen).tolist()
+                      for kennzahl in kennzahlen}
+            return alle_monate[vorhanden].tolist(), summen, anzahl_konten[vorhanden].tolist()
+        if np is not None:
+            auswahl = np.ones(anzahl, dtype=bool)
+            if von is not None:
+                auswahl &= monate_spalte >= von
+            if bis is not None:
+                auswahl &= monate_spalte <= bis
+            if not auswahl.any():
+                return [], {kennzahl: [] for kennzahl in kennzahlen}, []
+            ausgewaehlt = monate_spalte[auswahl]
+            erster = int(ausgewaehlt.min())
+            position = ausgewaehlt - erster
+            anzahl_konten = np.bincount(position)
+            vorhanden = np.flatnonzero(anzahl_konten)
+            summen = {}
+            for kennzahl in kennzahlen:
+                werte = self._spalte(kennzahl, anzahl)[auswahl]
+                # bincount rechnet mit float64; bis 2**53 Rappen pro Monat (rund 90 Billionen CHF) bleibt das exakt
+                summen[kennzahl] = np.bincount(position, weights=werte)[vorhanden].astype(np.int64).tolist()
+            return (vorhanden + erster).tolist(), summen, anzahl_konten[vorhanden].tolist()
+        summen = {kennzahl: {} for kennzahl in kennzahlen}
+        anzahl_konten = {}
+        spalten = {kennzahl: self._spalte(kennzahl, anzahl) for kennzahl in kennzahlen}
+        for zeile, monat in enumerate(monate_spalte):
+            if (von is not None and monat < von) or (bis is not None and monat > bis):
+                continue
+            anzahl_konten[monat] = anzahl_konten.get(monat, 0) + 1
+            for kennzahl, spalte in spalten.items():
+                summen[kennzahl][monat] = summen[kennzahl].get(monat, 0) + spalte[zeile]
+        monate = sorted(anzahl_konten)
+        return monate, {kennzahl: [werte[monat] for monat in monate] for kennzahl, werte in summen.items()}, [anzahl_konten[monat] for monat in monate]
+
+def verlauf_auffuellen(monate, werte):
+    """Macht aus Ständen eine lückenlose Monatsreihe: ein Stand gilt bis zum nächsten."""
+    if not monate:
+        return []
+    reihe = []
+    for index, monat in enumerate(monate):
+        bis = monate[index + 1] if index + 1 < len(monate) else monat + 1
+        reihe.extend(repeat(werte[index], bis - monat))
+    return reihe
+
+def gleitende_summe(werte, fenster=12):
+    """Summe der letzten 'fenster' Werte für jeden Monat (None, solange es noch weniger Werte sind)."""
+    kumuliert = [0, *accumulate(werte)]
+    return [None if ende < fenster else kumuliert[ende] - kumuliert[ende - fenster] for ende in range(1, len(kumuliert))]
+
+def verlauf_auswerten(monate, werte, fenster=12):
+    """Gleitende Kennzahlen über die lückenlose Reihe: Ø Ausgaben und Sparquote der letzten 12 Monate sowie die Veränderung der Sparquote zum Vorjahr."""
+    if not monate:
+        return VerlaufAuswertung([], [], [], [], [])
+    reihe = {kennzahl: verlauf_auffuellen(monate, werte[kennzahl]) for kennzahl in VERLAUF_KENNZAHLEN}
+    ausgaben = gleitende_summe(reihe["Monatliche Gesamtkosten"], fenster)
+    ergebnis = gleitende_summe(reihe["Monatliches Ergebnis"], fenster)
+    einkommen = gleitende_summe(reihe["Einkommen Netto"], fenster)
+    sparquote = [None if summe is None or not basis else summe / basis for summe, basis in zip(ergebnis, einkommen)]
+    vorjahr = [None if index < fenster or quote is None or sparquote[index - fenster] is None else quote - sparquote[index - fenster]
+               for index, quote in enumerate(sparquote)]
+    return VerlaufAuswertung(
+        [monat_text(monat) for monat in range(monate[0], monate[0] + len(ausgaben))],
+        [rappen_zu_betrag(wert) for wert in reihe["Aktuelles Gesamtvermögen"]],
+        [None if summe is None else rappen_zu_betrag(round(summe / fenster)) for summe in ausgaben],
+        sparquote, vorjahr)
+
+_VERLAEUFE = {} # Verzeichnis -> Verlauf (behält die abgebildeten Spalten zwischen Abfragen)
+
+def verlauf_holen(speicher=None):
+    """Der Verlauf des Speicher-Backends (bei SQLite neben der Datenbank, sonst neben den Account-Dateien)."""
+    verzeichnis = (speicher or SPEICHER).verlauf_verzeichnis
+    verlauf = _VERLAEUFE.get(verzeichnis)
+    if verlauf is None:
+        verlauf = _VERLAEUFE[verzeichnis] = Verlauf(verzeichnis)
+    return verlauf
+
+def verlauf_festhalten(benutzerdaten, monat=None):
+    """Hält den aktuellen Stand des Accounts im Verlauf fest (wird beim Speichern aufgerufen)."""
+    verlauf_holen().anhaengen(verlauf_kennung(benutzerdaten), aktueller_monat() if monat is None else monat, verlauf_werte(benutzerdaten))
+
+# --- MONTE-CARLO-SIMULATION ---
+# Pro Pfad und Jahr wird eine zufällige Rendite gezogen (log-normal) und Monat für Monat auf das positive Vermögen
+# angewendet. Die Kosten steigen monatlich mit der Inflation, dazu kommen zufällige Kostenschocks (unerwartete Ausgaben).
+
+# Standardannahmen (pro Jahr): Rendite und Volatilität des Vermögens, Inflation der Kosten,
+# Wahrscheinlichkeit eines Kostenschocks und dessen durchschnittliche Höhe in CHF
+SIMULATION_STANDARD = {"rendite": 0.03, "volatilitaet": 0.08, "inflation": 0.01, "schock_wahrscheinlichkeit": 0.2, "schock_betrag": 3000.0}
+SIMULATION_PFADE = 100_000
+SIMULATION_PFADE_OHNE_NUMPY = 2_000 # Ohne NumPy wird jeder Pfad einzeln in Python gerechnet
+SIMULATION_PERZENTILE = (5, 50, 95)
+
+# perzentile: {5: [...], 50: [...], 95: [...]} mit dem Vermögen am Ende jedes Jahres (Index 0 = heute)
+Simulation = namedtuple("Simulation", ["jahre", "perzentile", "ziel_wahrscheinlichkeit", "pfade"])
+
+def _perzentil(sortiert, prozent):
+    """Perzentil einer sortierten Liste mit linearer Interpolation (wie np.percentile)."""
+    position = (len(sortiert) - 1) * prozent / 100
+    unten = int(position)
+    oben = min(unten + 1, len(sortiert) - 1)
+    return sortiert[unten] + (sortiert[oben] - sortiert[unten]) * (position - unten)
+
+def _simulation_numpy(sparbetraege, vermoegen, jahre, pfade, mu, sigma, schock_monat, schock_betrag, ziel, seed):
+    """Rechnet alle Pfade gleichzeitig als NumPy-Arrays (eine Schleife über die Monate, nicht über die Pfade)."""
+    rng = np.random.default_rng(seed)
+    stand = np.full(pfade, float(vermoegen))
+    jahresstaende = np.empty((jahre + 1, pfade))
+    jahresstaende[0] = stand
+    erreicht = stand >= ziel if ziel is not None else None
+    zuwachs = np.empty(pfade)
+    zufallszahlen = np.empty(pfade)
+    getroffen = np.empty(pfade, dtype=bool)
+
+    for jahr in range(jahre):
+        monatsrendite = np.expm1(rng.normal(mu, sigma, pfade) / 12)
+        for monat in range(jahr * 12, jahr * 12 + 12):
+            np.maximum(stand, 0.0, out=zuwachs) # Schulden werden nicht verzinst
+            zuwachs *= monatsrendite
+            stand += zuwachs
+            stand += sparbetraege[monat]
+            if schock_monat > 0:
+                # Wie in _simulation_python höchstens ein Schock pro Pfad und Monat
+                rng.random(out=zufallszahlen)
+                np.less(zufallszahlen, schock_monat, out=getroffen)
+                anzahl_schocks = np.count_nonzero(getroffen)
+                if anzahl_schocks:
+                    stand[getroffen] -= rng.exponential(schock_betrag, anzahl_schocks)
+            if erreicht is not None:
+                erreicht |= stand >= ziel
+        jahresstaende[jahr + 1] = stand
+
+    werte = np.percentile(jahresstaende, SIMULATION_PERZENTILE, axis=1)
+    perzentile = {prozent: reihe.tolist() for prozent, reihe in zip(SIMULATION_PERZENTILE, werte)}
+    return perzentile, None if erreicht is None else float(erreicht.mean())
+
+def _simulation_python(sparbetraege, vermoegen, jahre, pfade, mu, sigma, schock_monat, schock_betrag, ziel, seed):
+    """Gleiche Simulation ohne NumPy, Pfad für Pfad (deutlich langsamer)."""
+    zufall = random.Random(seed)
+    jahresstaende = [[] for _ in range(jahre + 1)]
+    anzahl_erreicht = 0
+
+    for _ in range(pfade):
+        stand = float(vermoegen)
+        erreicht = ziel is not None and stand >= ziel
+        jahresstaende[0].append(stand)
+        for jahr in range(jahre):
+            monatsrendite = math.expm1(zufall.gauss(mu, sigma) / 12)
+            for monat in range(jahr * 12, jahr * 12 + 12):
+                if stand > 0:
+                    stand += stand * monatsrendite
+                stand += sparbetraege[monat]
+                if zufall.random() < schock_monat:
+                    stand -= zufall.expovariate(1 / schock_betrag)
+                if ziel is not None and stand >= ziel:
+                    erreicht = True
+            jahresstaende[jahr + 1].append(stand)
+        anzahl_erreicht += erreicht
+
+    perzentile = {prozent: [] for prozent in SIMULATION_PERZENTILE}
+    for staende in jahresstaende:
+        staende.sort()
+        for prozent in SIMULATION_PERZENTILE:
+            perzentile[prozent].append(_perzentil(staende, prozent))
+    return perzentile, None if ziel is None else anzahl_erreicht / pfade
+
+def vermoegen_simulieren(einkommen, kosten, vermoegen, jahre, ziel=None, pfade=None, seed=None, **annahmen):
+    """Simuliert die Vermögensentwicklung über viele zufällige Pfade (Monte Carlo) und gibt eine Simulation zurück.
+
+    einkommen und kosten sind monatliche Beträge in CHF. annahmen überschreibt einzelne Werte aus SIMULATION_STANDARD.
+    Mit ziel wird zusätzlich die Wahrscheinlichkeit berechnet, das Zielvermögen irgendwann im Zeitraum zu erreichen.
+    """
+    unbekannt = set(annahmen) - set(SIMULATION_STANDARD)
+    if unbekannt:
+        raise ValueError(f"Unbekannte Annahme(n): {', '.join(sorted(unbekannt))}")
+    annahmen = {**SIMULATION_STANDARD, **annahmen}
+    if pfade is None:
+        pfade = SIMULATION_PFADE if np is not None else SIMULATION_PFADE_OHNE_NUMPY
+    if jahre < 1 or pfade < 1:
+        raise ValueError("Es braucht mindestens ein Jahr und einen Pfad.")
+    if annahmen["volatilitaet"] < 0 or not 0 <= annahmen["schock_wahrscheinlichkeit"] <= 12 or annahmen["schock_betrag"] <= 0:
+        raise ValueError("Volatilität, Schock-Wahrscheinlichkeit (0-12 pro Jahr) oder Schock-Betrag ungültig.")
+
+    # Log-normale Jahresrendite mit Erwartungswert "rendite"
+    sigma = annahmen["volatilitaet"]
+    mu = math.log1p(annahmen["rendite"]) - sigma ** 2 / 2
+    teuerung = 1 + annahmen["inflation"]
+    sparbetraege = [einkommen - kosten * teuerung ** (monat / 12) for monat in range(1, jahre * 12 + 1)]
+    schock_monat = annahmen["schock_wahrscheinlichkeit"] / 12
+
+    simulieren = _simulation_numpy if np is not None else _simulation_python
+    perzentile, wahrscheinlichkeit = simulieren(sparbetraege, vermoegen, jahre, pfade, mu, sigma, schock_monat, annahmen["schock_betrag"], ziel, seed)
+    return Simulation(jahre, perzentile, wahrscheinlichkeit, pfade)
+
+def konto_simulieren(benutzerdaten, jahre, **optionen):
+    """Führt vermoegen_simulieren mit Einkommen, Kosten und Vermögen eines Accounts aus."""
+    return vermoegen_simulieren(benutzerdaten.get("Einkommen Netto", 0.0), benutzerdaten.get("Monatliche Gesamtkosten", 0.0),
+                                benutzerdaten.get("Aktuelles Gesamtvermögen", 0.0), jahre, **optionen)
+
+# --- KOSTENPROJEKTION ---
+# Pro Kostenpunkt können eine jährliche Teuerung (z.B. Mietindexierung, Krankenkassenprämien) und ein
+# Gültigkeitszeitraum (z.B. befristetes Abo) hinterlegt werden. Gespeichert wird das im Feld "Kosten Dynamik":
+#   {Kostenart: {Posten: {"wachstum": 0.02, "ab": "2026-01", "bis": "2027-12"}}}   ("ab" und "bis" sind optional)
+
+KOSTEN_DYNAMIK = "Kosten Dynamik"
+PROJEKTION_MONATE = 50 * 12 # Längster Zeitraum für Sparziel (C.1) und Reichweite (C.3)
+
+# Werte pro Monat (Index 0 = aktueller Monat): Kosten, Ergebnis und Vermögen am Monatsende
+Projektion = namedtuple("Projektion", ["kosten", "ergebnis", "vermoegen"])
+
+def monat_parsen(text):
+    """Wandelt einen Monat im Format JJJJ-MM in (Jahr, Monat) um."""
+    jahr, trenner, monat = text.strip().partition("-")
+    if not trenner or not jahr.isdigit() or not monat.isdigit() or not 1 <= int(monat) <= 12:
+        raise ValueError(f"Ungültiger Monat '{text}' (Format JJJJ-MM).")
+    return int(jahr), int(monat)
+
+def _monat_index(text, beginn):
+    jahr, monat = monat_parsen(text)
+    return (jahr - beginn[0]) * 12 + monat - beginn[1]
+
+def kosten_dynamik_holen(benutzerdaten, kosten_art, posten):
+    """Gibt Teuerung und Gültigkeit eines Kostenpunkts zurück (None, wenn nichts hinterlegt ist)."""
+    return benutzerdaten.get(KOSTEN_DYNAMIK, {}).get(kosten_art, {}).get(posten)
+
+def kosten_dynamik_setzen(benutzerdaten, kosten_art, posten, wachstum=0.0, ab=None, bis=None):
+    """Hinterlegt Teuerung pro Jahr und Gültigkeit (bis und mit) eines Kostenpunkts. Ohne Angaben wird der Eintrag entfernt."""
+    if ab and bis and monat_parsen(ab) > monat_parsen(bis):
+        raise ValueError("Der Beginn liegt nach dem Ende.")
+    eintrag = {"wachstum": wachstum}
+    for key, monat in (("ab", ab), ("bis", bis)):
+        if monat:
+            monat_parsen(monat)
+            eintrag[key] = monat.strip()
+
+    dynamik = benutzerdaten.get(KOSTEN_DYNAMIK, {})
+    eintraege = dynamik.setdefault(kosten_art, {})
+    if eintrag == {"wachstum": 0.0}:
+        eintraege.pop(posten, None)
+        if not eintraege:
+            del dynamik[kosten_art]
+    else:
+        eintraege[posten] = eintrag
+    if dynamik:
+        benutzerdaten[KOSTEN_DYNAMIK] = dynamik
+    else:
+        benutzerdaten.pop(KOSTEN_DYNAMIK, None)
+
+def kosten_matrix(benutzerdaten, monate, beginn=None):
+    """Baut die Kostenmatrix Posten × Monate und gibt ([(Kostenart, Posten)], Matrix) zurück.
+
+    Die Teuerung wird jeweils nach einem vollen Jahr angewendet, ausserhalb der Gültigkeit ist ein Posten 0.
+    beginn ist (Jahr, Monat) des ersten Monats, standardmässig der aktuelle Monat.
+    """
+    if beginn is None:
+        jetzt = time.localtime()
+        beginn = (jetzt.tm_year, jetzt.tm_mon)
+    dynamik = benutzerdaten.get(KOSTEN_DYNAMIK) or {}
+    posten_liste, betraege, wachstum, von, bis = [], [], [], [], []
+    for art in KOSTEN_ARTEN:
+        angaben_art = dynamik.get(art, {})
+        for posten, betrag in benutzerdaten.get(art, {}).items():
+            angaben = angaben_art.get(posten, {})
+            posten_liste.append((art, posten))
+            betraege.append(betrag)
+            wachstum.append(angaben.get("wachstum", 0.0))
+            von.append(max(0, _monat_index(angaben["ab"], beginn)) if angaben.get("ab") else 0)
+            bis.append(min(monate, _monat_index(angaben["bis"], beginn) + 1) if angaben.get("bis") else monate)
+
+    if np is not None:
+        # Faktoren pro Posten und Jahr, dann auf die Monate verteilt (spart die Potenz für jeden einzelnen Monat)
+        faktoren = (1 + np.asarray(wachstum, dtype=np.float64))[:, None] ** np.arange(-(-monate // 12))
+        matrix = np.repeat(faktoren, 12, axis=1)[:, :monate] * np.asarray(betraege, dtype=np.float64)[:, None]
+        monat = np.arange(monate)
+        matrix *= (monat >= np.asarray(von, dtype=np.int64)[:, None]) & (monat < np.asarray(bis, dtype=np.int64)[:, None])
+        return posten_liste, matrix
+
+    matrix = []
+    for betrag, rate, erster, letzter in zip(betraege, wachstum, von, bis):
+        zeile = array('d', bytes(8 * monate))
+        for monat in range(erster, letzter):
+            zeile[monat] = betrag * (1 + rate) ** (monat // 12)
+        matrix.append(zeile)
+    return posten_liste, matrix
+
+def kosten_projektion(benutzerdaten, monate, beginn=None):
+    """Rechnet Kosten, Ergebnis und Vermögen Monat für Monat aus der Kostenmatrix (kumulierte Summe in einem Durchgang)."""
+    _, matrix = kosten_matrix(benutzerdaten, monate, beginn)
+    netto_einkommen = benutzerdaten.get("Einkommen Netto", 0.0)
+    vermoegen = benutzerdaten.get("Aktuelles Gesamtvermögen", 0.0)
+    if np is not None:
+        kosten = matrix.sum(axis=0)
+        ergebnis = netto_einkommen - kosten
+        return Projektion(kosten, ergebnis, vermoegen + np.cumsum(ergebnis))
+
+    kosten = array('d', map(sum, zip(*matrix))) if matrix else array('d', bytes(8 * monate))
+    ergebnis = array('d', [netto_einkommen - betrag for betrag in kosten])
+    return Projektion(kosten, ergebnis, array('d', accumulate(ergebnis, initial=vermoegen))[1:])
+
+def projektion_holen(benutzerdaten, monate):
+    """Gibt die Projektion zurück, wenn für einen Kostenpunkt Teuerung oder Gültigkeit hinterlegt ist, sonst None."""
+    if not benutzerdaten.get(KOSTEN_DYNAMIK):
+        return None
+    return kosten_projektion(benutzerdaten, monate)
+
+def projektion_monat_finden(staende, grenze, unterschreiten=False):
+    """Gibt den ersten Monat zurück, in dem die Grenze erreicht (bzw. unterschritten) wird, sonst None."""
+    if np is not None and isinstance(staende, np.ndarray):
+        treffer = np.flatnonzero(staende < grenze if unterschreiten else staende >= grenze)
+        return int(treffer[0]) if treffer.size else None
+    if unterschreiten:
+        return next((monat for monat, stand in enumerate(staende) if stand < grenze), None)
+    return next((monat for monat, stand in enumerate(staende) if stand >= grenze), None)
+
+# --- SPARZIELE ---
+# Mehrere Sparziele werden im Feld "Sparziele" als Liste gespeichert:
+#   [{"name": "Auto", "betrag": 25000.0, "prioritaet": 1, "frist": "2028-06"}, ...]   ("frist" ist optional)
+# Die monatliche Sparquote geht zuerst an die Ziele mit der höchsten Priorität (1 = am wichtigsten), bei gleicher
+# Priorität an die mit der früheren Frist. Ziele mit gleicher Priorität und Frist teilen sich die Sparquote gleichmässig.
+
+SPARZIELE = "Sparziele"
+
+# Resultat pro Ziel: benötigte Monate (None = nicht innerhalb der Projektion erreichbar), Zielmonat und ob die Frist reicht
+Sparplan = namedtuple("Sparplan", ["name", "betrag", "prioritaet", "frist", "monate", "datum", "frist_eingehalten"])
+
+def monat_verschieben(beginn, monate):
+    """Gibt den Monat (JJJJ-MM) zurück, der eine Anzahl Monate nach beginn = (Jahr, Monat) liegt."""
+    jahr, monat = divmod(beginn[0] * 12 + beginn[1] - 1 + monate, 12)
+    return f"{jahr:04d}-{monat + 1:02d}"
+
+def sparziele_schwellen(sparziele):
+    """Berechnet pro Ziel den gesamthaft angesparten Betrag, bei dem es fertig ist (Zuteilung nach Priorität).
+
+    Die Ziele werden über einen Heap nach (Priorität, Frist) abgearbeitet. Innerhalb einer Gruppe wird gleichmässig
+    verteilt: das kleinste Ziel ist zuerst fertig, danach teilen sich die übrigen den ganzen Betrag.
+    """
+    heap = [((ziel.get("prioritaet", 1), ziel.get("frist") or "9999-12"), nummer) for nummer, ziel in enumerate(sparziele)]
+    heapify(heap)
+    schwellen = [0.0] * len(sparziele)
+    bisher = 0.0
+    while heap:
+        schluessel = heap[0][0]
+        gruppe = []
+        while heap and heap[0][0] == schluessel:
+            gruppe.append(heappop(heap)[1])
+        gruppe.sort(key=lambda nummer: sparziele[nummer]["betrag"])
+        pro_ziel = 0.0 # Betrag, den jedes noch offene Ziel der Gruppe bereits erhalten hat
+        for index, nummer in enumerate(gruppe):
+            betrag = sparziele[nummer]["betrag"]
+            bisher += (betrag - pro_ziel) * (len(gruppe) - index) # Ereignis: dieses Ziel wird fertig
+            pro_ziel = betrag
+            schwellen[nummer] = bisher
+    return schwellen
+
+def _monate_fuer_betrag(betrag, startkapital, sparrate, angespart, horizont):
+    """Monate, bis startkapital plus Sparquote den Betrag erreicht (None, wenn nicht innerhalb des Horizonts).
+
+    angespart ist das bis zu jedem Monatsende kumulierte Vermögen aus der Projektion (laufendes Maximum) oder None
+    bei gleichbleibender Sparquote.
+    """
+    if betrag <= startkapital:
+        return 0.0
+    if angespart is None:
+        if sparrate <= 0:
+            return None
+        monate = (betrag - startkapital) / sparrate
+        return monate if monate <= horizont else None
+    monat = bisect_left(angespart, betrag) # Binärsuche statt Monat für Monat
+    if monat >= len(angespart):
+        return None
+    davor = angespart[monat - 1] if monat else startkapital
+    return monat + (betrag - davor) / (angespart[monat] - davor)
+
+def sparziele_planen(sparziele, sparrate, startkapital=0.0, projektion=None, reserve=0.0, beginn=None, horizont=PROJEKTION_MONATE):
+    """Teilt die monatliche Sparquote auf mehrere Sparziele auf und gibt pro Ziel einen Sparplan zurück (gleiche Reihenfolge).
+
+    startkapital ist das freie Vermögen (Vermögen minus Reserve). Mit einer Projektion (kosten_projektion) wird
+    die Sparquote Monat für Monat aus der Projektion genommen, die Reserve wird dabei vom Vermögen abgezogen.
+    """
+    if beginn is None:
+        jetzt = time.localtime()
+        beginn = (jetzt.tm_year, jetzt.tm_mon)
+    angespart = None
+    if projektion is not None:
+        # Laufendes Maximum, damit die Binärsuche auch bei zeitweisem Verzehr den ersten passenden Monat findet
+        angespart = list(accumulate((float(stand) - reserve for stand in projektion.vermoegen[:horizont]), max))
+
+    plaene = []
+    for ziel, schwelle in zip(sparziele, sparziele_schwellen(sparziele)):
+        monate = _monate_fuer_betrag(schwelle, startkapital, sparrate, angespart, horizont)
+        datum = None if monate is None else monat_verschieben(beginn, max(0, math.ceil(monate) - 1))
+        frist = ziel.get("frist")
+        eingehalten = None if not frist else datum is not None and datum <= frist
+        plaene.append(Sparplan(ziel["name"], ziel["betrag"], ziel.get("prioritaet", 1), frist, monate, datum, eingehalten))
+    return plaene
+
+def konto_sparziele_planen(benutzerdaten, beginn=None):
+    """Plant die gespeicherten Sparziele eines Accounts mit dessen Sparquote und freiem Vermögen."""
+    reserve = benutzerdaten.get("Finanzielle Reserve", 0.0)
+    startkapital = benutzerdaten.get("Aktuelles Gesamtvermögen", 0.0) - reserve
+    projektion = projektion_holen(benutzerdaten, PROJEKTION_MONATE)
+    return sparziele_planen(benutzerdaten.get(SPARZIELE, []), benutzerdaten.get("Monatliches Ergebnis", 0.0), startkapital,
+                            projektion, reserve, beginn)
+
+def sparziel_hinzufuegen(benutzerdaten, name, betrag, prioritaet=1, frist=None):
+    """Fügt ein Sparziel hinzu (frist im Format JJJJ-MM, optional)."""
+    if betrag <= 0 or prioritaet < 1:
+        raise ValueError("Der Betrag muss positiv und die Priorität mindestens 1 sein.")
+    ziel = {"name": name, "betrag": betrag_runden(betrag), "prioritaet": int(prioritaet)}
+    if frist:
+        monat_parsen(frist)
+        ziel["frist"] = frist.strip()
+    benutzerdaten.setdefault(SPARZIELE, []).append(ziel)
+
+def sparziel_entfernen(benutzerdaten, name):
+    """Entfernt alle Sparziele mit diesem Namen und gibt zurück, ob eines gefunden wurde."""
+    sparziele = benutzerdaten.get(SPARZIELE, [])
+    uebrige = [ziel for ziel in sparziele if ziel["name"] != name]
+    if len(uebrige) == len(sparziele):
+        return False
+    if uebrige:
+        benutzerdaten[SPARZIELE] = uebrige
+    else:
+        del benutzerdaten[SPARZIELE]
+    return True
+
+# --- SENSITIVITÄTSANALYSE ---
+# Wertet ein ganzes Raster von Varianten auf einmal aus: Bruttoeinkommen × Alter × Änderung pro Kostenart.
+
+# achsen: [(Name, Werte)] in der Reihenfolge der Dimensionen. Die Resultate sind NumPy-Arrays mit einer Dimension
+# pro Achse (ohne NumPy flache array('d') in der Reihenfolge von itertools.product). Nicht definierte Werte sind NaN.
+Sensitivitaet = namedtuple("Sensitivitaet", ["achsen", "ergebnis", "sparziel_monate", "reichweite_monate"])
+
+def sensitivitaet_berechnen(benutzerdaten, einkommen_brutto, alter, kosten_aenderungen=None, ziel=None, kanton=STANDARD_KANTON, jahr=None):
+    """Berechnet Monatsergebnis, Sparziel-Dauer (C.1) und Reichweite (C.3) für alle Kombinationen des Rasters.
+
+    kosten_aenderungen ordnet einer Kostenart relative Änderungen zu, z.B. {"Fixkosten": [-0.1, 0.0, 0.1]}.
+    ziel ist der Betrag des Sparziels (ohne Ziel ist die Sparziel-Dauer überall NaN).
+    """
+    kosten_aenderungen = kosten_aenderungen or {}
+    unbekannt = set(kosten_aenderungen) - set(KOSTEN_ARTEN)
+    if unbekannt:
+        raise ValueError(f"Unbekannte Kostenart(en): {', '.join(sorted(unbekannt))}")
+    einkommen_brutto, alter = list(einkommen_brutto), list(alter)
+    aenderungen = [(art, list(werte)) for art, werte in kosten_aenderungen.items()]
+    achsen = [("Einkommen Brutto", einkommen_brutto), ("Alter", alter)] + [(f"{art} Änderung", werte) for art, werte in aenderungen]
+
+    # Das Nettoeinkommen hängt nur von Einkommen und Alter ab und wird pro Paar nur einmal berechnet (oder aus dem Cache geholt)
+    paare = list(product(einkommen_brutto, alter))
+    netto = netto_liste_gecacht([paar[0] for paar in paare], [paar[1] for paar in paare], kanton, jahr)
+    basis = {art: kostenliste_holen(benutzerdaten, art).summe for art in KOSTEN_ARTEN if art in benutzerdaten}
+    feste_kosten = sum(betrag for art, betrag in basis.items() if art not in kosten_aenderungen)
+    vermoegen = benutzerdaten.get("Aktuelles Gesamtvermögen", 0.0)
+    zu_sparen = None if ziel is None else ziel - (vermoegen - benutzerdaten.get("Finanzielle Reserve", 0.0))
+
+    if np is not None:
+        form = [len(werte) for _, werte in achsen]
+        kosten = np.float64(feste_kosten)
+        for dimension, (art, werte) in enumerate(aenderungen):
+            breite = [1] * len(aenderungen)
+            breite[dimension] = len(werte)
+            kosten = kosten + basis.get(art, 0.0) * (1 + np.asarray(werte, dtype=np.float64)).reshape(breite)
+        ergebnis = np.asarray(netto).reshape(form[:2] + [1] * len(aenderungen)) - kosten
+        ergebnis = np.broadcast_to(ergebnis, form).copy()
+        with np.errstate(divide='ignore', invalid='ignore'):
+            if zu_sparen is None:
+                sparziel = np.full(form, np.nan)
+            elif zu_sparen <= 0:
+                sparziel = np.zeros(form)
+            else:
+                sparziel = np.where(ergebnis > 0, zu_sparen / ergebnis, np.nan)
+            reichweite = np.where(ergebnis < 0, (vermoegen if vermoegen > 0 else 0.0) / -ergebnis, np.nan)
+        return Sensitivitaet(achsen, ergebnis, sparziel, reichweite)
+
+    kosten_varianten = [feste_kosten + sum(basis.get(art, 0.0) * (1 + delta) for (art, _), delta in zip(aenderungen, kombination))
+                        for kombination in product(*(werte for _, werte in aenderungen))]
+    ergebnis = array('d', [netto_einkommen - kosten for netto_einkommen in netto for kosten in kosten_varianten])
+    if zu_sparen is None:
+        sparziel = array('d', [math.nan]) * len(ergebnis)
+    else:
+        sparziel = array('d', [0.0 if zu_sparen <= 0 else zu_sparen / wert if wert > 0 else math.nan for wert in ergebnis])
+    reichweite = array('d', [(vermoegen if vermoegen > 0 else 0.0) / -wert if wert < 0 else math.nan for wert in ergebnis])
+    return Sensitivitaet(achsen, ergebnis, sparziel, reichweite)
+
+def sensitivitaet_tabelle(sensitivitaet):
+    """Gibt das Raster als Zeilen (Dictionaries) zurück, eine Zeile pro Kombination."""
+    namen = [name for name, _ in sensitivitaet.achsen]
+    werte = [sensitivitaet.ergebnis, sensitivitaet.sparziel_monate, sensitivitaet.reichweite_monate]
+    if np is not None and isinstance(sensitivitaet.ergebnis, np.ndarray):
+        werte = [reihe.ravel().tolist() for reihe in werte]
+    for kombination, ergebnis, sparziel, reichweite in zip(product(*(achse for _, achse in sensitivitaet.achsen)), *werte):
+        zeile = dict(zip(namen, kombination))
+        zeile.update({"Monatliches Ergebnis": round(ergebnis, 2), "Sparziel Monate": sparziel, "Reichweite Monate": reichweite})
+        yield zeile
+
+def cache_statistik():
+    """Treffer, Fehlschläge und Trefferquote aller Caches."""
+    statistik = {"netto": NETTO_CACHE.statistik()}
+    if isinstance(SPEICHER, DateiSpeicher):
+        statistik["konten"] = SPEICHER.cache.statistik()
+    return statistik
+
+def sensitivitaet_ausgeben(benutzerdaten, einkommen_brutto, alter, kosten_aenderungen, ziel=None, ausgabe_pfad=None):
+    """Berechnet das Raster, schreibt es als CSV (ausgabe_pfad) oder als Tabelle in die Konsole und zeigt die Trefferquote des Caches."""
+    sensitivitaet = sensitivitaet_berechnen(benutzerdaten, einkommen_brutto, alter, kosten_aenderungen, ziel)
+    zeilen = sensitivitaet_tabelle(sensitivitaet)
+    if ausgabe_pfad:
+        with open(ausgabe_pfad, 'w', newline='', encoding='utf-8') as ausgabe:
+            spalten = [name for name, _ in sensitivitaet.achsen] + ["Monatliches Ergebnis", "Sparziel Monate", "Reichweite Monate"]
+            schreiber = csv.DictWriter(ausgabe, fieldnames=spalten)
+            schreiber.writeheader()
+            schreiber.writerows({key: "" if isinstance(wert, float) and math.isnan(wert) else wert for key, wert in zeile.items()} for zeile in zeilen)
+        anzeigen(f"Sensitivitätsanalyse gespeichert in: {ausgabe_pfad}")
+    else:
+        for zeile in zeilen:
+            teile = [f"{name}: {wert:g}" for name, wert in zeile.items() if name not in ("Monatliches Ergebnis", "Sparziel Monate", "Reichweite Monate")]
+            sparziel, reichweite = zeile["Sparziel Monate"], zeile["Reichweite Monate"]
+            teile.append(f"Ergebnis: {format_waehrung(zeile['Monatliches Ergebnis'])}")
+            if not math.isnan(sparziel):
+                teile.append(f"Sparziel: {sparziel:.1f} Monate")
+            if not math.isnan(reichweite):
+                teile.append(f"Reichweite: {reichweite:.1f} Monate")
+            anzeigen(" | ".join(teile))
+    statistik = NETTO_CACHE.statistik()
+    anzeigen(f"Netto-Cache: {statistik['treffer']} Treffer, {statistik['fehlschlaege']} Fehlschläge ({statistik['trefferquote']*100:.1f}% Trefferquote)")
+    return sensitivitaet
+
+# --- KONTOAUSZUG-IMPORT ---
+# Bank- und Kreditkartenauszüge (CSV) werden blockweise gelesen: pro Block werden nur die benötigten Spalten
+# herausgezogen und die Ausgaben pro Buchungstext summiert. Die Zuordnung zu Kostenpunkten geschieht danach
+# einmal pro verschiedenem Buchungstext über einen Wort-Trie aus den Import-Regeln.
+# Regeln werden im Feld "Import Regeln" gespeichert: {"migros": ["Variable Kosten", "Lebensmittel"], ...}
+
+IMPORT_REGELN = "Import Regeln"
+# Nicht zugeordnete Ausgaben landen in diesem variablen Kostenpunkt
+IMPORT_REST_POSTEN = "Diverses (Import)"
+IMPORT_BLOCK_ZEILEN = 16384
+# Mögliche Spaltennamen (klein geschrieben). "belastung" wird statt "betrag" verwendet, falls vorhanden (Ausgaben positiv).
+IMPORT_SPALTEN = {
+    "datum": ("datum", "buchungsdatum", "valuta", "date"),
+    "text": ("buchungstext", "text", "beschreibung", "details", "description"),
+    "betrag": ("betrag", "betrag chf", "amount"),
+    "belastung": ("belastung", "belastung chf", "debit", "lastschrift"),
+}
+IMPORT_STANDARD_REGELN = {
+    "miete": ("Fixkosten", FIXKOSTEN[0]),
+    "hypothek": ("Fixkosten", FIXKOSTEN[0]),
+    "krankenkasse": ("Fixkosten", FIXKOSTEN[1]),
+    "versicherung": ("Fixkosten", FIXKOSTEN[1]),
+    "sbb": ("Fixkosten", FIXKOSTEN[2]),
+    "swisscom": ("Fixkosten", FIXKOSTEN[3]),
+    "sunrise": ("Fixkosten", FIXKOSTEN[3]),
+    "salt": ("Fixkosten", FIXKOSTEN[3]),
+    "migros": ("Variable Kosten", "Lebensmittel"),
+    "coop": ("Variable Kosten", "Lebensmittel"),
+    "denner": ("Variable Kosten", "Lebensmittel"),
+    "aldi": ("Variable Kosten", "Lebensmittel"),
+    "lidl": ("Variable Kosten", "Lebensmittel"),
+}
+WORT_MUSTER = re.compile(r"\w+")
+
+# Resultat des Einlesens: Anzahl Zeilen, Anzahl verschiedener Monate und Ausgaben pro Buchungstext in Rappen
+Kontoauszug = namedtuple("Kontoauszug", ["zeilen", "monate", "ausgaben"])
+
+class Stichwortindex:
+    """Wort-Trie über den Stichwörtern der Import-Regeln (auch mehrere Wörter wie "zürich versicherung")."""
+    __slots__ = ("_wurzel",)
+
+    def __init__(self, regeln):
+        self._wurzel = {}
+        for stichwort, ziel in regeln.items():
+            woerter = WORT_MUSTER.findall(stichwort.lower())
+            if not woerter:
+                continue
+            knoten = self._wurzel
+            for wort in woerter:
+                knoten = knoten.setdefault(wort, {})
+            knoten[None] = (len(woerter), tuple(ziel)) # Schlüssel None kann kein Wort sein
+
+    def zuordnen(self, text):
+        """Gibt (Kostenart, Posten) des längsten passenden Stichworts zurück, bei Gleichstand das erste im Text (sonst None)."""
+        woerter = WORT_MUSTER.findall(text.lower())
+        bester = None
+        for start in range(len(woerter)):
+            knoten = self._wurzel
+            for wort in woerter[start:]:
+                knoten = knoten.get(wort)
+                if knoten is None:
+                    break
+                treffer = knoten.get(None)
+                if treffer is not None and (bester is None or treffer[0] > bester[0]):
+                    bester = treffer
+        return None if bester is None else bester[1]
+
+def import_regeln_holen(benutzerdaten):
+    """Standardregeln ergänzt bzw. überschrieben durch die Regeln des Accounts."""
+    return {**IMPORT_STANDARD_REGELN, **benutzerdaten.get(IMPORT_REGELN, {})}
+
+def import_regel_setzen(benutzerdaten, stichwort, kosten_art, posten):
+    """Legt fest, welchem Kostenpunkt Buchungen mit diesem Stichwort zugeordnet werden."""
+    if kosten_art not in KOSTEN_ARTEN:
+        raise ValueError(f"Unbekannte Kostenart '{kosten_art}'.")
+    if not WORT_MUSTER.search(stichwort) or not posten:
+        raise ValueError("Stichwort und Posten dürfen nicht leer sein.")
+    benutzerdaten.setdefault(IMPORT_REGELN, {})[stichwort.strip().lower()] = [kosten_art, posten]
+
+def _betrag_bereinigen(text):
+    """Macht aus "1'234.50", "1.234,50" oder "" eine für float() lesbare Zahl."""
+    text = text.strip().replace("'", "").replace("’", "").replace(" ", "")
+    if "," in text:
+        text = text.replace(".", "").replace(",", ".")
+    return text or "0"
+
+def _betraege_lesen(texte):
+    """Wandelt die Betragsspalte eines Blocks in Zahlen um (schneller Weg ohne Bereinigung, solange es geht)."""
+    try:
+        return np.array(texte, dtype=float) if np is not None else list(map(float, texte))
+    except ValueError:
+        bereinigt = list(map(_betrag_bereinigen, texte))
+        return np.array(bereinigt, dtype=float) if np is not None else list(map(float, bereinigt))
+
+def _monat_schnitt(datum):
+    """Bestimmt anhand des ersten Datums, welcher Teil den Monat enthält (JJJJ-MM-TT oder TT.MM.JJJJ)."""
+    datum = datum.strip()
+    if len(datum) >= 7 and datum[4] == "-":
+        return slice(0, 7)
+    if len(datum) >= 10 and datum[2] == "." and datum[5] == ".":
+        return slice(3, 10)
+    raise ValueError(f"Unbekanntes Datumsformat '{datum}' (erwartet JJJJ-MM-TT oder TT.MM.JJJJ).")
+
+def kontoauszug_bloecke(datei, block_zeilen=IMPORT_BLOCK_ZEILEN):
+    """Liest einen geöffneten CSV-Auszug blockweise und liefert pro Block (Daten, Buchungstexte, Ausgaben).
+
+    Trennzeichen und Spalten werden aus der Kopfzeile erkannt. Ausgaben sind positiv, Gutschriften ergeben 0.
+    """
+    kopfzeile = datei.readline()
+    try:
+        trennzeichen = csv.Sniffer().sniff(kopfzeile, delimiters=";,\t").delimiter
+    except csv.Error:
+        trennzeichen = ";"
+    namen = [name.strip().lower() for name in next(csv.reader([kopfzeile], delimiter=trennzeichen), [])]
+    spalten = {}
+    for feld, kandidaten in IMPORT_SPALTEN.items():
+        for kandidat in kandidaten:
+            if kandidat in namen:
+                spalten[feld] = namen.index(kandidat)
+                break
+    betrag_feld = "belastung" if "belastung" in spalten else "betrag"
+    fehlend = [feld for feld in ("datum", "text", betrag_feld) if feld not in spalten]
+    if fehlend:
+        raise ValueError(f"Spalte(n) {', '.join(fehlend)} in der Kopfzeile nicht gefunden.")
+    auswahl = operator.itemgetter(spalten["datum"], spalten["text"], spalten[betrag_feld])
+    mindestlaenge = max(spalten["datum"], spalten["text"], spalten[betrag_feld]) + 1
+
+    leser = csv.reader(datei, delimiter=trennzeichen)
+    while True:
+        block = list(islice(leser, block_zeilen))
+        if not block:
+            return
+        try:
+            daten, texte, betraege = zip(*map(auswahl, block))
+        except (IndexError, ValueError):
+            # Leere oder kurze Zeilen (z.B. Summenzeilen am Ende) überspringen
+            block = [zeile for zeile in block if len(zeile) >= mindestlaenge]
+            if not block:
+                continue
+            daten, texte, betraege = zip(*map(auswahl, block))
+        betraege = _betraege_lesen(betraege)
+        if betrag_feld == "betrag":
+            # Vorzeichenbehaftete Spalte: Belastungen sind negativ
+            betraege = np.negative(np.minimum(betraege, 0.0)) if np is not None else [-betrag if betrag < 0 else 0.0 for betrag in betraege]
+        elif np is not None:
+            betraege = np.maximum(betraege, 0.0)
+        else:
+            betraege = [max(betrag, 0.0) for betrag in betraege]
+        yield daten, texte, betraege
+
+def kontoauszug_lesen(pfad, block_zeilen=IMPORT_BLOCK_ZEILEN):
+    """Summiert die Ausgaben eines CSV-Auszugs pro Buchungstext, ohne die ganze Datei in den Speicher zu laden."""
+    summen = {}
+    monate = set()
+    zeilen = 0
+    schnitt = None
+    # Die vielen kurzlebigen Zeilenlisten würden sonst laufend die Garbage Collection auslösen (Zyklen entstehen keine).
+    gc_aktiv = gc.isenabled()
+    gc.disable()
+    try:
+        with open(pfad, 'r', encoding='utf-8-sig', newline='') as datei:
+            for daten, texte, betraege in kontoauszug_bloecke(datei, block_zeilen):
+                if schnitt is None:
+                    erstes_datum = next(filter(None, daten), None)
+                    schnitt = None if erstes_datum is None else _monat_schnitt(erstes_datum)
+                if schnitt is not None:
+                    monate.update(map(operator.itemgetter(schnitt), daten))
+                zeilen += len(texte)
+                if np is not None:
+                    # Jeder Text erhält als Kennung die Zeile seines ersten Auftretens im Block, summiert wird pro Kennung in NumPy
+                    erste_zeile = {}
+                    kennungen = np.fromiter(map(erste_zeile.setdefault, texte, count()), dtype=np.intp, count=len(texte))
+                    block_summen = np.bincount(kennungen, weights=betraege)
+                    zeilen_mit_ausgaben = np.flatnonzero(block_summen)
+                    for zeile, summe in zip(zeilen_mit_ausgaben.tolist(), block_summen[zeilen_mit_ausgaben].tolist()):
+                        text = texte[zeile]
+                        summen[text] = summen.get(text, 0.0) + summe
+                else:
+                    for text, betrag in zip(texte, betraege):
+                        summen[text] = summen.get(text, 0.0) + betrag
+    finally:
+        if gc_aktiv:
+            gc.enable()
+    monate.discard("") # Zeilen ohne Datum
+    ausgaben = {text: betrag_zu_rappen(summe) for text, summe in summen.items() if summe > 0}
+    return Kontoauszug(zeilen, len(monate), ausgaben)
+
+def kontoauszug_zuordnen(auszug, regeln):
+    """Ordnet die Ausgaben den Kostenpunkten zu und gibt die Monatsdurchschnitte in Rappen zurück: ({(Art, Posten): Rappen}, {Text: Rappen})."""
+    index = Stichwortindex(regeln)
+    summen = {}
+    nicht_zugeordnet = {}
+    for text, rappen in auszug.ausgaben.items():
+        ziel = index.zuordnen(text)
+        if ziel is None:
+            nicht_zugeordnet[text] = rappen
+        else:
+            summen[ziel] = summen.get(ziel, 0) + rappen
+    monate = max(auszug.monate, 1)
+    durchschnitt = lambda werte: {key: round(rappen / monate) for key, rappen in werte.items()}
+    return durchschnitt(summen), durchschnitt(nicht_zugeordnet)
+
+def kontoauszug_uebernehmen(benutzerdaten, auszug):
+    """Setzt die Monatsdurchschnitte des Auszugs als Kostenpunkte im Account (überschreibt gleichnamige Posten)."""
+    kategorien, nicht_zugeordnet = kontoauszug_zuordnen(auszug, import_regeln_holen(benutzerdaten))
+    for (kosten_art, posten), rappen in kategorien.items():
+        kostenliste_holen(benutzerdaten, kosten_art)[posten] = rappen_zu_betrag(rappen)
+    variable_kosten = kostenliste_holen(benutzerdaten, "Variable Kosten")
+    rest = sum(nicht_zugeordnet.values())
+    if rest:
+        variable_kosten[IMPORT_REST_POSTEN] = rappen_zu_betrag(rest)
+    elif IMPORT_REST_POSTEN in variable_kosten:
+        del variable_kosten[IMPORT_REST_POSTEN]
+    finanzen_berechnen(benutzerdaten)
+    return kategorien, nicht_zugeordnet
+
+# --- ANPASSEN / SONDERSZENARIEN ---
+
+def sparziel_berechnen(ergebnis, aktuelles_vermoegen, reserve, ziel_kosten, projektion=None):
+    """Berechnet den noch zu sparenden Betrag und die dafür benötigten Monate (Szenario C.1).
+
+    Mit einer Projektion (kosten_projektion) werden Teuerung und Laufzeiten der Kostenpunkte berücksichtigt.
+    """
+    effektives_startkapital = betrag_zu_rappen(aktuelles_vermoegen) - betrag_zu_rappen(reserve)
+    zu_sparender_betrag = betrag_zu_rappen(ziel_kosten) - effektives_startkapital
+    ergebnis = betrag_zu_rappen(ergebnis)
+    
+    if zu_sparender_betrag <= 0:
+        return rappen_zu_betrag(zu_sparender_betrag), 0.0
+    if ergebnis <= 0:
+        return rappen_zu_betrag(zu_sparender_betrag), None # Ohne Sparquote ist das Ziel nicht erreichbar
+    if projektion is not None:
+        grenze = ziel_kosten + reserve
+        monat = projektion_monat_finden(projektion.vermoegen, grenze)
+        if monat is None:
+            return rappen_zu_betrag(zu_sparender_betrag), None # Nicht innerhalb der Projektion erreichbar
+        # Ganze Monate bis zum Vormonat plus der benötigte Anteil des letzten Monats
+        stand_davor = projektion.vermoegen[monat - 1] if monat else aktuelles_vermoegen
+        return rappen_zu_betrag(zu_sparender_betrag), monat + float((grenze - stand_davor) / projektion.ergebnis[monat])
+    return rappen_zu_betrag(zu_sparender_betrag), zu_sparender_betrag / ergebnis
+
+def vermoegen_prognose(ergebnis, aktuelles_vermoegen, jahre, projektion=None):
+    """Berechnet den angesparten Betrag und das Gesamtvermögen nach einer Anzahl Jahre (Szenario C.2)."""
+    if projektion is not None:
+        gesamtvermoegen = betrag_zu_rappen(float(projektion.vermoegen[jahre * 12 - 1]))
+        return rappen_zu_betrag(gesamtvermoegen - betrag_zu_rappen(aktuelles_vermoegen)), rappen_zu_betrag(gesamtvermoegen)
+    gespart_in_jahren = betrag_zu_rappen(ergebnis) * jahre * 12 # Exakt in Rappen, auch über lange Zeiträume
+    return rappen_zu_betrag(gespart_in_jahren), rappen_zu_betrag(betrag_zu_rappen(aktuelles_vermoegen) + gespart_in_jahren)
+
+def reichweite_berechnen(ergebnis, aktuelles_vermoegen, projektion=None):
+    """Berechnet, wie viele Monate das Vermögen bei einem Vermögensverzehr reicht (Szenario C.3)."""
+    if ergebnis >= 0:
+        return None # Kein Verzehr, das Vermögen wird nicht aufgebraucht
+    if aktuelles_vermoegen <= 0:
+        return 0
+    if projektion is not None:
+        monat = projektion_monat_finden(projektion.vermoegen, 0.0, unterschreiten=True)
+        if monat is None:
+            return None # Reicht über die ganze Projektion (z.B. weil befristete Kosten wegfallen)
+        stand_davor = projektion.vermoegen[monat - 1] if monat else aktuelles_vermoegen
+        return monat + float(stand_davor / abs(projektion.ergebnis[monat]))
+    return aktuelles_vermoegen / abs(ergebnis)
+
+def monate_aufteilen(anzahl_monate):
+    """Teilt eine Anzahl Monate in ganze Jahre und gerundete Restmonate auf."""
+    return int(anzahl_monate // 12), round(anzahl_monate % 12)
+
+def simulation_ausgeben(benutzerdaten, jahre):
+    """Fragt die Annahmen ab und zeigt die Bandbreite der simulierten Vermögensentwicklung (Szenario C.2)."""
+    annahmen = dict(SIMULATION_STANDARD)
+    anzeigen(f"Standardannahmen: {annahmen['rendite']*100:.1f}% Rendite, {annahmen['volatilitaet']*100:.1f}% Volatilität, "
+          f"{annahmen['inflation']*100:.1f}% Inflation, unerwartete Ausgaben von durchschnittlich {format_waehrung(annahmen['schock_betrag'])} "
+          f"mit {annahmen['schock_wahrscheinlichkeit']*100:.0f}% Wahrscheinlichkeit pro Jahr.")
+    if abfragen("Standardannahmen verwenden? (ja/nein): ").lower().strip() != 'ja':
+        annahmen["rendite"] = eingabe_pruefung("Erwartete Rendite pro Jahr in %: ", positiv_erforderlich=False, min_wert=-100) / 100
+        annahmen["volatilitaet"] = eingabe_pruefung("Volatilität der Rendite pro Jahr in %: ") / 100
+        annahmen["inflation"] = eingabe_pruefung("Inflation der Kosten pro Jahr in %: ", positiv_erforderlich=False, min_wert=-100) / 100
+        annahmen["schock_wahrscheinlichkeit"] = eingabe_pruefung("Wahrscheinlichkeit einer unerwarteten Ausgabe pro Jahr in %: ", max_wert=1200) / 100
+        annahmen["schock_betrag"] = eingabe_pruefung("Durchschnittliche Höhe einer unerwarteten Ausgabe in CHF: ", min_wert=1)
+    ziel = eingabe_pruefung("Zielvermögen in CHF (0 = ohne Ziel): ")
+
+    simulation = konto_simulieren(benutzerdaten, jahre, ziel=ziel or None, **annahmen)
+
+    perzentile = simulation.perzentile
+    schritt = max(1, jahre // 10)
+    anzeigen("-" * 50)
+    anzeigen(f"Simulation mit {simulation.pfade} Pfaden, Vermögen am Jahresende:")
+    anzeigen(f"{'Jahr':>4}  {'pessimistisch (P5)':>20}  {'mittel (P50)':>20}  {'optimistisch (P95)':>20}")
+    for jahr in sorted(set(range(schritt, jahre + 1, schritt)) | {jahre}):
+        anzeigen(f"{jahr:>4}  {format_waehrung(perzentile[5][jahr]):>20}  {format_waehrung(perzentile[50][jahr]):>20}  {format_waehrung(perzentile[95][jahr]):>20}")
+    if simulation.ziel_wahrscheinlichkeit is not None:
+        anzeigen(f"Wahrscheinlichkeit, {format_waehrung(ziel)} innerhalb von {jahre} Jahren zu erreichen: {simulation.ziel_wahrscheinlichkeit*100:.1f}%")
+    anzeigen("-" * 50)
+
+def sparplan_ausgeben(benutzerdaten):
+    """Zeigt für jedes gespeicherte Sparziel, wann es mit der aktuellen Sparquote erreicht wird."""
+    plaene = konto_sparziele_planen(benutzerdaten)
+    anzeigen("-" * 50)
+    if not plaene:
+        anzeigen("Es sind keine Sparziele erfasst.")
+    for plan in sorted(plaene, key=lambda plan: (plan.monate is None, plan.monate or 0)):
+        frist = f", Frist {plan.frist}" if plan.frist else ""
+        anzeigen(f"[Priorität {plan.prioritaet}] {plan.name} ({format_waehrung(plan.betrag)}{frist})")
+        if plan.monate is None:
+            anzeigen(f"    Nicht innerhalb von {PROJEKTION_MONATE // 12} Jahren erreichbar.")
+        else:
+            jahre, monate = monate_aufteilen(plan.monate)
+            hinweis = "" if plan.frist_eingehalten is not False else " -> Frist wird verpasst!"
+            anzeigen(f"    Erreicht im {plan.datum} (in ca. {jahre} Jahren und {monate} Monaten){hinweis}")
+    anzeigen("-" * 50)
+
+def sparziele_verwalten(benutzerdaten):
+    """Menü zum Erfassen, Löschen und Planen mehrerer Sparziele (Szenario C.1)."""
+    while True:
+        anzeigen("\n--- SPARZIELE ---")
+        for ziel in benutzerdaten.get(SPARZIELE, []):
+            frist = f", Frist {ziel['frist']}" if ziel.get("frist") else ""
+            anzeigen(f"- {ziel['name']}: {format_waehrung(ziel['betrag'])} (Priorität {ziel.get('prioritaet', 1)}{frist})")
+        anzeigen("A. Sparziel hinzufügen")
+        anzeigen("B. Sparziel löschen")
+        anzeigen("C. Sparplan anzeigen")
+        anzeigen("D. Zurück")
+        
+        wahl = abfragen("Ihre Wahl (A/B/C/D): ").upper().strip()
+        
+        if wahl == 'A':
+            name = abfragen("Name des Sparziels (z.B. 'Ferien'): ").strip()
+            if not name:
+                continue
+            betrag = eingabe_pruefung(f"Kosten für '{name}' in CHF: ", min_wert=0.01)
+            prioritaet = eingabe_pruefung("Priorität (1 = am wichtigsten): ", datentyp=int, min_wert=1)
+            while True:
+                frist = abfragen("Zu erreichen bis (JJJJ-MM, leer = ohne Frist): ").strip() or None
+                try:
+                    sparziel_hinzufuegen(benutzerdaten, name, betrag, prioritaet, frist)
+                    break
+                except ValueError as e:
+                    anzeigen(f"Fehler: {e}")
+            anzeigen(f"Sparziel '{name}' hinzugefügt.")
+        elif wahl == 'B':
+            name = abfragen("Name des Sparziels, das Sie löschen möchten: ").strip()
+            if sparziel_entfernen(benutzerdaten, name):
+                anzeigen(f"Sparziel '{name}' gelöscht.")
+            else:
+                anzeigen("Sparziel nicht gefunden.")
+        elif wahl == 'C':
+            sparplan_ausgeben(benutzerdaten)
+        elif wahl == 'D':
+            return
+        else:
+            anzeigen("Ungültige Wahl.")
+
+def zukunftsszenarien_berechnen(benutzerdaten):
+    """Berechnet die Szenarien C.1, C.2 und C.3."""
+    
+    # BUG FIX: Dictionary-Zugriff war fehlerhaft (benutzerdaten(...) statt benutzerdaten.get(...))
+    ergebnis = benutzerdaten.get("Monatliches Ergebnis", 0.0)
+    aktuelles_vermoegen = benutzerdaten.get("Aktuelles Gesamtvermögen", 0.0)
+    reserve = benutzerdaten.get("Finanzielle Reserve", 0.0)
+    
+    anzeigen("\n--- ZUKUNFTSSZENARIEN BERECHNEN ---")
+    
+    if ergebnis > 0:
+        # C.1/C.2: Sparquote vorhanden
+        anzeigen(f"Ihr Überschuss (Sparquote): {format_waehrung(ergebnis)}")
+        
+        wahl = abfragen("Haben Sie ein spezifisches Sparziel (z.B. Auto)? (ja/nein/mehrere): ").lower().strip()
+        
+        if wahl == 'mehrere':
+            # C.1 mit mehreren Sparzielen (werden mit dem Account gespeichert)
+            sparziele_verwalten(benutzerdaten)
+        
+        elif wahl == 'ja':
+            # C.1: Spezifisches Sparziel
+            ziel_name = abfragen("Name des Sparziels (z.B. 'Neues Auto'): ").strip()
+            ziel_kosten = eingabe_pruefung(f"Geschätzte Kosten für '{ziel_name}' in CHF: ")
+            
+            effektives_startkapital = aktuelles_vermoegen - reserve
+            projektion = projektion_holen(benutzerdaten, PROJEKTION_MONATE)
+            zu_sparender_betrag, monate_benoetigt = sparziel_berechnen(ergebnis, aktuelles_vermoegen, reserve, ziel_kosten, projektion)
+            
+            anzeigen("-" * 50)
+            if zu_sparender_betrag <= 0:
+                anzeigen(f"Gute Nachrichten: Sie können sich '{ziel_name}' (Kosten: {format_waehrung(ziel_kosten)}) sofort leisten,")
+                anzeigen(f"da Ihr freies Vermögen ({format_waehrung(effektives_startkapital)}) ausreicht.")
+                anzeigen(f"Restliches freies Vermögen danach: {format_waehrung(abs(zu_sparender_betrag))}")
+            elif monate_benoetigt is None:
+                anzeigen(f"Sparziel: '{ziel_name}' (Kosten: {format_waehrung(ziel_kosten)})")
+                anzeigen(f"Mit der hinterlegten Teuerung der Kosten ist das Sparziel innerhalb von {PROJEKTION_MONATE // 12} Jahren nicht erreichbar.")
+            else:
+                jahre, monate = monate_aufteilen(monate_benoetigt)
+                
+                anzeigen(f"Sparziel: '{ziel_name}' (Kosten: {format_waehrung(ziel_kosten)})")
+                anzeigen(f"Sie müssen noch {format_waehrung(zu_sparender_betrag)} ansparen.")
+                anzeigen(f"Benötigte Zeit, um das Sparziel zu erreichen: ca. {jahre} Jahre und {monate} Monate.")
+            if projektion is not None:
+                anzeigen("(Berücksichtigt die hinterlegte Teuerung und Laufzeit der Kostenpunkte.)")
+            anzeigen("-" * 50)
+            
+        else:
+            # C.2: Allgemeiner Vermögensaufbau
+            jahre_eingabe = eingabe_pruefung("Für wie viele Jahre soll der Vermögensaufbau berechnet werden?: ", datentyp=int, min_wert=1)
+            
+            projektion = projektion_holen(benutzerdaten, jahre_eingabe * 12)
+            gespart_in_jahren, gesamtvermoegen_prognose = vermoegen_prognose(ergebnis, aktuelles_vermoegen, jahre_eingabe, projektion)
+            
+            anzeigen("-" * 50)
+            anzeigen(f"Prognose (Vermögensaufbau in {jahre_eingabe} Jahren):")
+            anzeigen(f"Angesparter Betrag durch Sparquote: {format_waehrung(gespart_in_jahren)}")
+            anzeigen(f"Geschätztes Gesamtvermögen nach {jahre_eingabe} Jahren: {format_waehrung(gesamtvermoegen_prognose)}")
+            if projektion is not None:
+                anzeigen("(Berücksichtigt die hinterlegte Teuerung und Laufzeit der Kostenpunkte.)")
+            anzeigen("-" * 50)
+            
+            wahl = abfragen("Zusätzlich eine Simulation mit Rendite, Inflation und unerwarteten Ausgaben berechnen? (ja/nein): ").lower().strip()
+            if wahl == 'ja':
+                simulation_ausgeben(benutzerdaten, jahre_eingabe)
+            
+    elif ergebnis < 0:
+        # C.3: Vermögensverzehr besteht
+        verzehr_monatlich = abs(ergebnis)
+        vermoegen_fuer_verzehr = aktuelles_vermoegen
+        
+        projektion = projektion_holen(benutzerdaten, PROJEKTION_MONATE)
+        reichweite_monate = reichweite_berechnen(ergebnis, vermoegen_fuer_verzehr, projektion)
+        if reichweite_monate == 0:
+            anzeigen("Ihr Verzehr kann aktuell nicht abgedeckt werden.")
+
+        anzeigen(f"Ihr monatlicher Vermögensverzehr beträgt: {format_waehrung(verzehr_monatlich)}")
+        anzeigen("-" * 50)
+        anzeigen("Was passiert, wenn das Einkommen plötzlich wegfällt?")
+        if reichweite_monate is None:
+            anzeigen(f"Ihr bestehendes Vermögen ({format_waehrung(vermoegen_fuer_verzehr)}) reicht länger als {PROJEKTION_MONATE // 12} Jahre,")
+            anzeigen("da Kostenpunkte wegfallen oder günstiger werden.")
+        else:
+            jahre, monate = monate_aufteilen(reichweite_monate)
+            anzeigen(f"Ihr bestehendes Vermögen ({format_waehrung(vermoegen_fuer_verzehr)}) reicht, um Ihre Ausgabesituation")
+            anzeigen(f"noch für ca. {jahre} Jahre und {monate} Monate abzudecken.")
+        if projektion is not None:
+            anzeigen("(Berücksichtigt die hinterlegte Teuerung und Laufzeit der Kostenpunkte.)")
+        anzeigen("-" * 50)
+    
+    else:
+        anzeigen("Ihr Budget ist ausgeglichen. Keine Spar-/Verzehrs-Szenarien berechenbar.")
+
+def daten_anpassen(benutzerdaten, vorgegebene_fixkosten):
+    """Ermöglicht die Anpassung der finanziellen Daten."""
+    
+    if not benutzerdaten:
+        anzeigen("Keine Daten geladen. Bitte registrieren Sie sich zuerst oder laden Sie eine Datei.")
+        return benutzerdaten
+
+    return menue_ausfuehren(Sitzung(benutzerdaten, vorgegebene_fixkosten), ANPASSEN, HAUPTMENUE).benutzerdaten
+
+def anpassen_kopf(sitzung):
+    anzeigen("\n--- DATEN ANPASSEN ---")
+    anzeigen("1. Aktuelles Gesamtvermögen anpassen")
+    anzeigen("2. Finanzielle Reserve anpassen")
+    anzeigen("3. Monatliches Einkommen anpassen (Brutto/Netto neu eingeben)")
+    anzeigen("4. Fixkosten anpassen/ergänzen/löschen")
+    anzeigen("5. Variable Kosten anpassen/ergänzen/löschen")
+    anzeigen("6. Zurück zum Hauptmenü")
+    anzeigen("7. Kontoauszug (CSV) importieren")
+
+def ergebnis_aktualisieren(sitzung):
+    """Berechnet das Ergebnis nach einer Änderung neu (die Kostensummen sind bereits nachgeführt) und zeigt es an."""
+    sitzung.benutzerdaten = finanzen_berechnen(sitzung.benutzerdaten)
+    ausgabe_basis_ergebnis(sitzung.benutzerdaten)
+
+def vermoegen_anpassen(sitzung):
+    sitzung.benutzerdaten["Aktuelles Gesamtvermögen"] = betrag_runden(eingabe_pruefung("Neues Gesamtvermögen in CHF: "))
+    ergebnis_aktualisieren(sitzung)
+
+def reserve_anpassen(sitzung):
+    sitzung.benutzerdaten["Finanzielle Reserve"] = betrag_runden(eingabe_pruefung("Neue finanzielle Reserve in CHF: "))
+    ergebnis_aktualisieren(sitzung)
+
+def einkommen_anpassen(sitzung):
+    # BUG FIX: Der Aufruf musste das zweite Argument (vorgegebene_fixkosten) enthalten.
+    registrierung_finanzielle_daten(sitzung.benutzerdaten, sitzung.vorgegebene_fixkosten)
+    ergebnis_aktualisieren(sitzung)
+
+def kontoauszug_importieren(sitzung):
+    """Übernimmt die Monatsdurchschnitte eines Kontoauszugs und fragt nach Regeln für nicht zugeordnete Buchungen."""
+    pfad = abfragen("Pfad zur CSV-Datei des Kontoauszugs: ").strip()
+    try:
+        auszug = kontoauszug_lesen(pfad)
+    except (OSError, ValueError, csv.Error) as e:
+        anzeigen(f"Fehler beim Lesen des Kontoauszugs: {e}")
+        return
+    anzeigen(f"{auszug.zeilen} Buchungen aus {auszug.monate} Monaten gelesen.")
+
+    while True:
+        kategorien, nicht_zugeordnet = kontoauszug_uebernehmen(sitzung.benutzerdaten, auszug)
+        for (kosten_art, posten), rappen in sorted(kategorien.items()):
+            anzeigen(f"{kosten_art} / {posten}: {format_waehrung(rappen_zu_betrag(rappen))} pro Monat")
+        if not nicht_zugeordnet:
+            break
+        anzeigen(f"Nicht zugeordnet ({IMPORT_REST_POSTEN}), grösste Beträge pro Monat:")
+        for text, rappen in sorted(nicht_zugeordnet.items(), key=lambda eintrag: -eintrag[1])[:10]:
+            anzeigen(f"  {text}: {format_waehrung(rappen_zu_betrag(rappen))}")
+        stichwort = abfragen("Stichwort für eine neue Regel (leer = fertig): ").strip()
+        if not stichwort:
+            break
+        art = abfragen("Kostenart (F = Fixkosten, V = Variable Kosten): ").upper().strip()
+        posten = abfragen("Name des Postens: ").strip()
+        try:
+            import_regel_setzen(sitzung.benutzerdaten, stichwort, "Fixkosten" if art == "F" else "Variable Kosten", posten)
+        except ValueError as e:
+            anzeigen(f"Fehler: {e}")
+    ergebnis_aktualisieren(sitzung)
+
+def fixkosten_waehlen(sitzung):
+    sitzung.kosten_art = "Fixkosten"
+
+def variable_kosten_waehlen(sitzung):
+    sitzung.kosten_art = "Variable Kosten"
+
+def dynamik_beschreiben(angaben):
+    """Beschreibt Teuerung und Laufzeit eines Postens für die Anzeige (leer, wenn nichts hinterlegt ist)."""
+    if not angaben:
+        return ""
+    teile = []
+    if angaben.get("wachstum"):
+        teile.append(f"{angaben['wachstum']*100:+.1f}% pro Jahr")
+    if angaben.get("ab"):
+        teile.append(f"ab {angaben['ab']}")
+    if angaben.get("bis"):
+        teile.append(f"bis {angaben['bis']}")
+    return f" ({', '.join(teile)})"
+
+def bearbeite_kosten(benutzerdaten, kosten_art):
+    """Hilfsfunktion zum Bearbeiten von Fix- oder variablen Kosten."""
+    sitzung = Sitzung(benutzerdaten)
+    sitzung.kosten_art = kosten_art
+    menue_ausfuehren(sitzung, KOSTEN, ANPASSEN)
+
+def kosten_kopf(sitzung):
+    kosten_dict = kostenliste_holen(sitzung.benutzerdaten, sitzung.kosten_art) # Führt die Summe bei jeder Änderung mit
+    anzeigen(f"\n--- {sitzung.kosten_art} bearbeiten ---")
+    if not kosten_dict:
+        anzeigen("Aktuell sind keine Kostenpunkte erfasst.")
+    else:
+        anzeigen("Aktuelle Kostenpunkte:")
+        for idx, (posten, wert) in enumerate(kosten_dict.items()):
+            anzeigen(f"{idx+1}. {posten}: {format_waehrung(wert)}{dynamik_beschreiben(kosten_dynamik_holen(sitzung.benutzerdaten, sitzung.kosten_art, posten))}")
+    
+    anzeigen("\nOptionen:")
+    anzeigen("A. Neuen Posten hinzufügen")
+    anzeigen("B. Bestehenden Posten ändern")
+    anzeigen("C. Bestehenden Posten löschen")
+    anzeigen("D. Zurück zur Datenanpassung")
+    anzeigen("E. Teuerung und Laufzeit eines Postens festlegen")
+
+def posten_hinzufuegen(sitzung):
+    kosten_dict = kostenliste_holen(sitzung.benutzerdaten, sitzung.kosten_art)
+    posten_name = abfragen("Name des neuen Postens: ").strip()
+    if posten_name:
+        wert = eingabe_pruefung(f"Monatliche Kosten für {posten_name} in CHF: ")
+        kosten_dict[posten_name] = wert
+        anzeigen(f"Posten '{posten_name}' hinzugefügt.")
+
+def posten_aendern(sitzung):
+    kosten_dict = kostenliste_holen(sitzung.benutzerdaten, sitzung.kosten_art)
+    if not kosten_dict:
+        anzeigen("Keine Posten zum Ändern.")
+        return
+    posten_zu_aendern = abfragen("Name des Postens, den Sie ändern möchten: ").strip()
+    if posten_zu_aendern in kosten_dict:
+        neuer_wert = eingabe_pruefung(f"Neuer Wert für {posten_zu_aendern} in CHF: ")
+        kosten_dict[posten_zu_aendern] = neuer_wert
+        anzeigen(f"Posten '{posten_zu_aendern}' aktualisiert.")
+    else:
+        anzeigen("Posten nicht gefunden.")
+
+def posten_loeschen(sitzung):
+    kosten_dict = kostenliste_holen(sitzung.benutzerdaten, sitzung.kosten_art)
+    if not kosten_dict:
+        anzeigen("Keine Posten zum Löschen.")
+        return
+    posten_zu_loeschen = abfragen("Name des Postens, den Sie löschen möchten: ").strip()
+    if posten_zu_loeschen in kosten_dict:
+        del kosten_dict[posten_zu_loeschen]
+        kosten_dynamik_setzen(sitzung.benutzerdaten, sitzung.kosten_art, posten_zu_loeschen) # Teuerung/Laufzeit ebenfalls entfernen
+        anzeigen(f"Posten '{posten_zu_loeschen}' gelöscht.")
+    else:
+        anzeigen("Posten nicht gefunden.")
+
+def posten_dynamik_festlegen(sitzung):
+    kosten_dict = kostenliste_holen(sitzung.benutzerdaten, sitzung.kosten_art)
+    posten = abfragen("Name des Postens: ").strip()
+    if posten not in kosten_dict:
+        anzeigen("Posten nicht gefunden.")
+        return
+    wachstum = eingabe_pruefung("Teuerung pro Jahr in % (z.B. 1.5, 0 = keine): ", positiv_erforderlich=False, min_wert=-100) / 100
+    while True:
+        ab = abfragen("Gültig ab Monat (JJJJ-MM, leer = bereits gültig): ").strip() or None
+        bis = abfragen("Gültig bis und mit Monat (JJJJ-MM, leer = unbefristet): ").strip() or None
+        try:
+            kosten_dynamik_setzen(sitzung.benutzerdaten, sitzung.kosten_art, posten, wachstum, ab, bis)
+            break
+        except ValueError as e:
+            anzeigen(f"Fehler: {e}")
+    anzeigen(f"Posten '{posten}' aktualisiert.")
+
+# Vorstellung durch Rouven 
+
+# --- AUSGABE-FUNKTIONEN ---
+
+def ausgabe_basis_ergebnis(benutzerdaten):
+    """Zeigt das aktuelle monatliche Budgetergebnis an."""
+    ergebnis = benutzerdaten.get("Monatliches Ergebnis", 0.0)
+    netto = benutzerdaten.get("Einkommen Netto", 0.0)
+    kosten = benutzerdaten.get("Monatliche Gesamtkosten", 0.0)
+    ergebnis_art = benutzerdaten.get("Ergebnis Art")
+
+    anzeigen("\n"+"="*60)
+    anzeigen("AKTUELLES BUDGET-ERGEBNIS")
+    anzeigen("="*60)
+    anzeigen(f"Monatliches Nettoeinkommen: {format_waehrung(netto)}")
+    anzeigen(f"Monatliche Gesamtkosten: {format_waehrung(kosten)}")
+    anzeigen("-" * 60)
+    pause("""Drücken Sie die "Enter"-Taste, um fortzufahren""") #hilft zur Ansicht, dass nicht direkt das Haupt-Menü im Terminal geöffnet wird
+
+    if ergebnis > 0:
+        anzeigen(f"{ergebnis_art}: {format_waehrung(ergebnis)}")
+    elif ergebnis < 0:
+        anzeigen(f"{ergebnis_art}: {format_waehrung(abs(ergebnis))}")
+    else:
+        anzeigen(ergebnis_art)
+    anzeigen("="*60)
+
+def verlauf_ausgeben(benutzerdaten, anzahl_monate=24):
+    """Zeigt die gespeicherten Monatsstände mit Ø Ausgaben und Sparquote der letzten 12 Monate."""
+    monate, werte = verlauf_holen().konto_staende(verlauf_kennung(benutzerdaten))
+    anzeigen("\n--- VERLAUF (MONATLICHE STÄNDE) ---")
+    if not monate:
+        anzeigen("Noch keine Monatsstände vorhanden. Ein Stand wird bei jedem Speichern festgehalten.")
+        return
+    auswertung = verlauf_auswerten(monate, werte)
+    prozent = lambda wert, vorzeichen="": "-" if wert is None else f"{wert * 100:{vorzeichen}.1f}%"
+    anzeigen(f"{'Monat':<8} {'Vermögen':>18} {'Ø Ausgaben 12 Mt.':>18} {'Sparquote 12 Mt.':>17} {'ggü. Vorjahr':>13}")
+    for index in range(max(0, len(auswertung.monate) - anzahl_monate), len(auswertung.monate)):
+        ausgaben = auswertung.ausgaben_12m[index]
+        anzeigen(f"{auswertung.monate[index]:<8} {format_waehrung(auswertung.vermoegen[index]):>18} "
+                 f"{'-' if ausgaben is None else format_waehrung(ausgaben):>18} {prozent(auswertung.sparquote_12m[index]):>17} "
+                 f"{prozent(auswertung.sparquote_vorjahr[index], '+'):>13}")
+    anzeigen("(Monate ohne gespeicherten Stand übernehmen den vorherigen Stand.)")
+
+def haupt_menue(benutzerdaten, vorgegebene_fixkosten):
+    """Menü für registrierte/geladene Benutzer (gibt None zurück, sobald der Benutzer abgemeldet ist)."""
+    return menue_ausfuehren(Sitzung(benutzerdaten, vorgegebene_fixkosten), HAUPTMENUE, START).benutzerdaten
+
+def hauptmenue_kopf(sitzung):
+    anzeigen(f"\nWillkommen zurück, {sitzung.benutzerdaten.get('Vorname', 'User')}! (Hauptmenü)")
+    anzeigen("1. Aktuelles Budget-Ergebnis anzeigen")
+    anzeigen("2. Finanzielle Daten anpassen")
+    anzeigen("3. Zukunftsszenarien berechnen (Sparen/Verzehr)")
+    anzeigen("4. Änderungen speichern (Textdatei exportieren)")
+    anzeigen("5. Account löschen und abmelden")
+    anzeigen("6. Abmelden (Zurück zum Start)")
+    anzeigen("7. Verlauf anzeigen (monatliche Stände)")
+    anzeigen("8. Monatsbericht exportieren (Text/CSV/HTML)")
+
+def account_loeschen(sitzung):
+    if not daten_loeschen(sitzung.benutzerdaten):
+        return HAUPTMENUE
+    sitzung.benutzerdaten = None
+
+def abmelden(sitzung):
+    anzeigen("Abgemeldet. Zurück zum Startbildschirm.")
+    sitzung.benutzerdaten = None # Der alte Account wird nicht weiter festgehalten
+    willkommen_anzeigen()
+
+def daten_loeschen(benutzerdaten):
+    """Löscht die gespeicherte Textdatei und den aktuellen Account."""
+    if "Name" not in benutzerdaten or "Vorname" not in benutzerdaten:
+        anzeigen("Kein Account geladen, es gibt nichts zu löschen.")
+        return False
+        
+    dateiname = SPEICHER.kennung(benutzerdaten)
+    
+    bestaetigung = abfragen(f"Sind Sie sicher, dass Sie Ihren Account und die Datei '{dateiname}' löschen möchten? (ja/nein): ").lower().strip()
+    
+    if bestaetigung == 'ja':
+        try:
+            if SPEICHER.loeschen(benutzerdaten):
+                anzeigen(f"Account und Datei '{dateiname}' erfolgreich gelöscht.")
+                return True
+            else:
+                anzeigen(f"Warnung: Die Datei '{dateiname}' existiert nicht (mehr) auf dem System.")
+                return True
+        except Exception as e:
+            anzeigen(f"Fehler beim Löschen der Datei: {e}")
+            return False
+    else:
+        anzeigen("Löschvorgang abgebrochen.")
+        return False
+
+
+# --- PROFILING ---
+# Auf Wunsch (--profil ZIEL oder Umgebungsvariable BUDGET_PROFIL=ZIEL) werden die wichtigsten Einstiegspunkte gemessen:
+# Aufrufe, Laufzeiten als Histogramm (p50/p95/p99), gelesene und geschriebene Bytes sowie die Trefferquoten der Caches.
+# Beim Start werden die Funktionen im Modul durch gemessene Varianten ersetzt. Ohne Profil bleibt alles unverändert und
+# kostet nichts. Das Ziel bestimmt das Format: .json, .prom (Prometheus-Text), .pstats (cProfile) oder "-" (Tabelle).
+
+PROFIL_UMGEBUNG = "BUDGET_PROFIL"
+PROFIL_FUNKTIONEN = ["daten_laden", "finanzen_berechnen", "zukunftsszenarien_berechnen", "daten_speichern", "format_waehrung"]
+PROFIL_IO_FUNKTIONEN = {"daten_laden", "daten_speichern"} # Nur hier wird /proc/self/io gelesen (einige µs pro Aufruf)
+PSTATS_ENDUNGEN = (".pstats", ".prof")
+
+def _io_zaehler():
+    """Bisher vom Prozess gelesene und geschriebene Bytes (rchar/wchar aus /proc/self/io); None ausserhalb von Linux."""
+    try:
+        with open("/proc/self/io", 'rb') as datei:
+            inhalt = datei.read()
+    except OSError:
+        return None
+    werte = dict(zeile.split(b": ") for zeile in inhalt.splitlines())
+    return int(werte[b"rchar"]) - len(inhalt), int(werte[b"wchar"]) # Ohne das Lesen von /proc/self/io selbst
+
+def _histogramm_index(dauer_ns):
+    """Bucket einer Dauer: vier Buckets pro Zweierpotenz, die Obergrenze liegt also höchstens 25% über dem Messwert."""
+    stellen = dauer_ns.bit_length()
+    return dauer_ns if stellen <= 3 else (stellen - 2) * 4 + ((dauer_ns >> (stellen - 3)) & 3)
+
+def _histogramm_grenze(index):
+    """Obergrenze (exklusiv) eines Buckets in ns."""
+    index += 1
+    return index if index < 8 else (4 + index % 4) << (index // 4 - 1)
+
+class Messreihe:
+    """Aufrufe, Laufzeit-Histogramm und I/O einer gemessenen Funktion."""
+    __slots__ = ("aufrufe", "summe_ns", "max_ns", "buckets", "gelesen", "geschrieben")
+
+    def __init__(self):
+        self.aufrufe = 0
+        self.summe_ns = 0
+        self.max_ns = 0
+        self.buckets = {} # Bucket-Index -> Anzahl Aufrufe
+        self.gelesen = None # Bytes, None solange nicht gemessen
+        self.geschrieben = None
+
+    def erfassen(self, dauer_ns):
+        self.aufrufe += 1
+        self.summe_ns += dauer_ns
+        if dauer_ns > self.max_ns:
+            self.max_ns = dauer_ns
+        index = _histogramm_index(dauer_ns)
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+
+    def io_erfassen(self, vorher, nachher):
+        if vorher is not None and nachher is not None:
+            self.gelesen = (self.gelesen or 0) + nachher[0] - vorher[0]
+            self.geschrieben = (self.geschrieben or 0) + nachher[1] - vorher[1]
+
+    def perzentil(self, anteil):
+        """Obergrenze des Buckets, in dem das Perzentil liegt (in Sekunden, höchstens die längste Dauer)."""
+        rang = math.ceil(anteil * self.aufrufe)
+        kumuliert = 0
+        for index in sorted(self.buckets):
+            kumuliert += self.buckets[index]
+            if kumuliert >= rang:
+                return min(_histogramm_grenze(index), self.max_ns) / 1e9
+        return self.max_ns / 1e9
+
+    def auswertung(self):
+        werte = {"aufrufe": self.aufrufe, "summe_s": self.summe_ns / 1e9, "p50_s": self.perzentil(0.50),
+                 "p95_s": self.perzentil(0.95), "p99_s": self.perzentil(0.99), "max_s": self.max_ns / 1e9}
+        if self.gelesen is not None:
+            werte.update({"gelesen_bytes": self.gelesen, "geschrieben_bytes": self.geschrieben})
+        return werte
+
+def _prometheus_histogramm(metrik, beschreibung, label, messreihen):
+    """Die Laufzeit-Histogramme mehrerer Messreihen als Zeilen im Textformat von Prometheus."""
+    zeilen = [f"# HELP {metrik} {beschreibung}", f"# TYPE {metrik} histogram"]
+    for name, reihe in messreihen.items():
+        kumuliert = 0
+        for index in sorted(reihe.buckets):
+            kumuliert += reihe.buckets[index]
+            zeilen.append(f'{metrik}_bucket{{{label}="{name}",le="{_histogramm_grenze(index) / 1e9:.9g}"}} {kumuliert}')
+        zeilen.append(f'{metrik}_bucket{{{label}="{name}",le="+Inf"}} {reihe.aufrufe}')
+        zeilen.append(f'{metrik}_sum{{{label}="{name}"}} {reihe.summe_ns / 1e9:.9g}')
+        zeilen.append(f'{metrik}_count{{{label}="{name}"}} {reihe.aufrufe}')
+    return zeilen
+
+class Profil:
+    """Eine laufende Messung: ersetzt die Funktionen im Modul und stellt sie bei beenden() wieder her."""
+
+    def __init__(self, funktionen=PROFIL_FUNKTIONEN, mit_cprofile=False):
+        modul = globals()
+        self.messreihen = {name: Messreihe() for name in funktionen}
+        self._originale = {name: modul[name] for name in funktionen}
+        for name, funktion in self._originale.items():
+            modul[name] = self._umhuellen(funktion, self.messreihen[name], name in PROFIL_IO_FUNKTIONEN)
+        self.cprofile = cProfile.Profile() if mit_cprofile else None
+        if self.cprofile is not None:
+            self.cprofile.enable()
+
+    @staticmethod
+    def _umhuellen(funktion, messreihe, mit_io):
+        uhr = time.perf_counter_ns
+        if not mit_io:
+            @functools.wraps(funktion)
+            def gemessen(*args, **kwargs):
+                start = uhr()
+                try:
+                    return funktion(*args, **kwargs)
+                finally:
+                    messreihe.erfassen(uhr() - start)
+            return gemessen
+
+        @functools.wraps(funktion)
+        def gemessen_mit_io(*args, **kwargs):
+            vorher = _io_zaehler()
+            start = uhr()
+            try:
+                return funktion(*args, **kwargs)
+            finally:
+                messreihe.erfassen(uhr() - start)
+                messreihe.io_erfassen(vorher, _io_zaehler())
+        return gemessen_mit_io
+
+    def beenden(self):
+        if self.cprofile is not None:
+            self.cprofile.disable()
+        globals().update(self._originale)
+
+    def messwerte(self):
+        return {"funktionen": {name: reihe.auswertung() for name, reihe in self.messreihen.items()}, "caches": cache_statistik()}
+
+    def prometheus(self):
+        """Die Messwerte im Textformat von Prometheus."""
+        zeilen = _prometheus_histogramm("budget_funktion_dauer_sekunden", "Laufzeit pro Aufruf", "funktion", self.messreihen)
+        zeilen += ["# HELP budget_funktion_io_bytes_total Gelesene und geschriebene Bytes", "# TYPE budget_funktion_io_bytes_total counter"]
+        for name, reihe in self.messreihen.items():
+            if reihe.gelesen is not None:
+                zeilen.append(f'budget_funktion_io_bytes_total{{funktion="{name}",richtung="gelesen"}} {reihe.gelesen}')
+                zeilen.append(f'budget_funktion_io_bytes_total{{funktion="{name}",richtung="geschrieben"}} {reihe.geschrieben}')
+        caches = cache_statistik()
+        zeilen += ["# HELP budget_cache_zugriffe_total Zugriffe auf die Caches", "# TYPE budget_cache_zugriffe_total counter"]
+        for cache, statistik in caches.items():
+            zeilen.append(f'budget_cache_zugriffe_total{{cache="{cache}",ergebnis="treffer"}} {statistik["treffer"]}')
+            zeilen.append(f'budget_cache_zugriffe_total{{cache="{cache}",ergebnis="fehlschlag"}} {statistik["fehlschlaege"]}')
+        zeilen += ["# HELP budget_cache_trefferquote Anteil der Zugriffe aus dem Cache", "# TYPE budget_cache_trefferquote gauge"]
+        zeilen += [f'budget_cache_trefferquote{{cache="{cache}"}} {statistik["trefferquote"]:.6g}' for cache, statistik in caches.items()]
+        return "\n".join(zeilen) + "\n"
+
+    def tabelle(self):
+        """Die Messwerte als Tabelle für die Konsole."""
+        zeilen = [f"{'Funktion':<28} {'Aufrufe':>9} {'Summe':>10} {'p50':>10} {'p95':>10} {'p99':>10} {'gelesen':>10} {'geschrieben':>12}"]
+        for name, werte in self.messwerte()["funktionen"].items():
+            io_spalten = f"{werte.get('gelesen_bytes', '-'):>10} {werte.get('geschrieben_bytes', '-'):>12}"
+            zeilen.append(f"{name:<28} {werte['aufrufe']:>9} {werte['summe_s'] * 1e3:>8.2f}ms {werte['p50_s'] * 1e3:>8.3f}ms "
+                          f"{werte['p95_s'] * 1e3:>8.3f}ms {werte['p99_s'] * 1e3:>8.3f}ms {io_spalten}")
+        for cache, statistik in cache_statistik().items():
+            zeilen.append(f"Cache {cache}: {statistik['treffer']} Treffer, {statistik['fehlschlaege']} Fehlschläge ({statistik['trefferquote']:.1%})")
+        return "\n".join(zeilen)
+
+    def exportieren(self, ziel):
+        """Schreibt die Messwerte ins Ziel; das Format ergibt sich aus der Endung ('-' = Tabelle auf stderr)."""
+        if ziel == "-":
+            _ausgabe_leeren() # Erst die Programmausgabe, dann die Tabelle
+            print(self.tabelle(), file=sys.stderr)
+        elif ziel.endswith(PSTATS_ENDUNGEN):
+            if self.cprofile is None:
+                raise ValueError("Für eine .pstats-Datei muss die Messung mit cProfile gestartet werden.")
+            self.cprofile.dump_stats(ziel)
+        elif ziel.endswith(".prom"):
+            with open(ziel, 'w', encoding='utf-8') as datei:
+                datei.write(self.prometheus())
+        else:
+            with open(ziel, 'w', encoding='utf-8') as datei:
+                json.dump(self.messwerte(), datei, ensure_ascii=False, indent=1)
+
+PROFIL = None # Laufende Messung (None = keine Messung, die Funktionen sind unverändert)
+
+def profil_starten(ziel=None, funktionen=PROFIL_FUNKTIONEN):
+    """Startet die Messung. Mit einem Ziel werden die Messwerte beim Programmende dorthin exportiert."""
+    global PROFIL
+    profil_beenden()
+    PROFIL = Profil(funktionen, mit_cprofile=bool(ziel) and ziel.endswith(PSTATS_ENDUNGEN))
+    if ziel:
+        atexit.register(_profil_exportieren, PROFIL, ziel)
+    return PROFIL
+
+def profil_beenden():
+    """Beendet die laufende Messung und stellt die ursprünglichen Funktionen wieder her."""
+    global PROFIL
+    if PROFIL is not None:
+        PROFIL.beenden()
+        PROFIL = None
+
+def _profil_exportieren(profil, ziel):
+    try:
+        profil.exportieren(ziel)
+    except (OSError, ValueError) as e:
+        print(f"Warnung: Profil konnte nicht nach '{ziel}' geschrieben werden ({e})", file=sys.stderr)
+
+# --- MONATSBERICHTE ---
+# Ein Monatsbericht fasst Einkommen, alle Kostenpunkte, das Ergebnis und das Vermögen eines Accounts zusammen.
+# Jeder Bericht wird vollständig in einem String aufgebaut (statt Zeile für Zeile auszugeben), alle Beträge
+# eines Berichts werden mit einem Aufruf formatiert. Formate: Text, CSV und eigenständiges HTML (ohne externe Dateien).
+
+BERICHT_BREITE = 60
+BERICHT_BLOCK = 4096 # Höchstens so viele Berichte sind im Batch gleichzeitig unterwegs, das begrenzt den Speicher
+BERICHT_CSV_SPALTEN = ["Konto", "Monat", "Abschnitt", "Posten", "Betrag CHF"]
+BERICHT_ENDUNGEN = {"text": ".txt", "csv": ".csv", "html": ".html"}
+BERICHT_VERZEICHNIS = "berichte" # Berichte nie zwischen die Account-Dateien schreiben: ein Bericht.txt sähe wie ein Account aus
+BERICHT_HTML_STIL = ("body{font-family:sans-serif;margin:2em;color:#222}section{margin-bottom:2em;page-break-inside:avoid}"
+                     "table{border-collapse:collapse;min-width:30em}th,td{padding:.2em .6em;text-align:left}"
+                     "td.betrag{text-align:right;white-space:nowrap}tr.abschnitt th{border-bottom:1px solid #999;padding-top:.8em}"
+                     "tr.total td{font-weight:bold}")
+
+# Ein Ausgabeformat: kopf(monat) und bericht(benutzerdaten, monat) geben Strings zurück, 'ende' schliesst die Datei ab
+Berichtformat = namedtuple("Berichtformat", ["kopf", "bericht", "ende"])
+_BERICHT_TEXT_ZEILE = f"  {{:<{BERICHT_BREITE - 22}.{BERICHT_BREITE - 22}}}{{:>20}}".format
+_BERICHT_TEXT_LINIE = "  " + "-" * (BERICHT_BREITE - 2)
+
+def bericht_abschnitte(benutzerdaten):
+    """Stellt die Abschnitte des Monatsberichts zusammen (das Ergebnis muss bereits berechnet sein).
+
+    Gibt eine Liste von (Abschnitt, [Posten], [Beträge in CHF], mit_total) zurück; bei mit_total ist die letzte Zeile die Summe.
+    """
+    abschnitte = [("Einkommen", ["Einkommen Netto"], [benutzerdaten.get("Einkommen Netto", 0.0)], False)]
+    for kosten_art in KOSTEN_ARTEN:
+        kosten = kostenliste_holen(benutzerdaten, kosten_art)
+        posten = kosten.als_dict()
+        abschnitte.append((kosten_art, [*posten, f"Total {kosten_art}"], [*posten.values(), kosten.summe], True))
+    abschnitte.append(("Ergebnis", ["Monatliche Gesamtkosten", benutzerdaten.get("Ergebnis Art", "Monatliches Ergebnis")],
+                       [benutzerdaten.get("Monatliche Gesamtkosten", 0.0), abs(benutzerdaten.get("Monatliches Ergebnis", 0.0))], True))
+    vermoegen = [key for key in ["Aktuelles Gesamtvermögen", "Finanzielle Reserve"] if isinstance(benutzerdaten.get(key), (int, float))]
+    if vermoegen:
+        abschnitte.append(("Vermögen", vermoegen, [benutzerdaten[key] for key in vermoegen], False))
+    return abschnitte
+
+def _bericht_betraege(abschnitte):
+    """Formatiert alle Beträge eines Berichts mit einem Aufruf und teilt sie wieder auf die Abschnitte auf."""
+    formatiert = iter(format_waehrung_liste([betrag for _, _, betraege, _ in abschnitte for betrag in betraege]))
+    return [list(islice(formatiert, len(betraege))) for _, _, betraege, _ in abschnitte]
+
+def _bericht_konto(benutzerdaten):
+    return f"{benutzerdaten.get('Vorname', '')} {benutzerdaten.get('Name', '')}".strip()
+
+def bericht_text(benutzerdaten, monat):
+    """Monatsbericht als Text mit festen Spaltenbreiten (wie die Bildschirmausgabe)."""
+    abschnitte = bericht_abschnitte(benutzerdaten)
+    teile = ["=" * BERICHT_BREITE, f"MONATSBERICHT {monat}: {_bericht_konto(benutzerdaten)}", "=" * BERICHT_BREITE]
+    for (abschnitt, posten, _, mit_total), formatiert in zip(abschnitte, _bericht_betraege(abschnitte)):
+        zeilen = list(map(_BERICHT_TEXT_ZEILE, posten, formatiert))
+        if mit_total:
+            zeilen.insert(-1, _BERICHT_TEXT_LINIE)
+        teile.append(f"{abschnitt}:")
+        teile.extend(zeilen)
+    teile.append("=" * BERICHT_BREITE)
+    teile.append("\n")
+    return "\n".join(teile)
+
+def bericht_csv(benutzerdaten, monat):
+    """Monatsbericht als CSV-Zeilen (eine Zeile pro Posten, Beträge als Zahl mit zwei Nachkommastellen)."""
+    puffer = io.StringIO()
+    konto = _bericht_konto(benutzerdaten)
+    csv.writer(puffer).writerows((konto, monat, abschnitt, name, f"{betrag:.2f}")
+                                 for abschnitt, posten, betraege, _ in bericht_abschnitte(benutzerdaten)
+                                 for name, betrag in zip(posten, betraege))
+    return puffer.getvalue()
+
+def _bericht_csv_kopf(monat):
+    puffer = io.StringIO()
+    csv.writer(puffer).writerow(BERICHT_CSV_SPALTEN)
+    return puffer.getvalue()
+
+def bericht_html(benutzerdaten, monat):
+    """Monatsbericht als HTML-Abschnitt mit einer Tabelle (alle Texte maskiert)."""
+    abschnitte = bericht_abschnitte(benutzerdaten)
+    teile = [f"<section><h2>Monatsbericht {html.escape(monat)}: {html.escape(_bericht_konto(benutzerdaten))}</h2><table>"]
+    for (abschnitt, posten, _, mit_total), formatiert in zip(abschnitte, _bericht_betraege(abschnitte)):
+        teile.append(f'<tr class="abschnitt"><th colspan="2">{html.escape(abschnitt)}</th></tr>')
+        klassen = [""] * len(posten)
+        if mit_total:
+            klassen[-1] = ' class="total"'
+        teile.extend(f'<tr{klasse}><td>{html.escape(name)}</td><td class="betrag">{betrag}</td></tr>'
+                     for klasse, name, betrag in zip(klassen, posten, formatiert))
+    teile.append("</table></section>\n")
+    return "\n".join(teile)
+
+def _bericht_html_kopf(monat):
+    return (f'<!DOCTYPE html>\n<html lang="de"><head><meta charset="utf-8"><title>Monatsberichte {html.escape(monat)}</title>'
+            f"<style>{BERICHT_HTML_STIL}</style></head><body>\n")
+
+BERICHT_FORMATE = {
+    "text": Berichtformat(lambda monat: "", bericht_text, ""),
+    "csv": Berichtformat(_bericht_csv_kopf, bericht_csv, ""),
+    "html": Berichtformat(_bericht_html_kopf, bericht_html, "</body></html>\n"),
+}
+
+def bericht_format_erkennen(pfad, standard="text"):
+    """Leitet das Berichtsformat aus der Dateiendung ab (.txt, .csv, .html/.htm)."""
+    endung = os.path.splitext(pfad)[1].lower()
+    for bericht_format, format_endung in BERICHT_ENDUNGEN.items():
+        if endung in (format_endung, format_endung[:4]): # .htm wie .html
+            return bericht_format
+    return standard
+
+def bericht_erstellen(benutzerdaten, bericht_format="text", monat=None):
+    """Baut ein vollständiges Dokument mit dem Monatsbericht eines Accounts auf (mit Kopf und Abschluss des Formats)."""
+    ausgabe = BERICHT_FORMATE[bericht_format]
+    monat = monat or monat_text(aktueller_monat())
+    return ausgabe.kopf(monat) + ausgabe.bericht(benutzerdaten, monat) + ausgabe.ende
+
+def bericht_exportieren(sitzung):
+    """Schreibt den Monatsbericht des angemeldeten Accounts als Text-, CSV- oder HTML-Datei."""
+    benutzerdaten = finanzen_berechnen(sitzung.benutzerdaten)
+    monat = monat_text(aktueller_monat())
+    vorschlag = f"Bericht_{benutzerdaten.get('Name', '')}_{benutzerdaten.get('Vorname', '')}_{monat}.html"
+    dateiname = abfragen(f"Dateiname für den Bericht im Ordner '{BERICHT_VERZEICHNIS}' (.txt, .csv oder .html, Enter = {vorschlag}): ").strip()
+    pfad = os.path.join(BERICHT_VERZEICHNIS, dateiname or vorschlag)
+    try:
+        os.makedirs(os.path.dirname(pfad), exist_ok=True)
+        with open(pfad, 'w', newline='', encoding='utf-8') as datei:
+            datei.write(bericht_erstellen(benutzerdaten, bericht_format_erkennen(pfad, "html"), monat))
+    except OSError as e:
+        anzeigen(f"Fehler beim Schreiben des Berichts: {e}")
+        return
+    anzeigen(f"Monatsbericht in '{pfad}' gespeichert.")
+
+def bericht_konto_rendern(auftrag):
+    """Lädt eine Datei im Worker-Prozess und gibt (Datei, Bericht, Fehlermeldung) zurück."""
+    dateiname, bericht_format, monat = auftrag
+    try:
+        benutzerdaten = konto_datei_laden(dateiname)
+        return dateiname, BERICHT_FORMATE[bericht_format].bericht(finanzen_berechnen(benutzerdaten), monat), None
+    except Exception as e:
+        return dateiname, None, str(e)
+
+def berichte_erstellen(quelle, ausgabe_pfad, bericht_format="text", monat=None, prozesse=None):
+    """Schreibt die Monatsberichte aller Accounts eines Verzeichnisses (oder einer Datei) der Reihe nach in eine Ausgabedatei."""
+    dateien = [quelle] if os.path.isfile(quelle) else batch_dateien_finden(quelle)
+    ausgabe_absolut = os.path.abspath(ausgabe_pfad)
+    dateien = [dateiname for dateiname in dateien if os.path.abspath(dateiname) != ausgabe_absolut] # Eigene Ausgabe nie als Account lesen
+    ausgabe_format = BERICHT_FORMATE[bericht_format]
+    monat = monat or monat_text(aktueller_monat())
+    prozesse = prozesse or os.cpu_count() or 1
+    paket_groesse = max(1, min(256, len(dateien) // (prozesse * 8)))
+
+    anzahl_ok = 0
+    anzahl_fehler = 0
+    startzeit = time.perf_counter()
+    os.makedirs(os.path.dirname(ausgabe_pfad) or os.curdir, exist_ok=True)
+    with open(ausgabe_pfad, 'w', newline='', encoding='utf-8', buffering=1 << 20) as ausgabe, multiprocessing.Pool(prozesse) as pool:
+        ausgabe.write(ausgabe_format.kopf(monat))
+        # Die Dateien werden blockweise verteilt: imap hält fertige Berichte nur bis zum Schreiben (in der Reihenfolge der Dateien).
+        for beginn in range(0, len(dateien), BERICHT_BLOCK):
+            auftraege = [(dateiname, bericht_format, monat) for dateiname in dateien[beginn:beginn + BERICHT_BLOCK]]
+            for dateiname, bericht, fehler in pool.imap(bericht_konto_rendern, auftraege, chunksize=paket_groesse):
+                if fehler is not None:
+                    anzahl_fehler += 1
+                    print(f"Warnung: Datei '{dateiname}' übersprungen ({fehler})", file=sys.stderr)
+                    continue
+                ausgabe.write(bericht)
+                anzahl_ok += 1
+        ausgabe.write(ausgabe_format.ende)
+
+    dauer = time.perf_counter() - startzeit
+    durchsatz = len(dateien) / dauer if dauer > 0 else 0.0
+    anzeigen(f"{anzahl_ok} Monatsberichte ({bericht_format}) in '{ausgabe_pfad}' geschrieben, {anzahl_fehler} Dateien übersprungen ({prozesse} Prozesse).")
+    anzeigen(f"Dauer: {dauer:.2f} s, Durchsatz: {durchsatz:.0f} Berichte/s")
+    return anzahl_ok, anzahl_fehler
+
+# --- BATCH-MODUS (OHNE BENUTZERINTERAKTION) ---
+
+# Spalten der Ergebnisdatei im Batch-Modus (eine Zeile pro Account)
+BATCH_SPALTEN = ["Datei", "Vorname", "Name", "Alter", "Einkommen Netto", "Monatliche Gesamtkosten", "Monatliches Ergebnis", "Ergebnis Art"]
+BATCH_SPALTEN_SZENARIEN = ["Vermögen Prognose", "Reichweite Monate"]
+
+def batch_konto_auswerten(auftrag):
+    """Wertet eine einzelne Datei im Worker-Prozess aus und gibt (Datei, Ergebniszeile, Fehlermeldung) zurück."""
+    dateiname, mit_szenarien, jahre = auftrag
+    try:
+        benutzerdaten = konto_datei_laden(dateiname)
+        for key in ["Einkommen Netto", "Monatliche Gesamtkosten"]:
+            if not ist_zahl(benutzerdaten.get(key)):
+                raise ValueError(f"Feld '{key}' fehlt oder ist keine Zahl")
+        benutzerdaten = finanzen_berechnen(benutzerdaten)
+    except Exception as e:
+        return dateiname, None, str(e)
+
+    zeile = {spalte: benutzerdaten.get(spalte, "") for spalte in BATCH_SPALTEN}
+    zeile["Datei"] = os.path.basename(dateiname)
+
+    if mit_szenarien:
+        ergebnis = benutzerdaten["Monatliches Ergebnis"]
+        vermoegen = benutzerdaten.get("Aktuelles Gesamtvermögen", 0.0)
+        if not ist_zahl(vermoegen):
+            vermoegen = 0.0
+        try:
+            projektion = projektion_holen({**benutzerdaten, "Aktuelles Gesamtvermögen": vermoegen}, max(jahre * 12, PROJEKTION_MONATE))
+        except (ValueError, TypeError, AttributeError) as e:
+            return dateiname, None, f"Kosten Dynamik ungültig: {e}"
+        zeile["Vermögen Prognose"] = vermoegen_prognose(ergebnis, vermoegen, jahre, projektion)[1]
+        reichweite = reichweite_berechnen(ergebnis, vermoegen, projektion)
+        zeile["Reichweite Monate"] = "" if reichweite is None else reichweite
+
+    return dateiname, zeile, None
+
+def batch_dateien_finden(verzeichnis):
+    """Sucht alle gespeicherten Account-Dateien (Text- und Binärformat) in einem Verzeichnis (ohne Unterordner)."""
+    endungen = (DATEI_ENDUNG, DATEI_ENDUNG_BINAER)
+    with os.scandir(verzeichnis) as eintraege:
+        return sorted(eintrag.path for eintrag in eintraege if eintrag.is_file() and eintrag.name.endswith(endungen))
+
+def batch_auswerten(verzeichnis, ausgabe_pfad, ausgabe_format="csv", mit_szenarien=False, jahre=10, prozesse=None):
+    """Wertet alle Accounts eines Verzeichnisses parallel aus und schreibt pro Account eine Zeile als CSV oder JSON-Lines."""
+    dateien = batch_dateien_finden(verzeichnis)
+    prozesse = prozesse or os.cpu_count() or 1
+    # Grössere Pakete pro Auftrag reduzieren den Kommunikationsaufwand zwischen den Prozessen.
+    paket_groesse = max(1, min(256, len(dateien) // (prozesse * 8)))
+    spalten = BATCH_SPALTEN + (BATCH_SPALTEN_SZENARIEN if mit_szenarien else [])
+    auftraege = ((dateiname, mit_szenarien, jahre) for dateiname in dateien)
+
+    anzahl_ok = 0
+    anzahl_fehler = 0
+    ergebnisse_rappen = array('q') # Monatsergebnisse aller Accounts für die exakte Gesamtsumme
+    startzeit = time.perf_counter()
+
+    with open(ausgabe_pfad, 'w', newline='', encoding='utf-8') as ausgabe:
+        if ausgabe_format == "csv":
+            schreiber = csv.DictWriter(ausgabe, fieldnames=spalten)
+            schreiber.writeheader()
+
+        with multiprocessing.Pool(prozesse) as pool:
+            # imap_unordered liefert die Resultate, sobald sie fertig sind, damit nichts im Speicher gesammelt wird.
+            for dateiname, zeile, fehler in pool.imap_unordered(batch_konto_auswerten, auftraege, chunksize=paket_groesse):
+                if fehler is not None:
+                    anzahl_fehler += 1
+                    print(f"Warnung: Datei '{dateiname}' übersprungen ({fehler})", file=sys.stderr)
+                    continue
+                if ausgabe_format == "csv":
+                    schreiber.writerow(zeile)
+                else:
+                    ausgabe.write(json.dumps(zeile, ensure_ascii=False) + "\n")
+                ergebnisse_rappen.append(betrag_zu_rappen(zeile["Monatliches Ergebnis"]))
+                anzahl_ok += 1
+
+    dauer = time.perf_counter() - startzeit
+    durchsatz = len(dateien) / dauer if dauer > 0 else 0.0
+    anzeigen(f"{anzahl_ok} Accounts ausgewertet, {anzahl_fehler} Dateien übersprungen ({prozesse} Prozesse).")
+    anzeigen(f"Summe der Monatsergebnisse: {format_waehrung(rappen_zu_betrag(rappen_summe(ergebnisse_rappen)))}")
+    anzeigen(f"Dauer: {dauer:.2f} s, Durchsatz: {durchsatz:.0f} Dateien/s")
+    return anzahl_ok, anzahl_fehler
+
+# --- HTTP/JSON-SCHNITTSTELLE ---
+# "--server [HOST:]PORT" startet einen HTTP/1.1-Server (nur Standardbibliothek, asyncio) für viele gleichzeitige lokale Clients.
+# Kleine Berechnungen laufen direkt in der Ereignisschleife. Projektionen mit Kosten Dynamik, Simulationen und grosse Listen
+# gehen an einen Prozess-Pool. Laden und Speichern laufen nacheinander in einem eigenen Thread, weil Caches, Index und
+# SQLite-Verbindung nicht für gleichzeitige Zugriffe gebaut sind; so blockiert die Datei-I/O die Ereignisschleife nicht.
+#
+#   GET    /status                      Lebenszeichen
+#   POST   /netto                       {"einkommen": 7000, "alter": 30, "kanton": ..., "jahr": ...} (auch Listen)
+#   POST   /finanzen                    Account -> Gesamtkosten, Monatliches Ergebnis, Ergebnis Art
+#   POST   /szenarien                   {"konto": {...}, "jahre": 10, "ziel": 30000} -> Prognose, Reichweite, Sparziel
+#   POST   /simulation                  {"konto": {...}, "jahre": 30, "pfade": ..., "ziel": ..., "seed": ...}
+#   GET    /konten/NAME/VORNAME         Gespeicherten Account laden
+#   PUT    /konten                      Account speichern (Name und Vorname aus dem Inhalt)
+#   DELETE /konten/NAME/VORNAME         Account löschen
+#   GET    /metriken[/prometheus]       Anfragen pro Route mit Latenz (p50/p95/p99), Statuscodes und Caches
+
+API_STANDARD_PORT = 8080
+API_MAX_INHALT = 16 * 1024 * 1024 # Grösster Inhalt einer Anfrage in Bytes
+API_POOL_MINDESTGROESSE = 10_000 # Ab so vielen Einkommen rechnet /netto im Prozess-Pool
+API_MAX_JAHRE = 100
+
+def _api_endliche_zahl(text):
+    """Zahlen im JSON einer Anfrage: Infinity, NaN und Überläufe wie 1e400 ergeben einen Fehler 400 statt später einen 500."""
+    wert = float(text)
+    if not math.isfinite(wert):
+        raise ValueError(f"Ungültige Zahl '{text}' (nicht endlich).")
+    return wert
+
+def _api_json(inhalt):
+    """Liest den Inhalt einer Anfrage als JSON-Objekt (leerer Inhalt = leeres Objekt)."""
+    if not inhalt:
+        return {}
+    daten = json.loads(inhalt, parse_float=_api_endliche_zahl, parse_constant=_api_endliche_zahl)
+    if not isinstance(daten, dict):
+        raise ValueError("Erwartet wird ein JSON-Objekt.")
+    return daten
+
+def _api_zahl(daten, key, standard=None, ganzzahl=False, minimum=None, maximum=None):
+    """Liest eine Zahl aus dem Inhalt einer Anfrage und prüft Typ und Bereich."""
+    wert = daten.get(key, standard)
+    typen = int if ganzzahl else (int, float)
+    if isinstance(wert, bool) or not isinstance(wert, typen) or not math.isfinite(wert) or (minimum is not None and wert < minimum) or (maximum is not None and wert > maximum):
+        raise ValueError(f"Feld '{key}' fehlt oder ist keine gültige Zahl.")
+    return wert
+
+def _api_konto(daten):
+    """Der Account aus dem Inhalt einer Anfrage (entweder direkt oder unter "konto")."""
+    benutzerdaten = daten.get("konto", daten)
+    if not isinstance(benutzerdaten, dict):
+        raise ValueError("Feld 'konto' muss ein JSON-Objekt sein.")
+    benutzerdaten = dict(benutzerdaten)
+    _api_zahl(benutzerdaten, "Einkommen Netto", minimum=-BETRAG_MAX, maximum=BETRAG_MAX)
+    for key in ["Aktuelles Gesamtvermögen", "Finanzielle Reserve"]:
+        if not ist_zahl(benutzerdaten.get(key)):
+            benutzerdaten[key] = 0.0
+    return finanzen_berechnen(benutzerdaten)
+
+def api_szenarien_berechnen(benutzerdaten, jahre, ziel=None):
+    """Szenarien C.1 bis C.3 eines Accounts ohne Rückfragen (läuft bei hinterlegter Kosten Dynamik im Prozess-Pool)."""
+    ergebnis = benutzerdaten["Monatliches Ergebnis"]
+    vermoegen = benutzerdaten["Aktuelles Gesamtvermögen"]
+    projektion = projektion_holen(benutzerdaten, max(jahre * 12, PROJEKTION_MONATE))
+    angespart, gesamtvermoegen = vermoegen_prognose(ergebnis, vermoegen, jahre, projektion)
+    antwort = {"Monatliches Ergebnis": ergebnis, "Ergebnis Art": benutzerdaten["Ergebnis Art"],
+               "prognose": {"jahre": jahre, "angespart": angespart, "gesamtvermoegen": gesamtvermoegen},
+               "reichweite_monate": reichweite_berechnen(ergebnis, vermoegen, projektion), "mit_projektion": projektion is not None}
+    if ziel is not None:
+        zu_sparen, monate = sparziel_berechnen(ergebnis, vermoegen, benutzerdaten["Finanzielle Reserve"], ziel, projektion)
+        antwort["sparziel"] = {"ziel": ziel, "zu_sparen": zu_sparen, "monate": monate}
+    return antwort
+
+def api_simulation_berechnen(benutzerdaten, jahre, optionen):
+    """Monte-Carlo-Simulation eines Accounts als JSON-taugliches Dictionary (läuft im Prozess-Pool)."""
+    simulation = konto_simulieren(benutzerdaten, jahre, **optionen)
+    return {"jahre": simulation.jahre, "pfade": simulation.pfade, "ziel_wahrscheinlichkeit": simulation.ziel_wahrscheinlichkeit,
+            "perzentile": {str(prozent): werte for prozent, werte in simulation.perzentile.items()}}
+
+def _api_konto_speichern(benutzerdaten):
+    """Speichert einen Account wie daten_speichern, aber ohne Meldungen (läuft im I/O-Thread)."""
+    dateiname = SPEICHER.speichern(benutzerdaten)
+    try:
+        verlauf_festhalten(benutzerdaten)
+    except OSError as e:
+        print(f"Warnung: Der Monatsstand konnte nicht im Verlauf festgehalten werden ({e})", file=sys.stderr)
+    return dateiname
+
+class ApiServer:
+    """Beantwortet die HTTP-Anfragen einer Verbindung nach der anderen (Keep-Alive) und misst die Latenz pro Route."""
+
+    def __init__(self, prozesse=None):
+        # Neue Worker dürfen nicht per fork aus diesem Prozess entstehen, solange der I/O-Thread läuft (ein dabei gehaltener
+        # Lock bliebe im Worker für immer gesperrt). "forkserver" startet sie aus einem eigenen Prozess ohne Threads.
+        methode = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else None
+        self.pool = ProcessPoolExecutor(prozesse or os.cpu_count() or 1, mp_context=multiprocessing.get_context(methode))
+        self.io = ThreadPoolExecutor(1, thread_name_prefix="budget-io")
+        self.routen = {
+            ("GET", "status"): self.status, ("POST", "netto"): self.netto, ("POST", "finanzen"): self.finanzen,
+            ("POST", "szenarien"): self.szenarien, ("POST", "simulation"): self.simulation,
+            ("GET", "konten"): self.konto_laden, ("PUT", "konten"): self.konto_speichern, ("DELETE", "konten"): self.konto_loeschen,
+            ("GET", "metriken"): self.metriken,
+        }
+        self.messreihen = {} # "METHODE /route" -> Messreihe
+        self.statuscodes = {}
+        self.verbindungen = 0
+
+    def schliessen(self):
+        self.pool.shutdown(cancel_futures=True)
+        self.io.shutdown()
+
+    async def verbindung(self, reader, writer):
+        """Liest Anfragen, bis der Client die Verbindung schliesst oder "Connection: close" verlangt."""
+        self.verbindungen += 1
+        uhr = time.perf_counter_ns
+        try:
+            while True:
+                try:
+                    kopf = await reader.readuntil(b"\r\n\r\n")
+                except asyncio.IncompleteReadError:
+                    break # Client hat die Verbindung geschlossen
+                except asyncio.LimitOverrunError:
+                    self._antworten(writer, 431, {"fehler": "Kopfzeilen zu gross."}, False)
+                    break
+                start = uhr()
+                zeilen = kopf.decode("latin-1").split("\r\n")
+                try:
+                    methode, ziel, version = zeilen[0].split(" ")
+                except ValueError:
+                    self._antworten(writer, 400, {"fehler": "Ungültige Anfragezeile."}, False)
+                    break
+                felder = {}
+                for zeile in zeilen[1:]:
+                    name, _, wert = zeile.partition(":")
+                    felder[name.strip().lower()] = wert.strip()
+                verbindung = felder.get("connection", "").lower()
+                offen = verbindung != "close" if version == "HTTP/1.1" else verbindung == "keep-alive"
+                laenge = felder.get("content-length", "0")
+                if "transfer-encoding" in felder or not laenge.isdigit() or int(laenge) > API_MAX_INHALT:
+                    self._antworten(writer, 413 if laenge.isdigit() else 411, {"fehler": "Inhalt fehlt, zu gross oder nicht mit Content-Length."}, False)
+                    break
+                inhalt = await reader.readexactly(int(laenge)) if laenge != "0" else b""
+
+                route, status, antwort = await self._bearbeiten(methode, ziel, inhalt)
+                self._antworten(writer, status, antwort, offen)
+                await writer.drain()
+                messreihe = self.messreihen.get(route)
+                if messreihe is None:
+                    messreihe = self.messreihen[route] = Messreihe()
+                messreihe.erfassen(uhr() - start)
+                if not offen:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.CancelledError):
+            pass # Client weg oder Server wird beendet
+        finally:
+            self.verbindungen -= 1
+            writer.close()
+
+    async def _bearbeiten(self, methode, ziel, inhalt):
+        """Führt die Route aus und gibt (Route, Statuscode, Antwort) zurück; Antworten sind Objekte (JSON) oder Text."""
+        teile = [unquote(teil) for teil in urlsplit(ziel).path.strip("/").split("/")]
+        route = f"{methode} /{teile[0]}"
+        aktion = self.routen.get((methode, teile[0]))
+        if aktion is None:
+            route = "unbekannt" # Begrenzt die Anzahl Messreihen bei beliebigen Pfaden
+            erlaubt = any(segment == teile[0] for _, segment in self.routen)
+            status, antwort = (405, {"fehler": "Methode nicht erlaubt."}) if erlaubt else (404, {"fehler": "Unbekannte Route."})
+        else:
+            try:
+                status, antwort = await aktion(teile[1:], _api_json(inhalt))
+            except (ValueError, TypeError, KeyError) as e:
+                status, antwort = 400, {"fehler": str(e)}
+            except Exception as e:
+                print(f"Warnung: Fehler bei {methode} {ziel} ({e!r})", file=sys.stderr)
+                status, antwort = 500, {"fehler": "Interner Fehler."}
+        self.statuscodes[status] = self.statuscodes.get(status, 0) + 1
+        return route, status, antwort
+
+    @staticmethod
+    def _antworten(writer, status, antwort, offen):
+        if isinstance(antwort, str):
+            inhalt, art = antwort.encode("utf-8"), "text/plain; version=0.0.4"
+        else:
+            inhalt, art = json.dumps(antwort, ensure_ascii=False).encode("utf-8"), "application/json"
+        schliessen = "" if offen else "Connection: close\r\n"
+        writer.write(f"HTTP/1.1 {status} {HTTPStatus(status).phrase}\r\nContent-Type: {art}; charset=utf-8\r\n"
+                     f"Content-Length: {len(inhalt)}\r\n{schliessen}\r\n".encode("latin-1") + inhalt)
+
+    async def _im_pool(self, funktion, *argumente):
+        return await asyncio.get_running_loop().run_in_executor(self.pool, funktion, *argumente)
+
+    async def _im_io_thread(self, funktion, *argumente):
+        return await asyncio.get_running_loop().run_in_executor(self.io, funktion, *argumente)
+
+    @staticmethod
+    def _name_vorname(teile):
+        if len(teile) != 2 or not all(teile) or any(sep in teil for teil in teile for sep in ("/", "\\", "\0")):
+            raise ValueError("Pfad /konten/NAME/VORNAME erwartet.")
+        return {"Name": teile[0], "Vorname": teile[1]}
+
+    async def status(self, teile, daten):
+        return 200, {"status": "ok", "speicher": type(SPEICHER).__name__, "verbindungen": self.verbindungen}
+
+    async def netto(self, teile, daten):
+        kanton = daten.get("kanton", STANDARD_KANTON)
+        jahr = daten.get("jahr")
+        if jahr is not None:
+            jahr = _api_zahl(daten, "jahr", ganzzahl=True)
+        einkommen, alter = daten.get("einkommen"), daten.get("alter")
+        if isinstance(einkommen, list):
+            if not isinstance(alter, list) or len(alter) != len(einkommen):
+                raise ValueError("'einkommen' und 'alter' müssen gleich lange Listen sein.")
+            if len(einkommen) >= API_POOL_MINDESTGROESSE:
+                return 200, {"netto": await self._im_pool(netto_liste_gecacht, einkommen, alter, kanton, jahr)}
+            return 200, {"netto": netto_liste_gecacht(einkommen, alter, kanton, jahr)}
+        netto, abzug = brutto_zu_netto(_api_zahl(daten, "einkommen", minimum=0), _api_zahl(daten, "alter", minimum=0), tarif_holen(kanton, jahr))
+        return 200, {"netto": netto, "abzug_prozent": abzug}
+
+    async def finanzen(self, teile, daten):
+        benutzerdaten = _api_konto(daten)
+        return 200, {key: benutzerdaten[key] for key in ["Monatliche Gesamtkosten", "Monatliches Ergebnis", "Ergebnis Art"]}
+
+    async def szenarien(self, teile, daten):
+        benutzerdaten = _api_konto(daten)
+        jahre = _api_zahl(daten, "jahre", 10, ganzzahl=True, minimum=1, maximum=API_MAX_JAHRE)
+        ziel = None if daten.get("ziel") is None else _api_zahl(daten, "ziel", minimum=0)
+        if benutzerdaten.get(KOSTEN_DYNAMIK):
+            # Die Kostenprojektion rechnet alle Posten über alle Monate und gehört nicht in die Ereignisschleife
+            return 200, await self._im_pool(api_szenarien_berechnen, _als_dict(benutzerdaten), jahre, ziel)
+        return 200, api_szenarien_berechnen(benutzerdaten, jahre, ziel)
+
+    async def simulation(self, teile, daten):
+        benutzerdaten = _api_konto(daten)
+        jahre = _api_zahl(daten, "jahre", 30, ganzzahl=True, minimum=1, maximum=API_MAX_JAHRE)
+        optionen = {key: daten[key] for key in SIMULATION_STANDARD if key in daten}
+        if daten.get("pfade") is not None:
+            optionen["pfade"] = _api_zahl(daten, "pfade", ganzzahl=True, minimum=1, maximum=SIMULATION_PFADE)
+        for key in ["ziel", "seed"]:
+            if daten.get(key) is not None:
+                optionen[key] = _api_zahl(daten, key, ganzzahl=key == "seed")
+        return 200, await self._im_pool(api_simulation_berechnen, _als_dict(benutzerdaten), jahre, optionen)
+
+    async def konto_laden(self, teile, daten):
+        kennung = SPEICHER.kennung(self._name_vorname(teile))
+        benutzerdaten = await self._im_io_thread(SPEICHER.laden, kennung)
+        if benutzerdaten is None:
+            return 404, {"fehler": f"Account '{kennung}' nicht gefunden."}
+        if "Einkommen Netto" in benutzerdaten and "Monatliche Gesamtkosten" in benutzerdaten:
+            benutzerdaten = finanzen_berechnen(benutzerdaten)
+        return 200, _als_dict(benutzerdaten)
+
+    async def konto_speichern(self, teile, daten):
+        benutzerdaten = _api_konto(daten)
+        self._name_vorname([str(benutzerdaten.get("Name", "")), str(benutzerdaten.get("Vorname", ""))])
+        dateiname = await self._im_io_thread(_api_konto_speichern, benutzerdaten)
+        return 200, {"kennung": SPEICHER.kennung(benutzerdaten), "geaendert": dateiname is not None}
+
+    async def konto_loeschen(self, teile, daten):
+        konto = self._name_vorname(teile)
+        if not await self._im_io_thread(SPEICHER.loeschen, konto):
+            return 404, {"fehler": f"Account '{SPEICHER.kennung(konto)}' nicht gefunden."}
+        return 200, {"geloescht": SPEICHER.kennung(konto)}
+
+    async def metriken(self, teile, daten):
+        if teile == ["prometheus"]:
+            zeilen = _prometheus_histogramm("budget_anfrage_dauer_sekunden", "Latenz pro Anfrage", "route", self.messreihen)
+            zeilen += ["# HELP budget_anfragen_total Anfragen pro Statuscode", "# TYPE budget_anfragen_total counter"]
+            zeilen += [f'budget_anfragen_total{{status="{status}"}} {anzahl}' for status, anzahl in sorted(self.statuscodes.items())]
+            return 200, "\n".join(zeilen) + "\n"
+        return 200, {"anfragen": {route: reihe.auswertung() for route, reihe in self.messreihen.items()},
+                     "statuscodes": {str(status): anzahl for status, anzahl in sorted(self.statuscodes.items())},
+                     "verbindungen": self.verbindungen, "caches": cache_statistik()}
+
+async def _api_server_ausfuehren(host, port, prozesse):
+    api = ApiServer(prozesse)
+    server = await asyncio.start_server(api.verbindung, host, port, backlog=1024)
+    aufgabe = asyncio.current_task()
+    try:
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, aufgabe.cancel) # Sauber beenden (Pool schliessen)
+    except (NotImplementedError, AttributeError):
+        pass # Windows: nur Ctrl+C
+    anzeigen(f"Server läuft auf http://{host}:{port}/ (Beenden mit Ctrl+C).")
+    _ausgabe_leeren()
+    try:
+        async with server:
+            await server.serve_forever()
+    except asyncio.CancelledError:
+        pass
+    finally:
+        api.schliessen()
+
+def api_server_starten(adresse, prozesse=None):
+    """Startet den HTTP/JSON-Server auf "PORT" oder "HOST:PORT" (Standard-Host: nur lokal erreichbar)."""
+    host, _, port = adresse.rpartition(":")
+    try:
+        asyncio.run(_api_server_ausfuehren(host or "127.0.0.1", int(port or API_STANDARD_PORT), prozesse))
+    except KeyboardInterrupt:
+        pass
+    anzeigen("Server beendet.")
+
+# --- PROGRAMM START (HAUPT-LOOP) ---
+
+class Sitzung:
+    """Zustand einer laufenden Programmsitzung: der geladene Account und die gerade bearbeitete Kostenart."""
+    __slots__ = ("benutzerdaten", "vorgegebene_fixkosten", "kosten_art")
+
+    def __init__(self, benutzerdaten=None, vorgegebene_fixkosten=FIXKOSTEN):
+        self.benutzerdaten = benutzerdaten
+        self.vorgegebene_fixkosten = vorgegebene_fixkosten
+        self.kosten_art = None
+
+def willkommen_anzeigen():
+    anzeigen("\n" + "="*60)
+    anzeigen("WILKOMMEN ZUM BUDGET-PLANER")
+    anzeigen("="*60)
+
+def start_kopf(sitzung):
+    # Startbildschirm (wenn keine Daten geladen)
+    anzeigen("\nHauptmenü:")
+    anzeigen("1. Neu registrieren und Daten erfassen")
+    anzeigen("2. Bestehende Textdatei hochladen/einloggen")
+    anzeigen("3. Programm beenden")
+
+def registrieren(sitzung):
+    # Szenario Registrierung
+    benutzerdaten = registrierung_persoenliche_daten({})
+    sitzung.benutzerdaten = registrierung_finanzielle_daten(benutzerdaten, sitzung.vorgegebene_fixkosten)
+    daten_speichern(sitzung.benutzerdaten)
+
+def einloggen(sitzung):
+    # Szenario Login (Dateiupload)
+    geladene_daten = daten_laden({})
+    if not geladene_daten:
+        return START
+    # finanzen_berechnen wird bereits in daten_laden aufgerufen, aber wir rufen es zur Sicherheit erneut auf.
+    sitzung.benutzerdaten = finanzen_berechnen(geladene_daten)
+    ausgabe_basis_ergebnis(sitzung.benutzerdaten)
+
+def beenden(sitzung):
+    anzeigen("Programm wird beendet. Auf Wiedersehen!")
+
+# Zustände des Menüs. Pro Zustand: Kopf (zeigt das Menü an), Frage, Übergänge und Meldung bei ungültiger Wahl.
+START, HAUPTMENUE, ANPASSEN, KOSTEN, ENDE = "Start", "Hauptmenü", "Daten anpassen", "Kosten bearbeiten", "Ende"
+Menue = namedtuple("Menue", ["kopf", "frage", "uebergaenge", "ungueltig"])
+
+# Übergang = (Aktion, Folgezustand). Gibt die Aktion einen Zustand zurück, ersetzt dieser den Folgezustand, None = im Menü bleiben.
+MENUES = {
+    START: Menue(start_kopf, "Ihre Wahl (1/2/3): ", {
+        "1": (registrieren, HAUPTMENUE),
+        "2": (einloggen, HAUPTMENUE),
+        "3": (beenden, ENDE),
+    }, "Ungültige Wahl. Bitte geben Sie 1, 2 oder 3 ein."),
+    HAUPTMENUE: Menue(hauptmenue_kopf, "Ihre Wahl (1-8): ", {
+        "1": (lambda sitzung: ausgabe_basis_ergebnis(sitzung.benutzerdaten), None),
+        "2": (None, ANPASSEN),
+        "3": (lambda sitzung: zukunftsszenarien_berechnen(sitzung.benutzerdaten), None),
+        "4": (lambda sitzung: daten_speichern(sitzung.benutzerdaten), None),
+        "5": (account_loeschen, START),
+        "6": (abmelden, START),
+        "7": (lambda sitzung: verlauf_ausgeben(sitzung.benutzerdaten), None),
+        "8": (bericht_exportieren, None),
+    }, "Ungültige Wahl."),
+    ANPASSEN: Menue(anpassen_kopf, "Ihre Wahl (1-7): ", {
+        "1": (vermoegen_anpassen, None),
+        "2": (reserve_anpassen, None),
+        "3": (einkommen_anpassen, None),
+        "4": (fixkosten_waehlen, KOSTEN),
+        "5": (variable_kosten_waehlen, KOSTEN),
+        "6": (ergebnis_aktualisieren, HAUPTMENUE),
+        "7": (kontoauszug_importieren, None),
+    }, "Ungültige Wahl."),
+    KOSTEN: Menue(kosten_kopf, "Ihre Wahl (A/B/C/D/E): ", {
+        "A": (posten_hinzufuegen, None),
+        "B": (posten_aendern, None),
+        "C": (posten_loeschen, None),
+        "D": (ergebnis_aktualisieren, ANPASSEN),
+        "E": (posten_dynamik_festlegen, None),
+    }, "Ungültige Wahl."),
+}
+
+def menue_ausfuehren(sitzung, zustand=START, ende=ENDE):
+    """Führt die Menüs als Zustandsautomat aus, bis der Zustand 'ende' erreicht ist (Schleife statt Rekursion)."""
+    while zustand != ende:
+        menue = MENUES[zustand]
+        menue.kopf(sitzung)
+        uebergang = menue.uebergaenge.get(abfragen(menue.frage).upper().strip())
+        if uebergang is None:
+            anzeigen(menue.ungueltig)
+            continue
+        aktion, folgezustand = uebergang
+        if aktion is not None:
+            folgezustand = aktion(sitzung) or folgezustand
+        if folgezustand is not None:
+            zustand = folgezustand
+    return sitzung
+
+def start_programm():
+    """Startet das Programm und die Hauptschleife."""
+    willkommen_anzeigen()
+    menue_ausfuehren(Sitzung(), START, ENDE)
+
+def sitzung_abspielen(eingaben, ziel=None):
+    """Spielt eine aufgezeichnete Sitzung ohne Tastatur ab und gibt die Bildschirmausgabe als Text zurück (bzw. schreibt sie in 'ziel')."""
+    global EINGABE, AUSGABE
+    vorher = EINGABE, AUSGABE
+    protokoll = io.StringIO() if ziel is None else ziel
+    EINGABE, AUSGABE = AufzeichnungsEingabe(eingaben), Ausgabepuffer(protokoll)
+    try:
+        start_programm()
+    except EOFError:
+        anzeigen("\nKeine weiteren Eingaben. Programm wird beendet.")
+    finally:
+        AUSGABE.leeren()
+        EINGABE, AUSGABE = vorher
+    return protokoll.getvalue() if ziel is None else None
+
+def _zahlen_liste(text):
+    """Liest eine kommagetrennte Zahlenliste von der Kommandozeile (z.B. "5000,6000,7000")."""
+    try:
+        return [float(wert) for wert in text.split(",") if wert.strip()]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"'{text}' ist keine kommagetrennte Zahlenliste.")
+
+def _kosten_aenderung(text):
+    """Liest eine Kostenänderung in Prozent von der Kommandozeile (z.B. "Fixkosten=-10,0,10")."""
+    art, trenner, werte = text.partition("=")
+    if not trenner or art.strip() not in KOSTEN_ARTEN:
+        raise argparse.ArgumentTypeError(f"Erwartet KOSTENART=PROZENTE mit KOSTENART aus {', '.join(KOSTEN_ARTEN)}.")
+    return art.strip(), [wert / 100 for wert in _zahlen_liste(werte)]
+
+def _monat_argument(text):
+    """Liest einen Monat im Format JJJJ-MM von der Kommandozeile."""
+    try:
+        return monat_text(monat_nummer(*monat_parsen(text)))
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+
+def sensitivitaet_starten(argumente):
+    """Startet die Sensitivitätsanalyse für einen gespeicherten Account (Kommandozeile)."""
+    benutzerdaten = SPEICHER.laden(argumente.sensitivitaet)
+    if benutzerdaten is None:
+        anzeigen(f"Fehler: Datei '{argumente.sensitivitaet}' wurde nicht gefunden.")
+        sys.exit(1)
+    einkommen = argumente.einkommen
+    if einkommen is None:
+        brutto = benutzerdaten.get("Einkommen Brutto")
+        if not isinstance(brutto, (int, float)):
+            anzeigen("Fehler: Der Account hat kein Bruttoeinkommen. Bitte mit --einkommen angeben.")
+            sys.exit(1)
+        einkommen = [betrag_runden(brutto * faktor) for faktor in (0.8, 0.9, 1.0, 1.1, 1.2)]
+    alter = [int(wert) for wert in argumente.alter] if argumente.alter else [benutzerdaten.get("Alter", 30)]
+    sensitivitaet_ausgeben(benutzerdaten, einkommen, alter, dict(argumente.kosten_aenderung or []), argumente.ziel, argumente.ausgabe)
+
+def argumente_parsen(argumente=None):
+    """Liest die Kommandozeilen-Optionen ein (ohne Optionen startet das interaktive Programm)."""
+    parser = argparse.ArgumentParser(description="Budget-Planer")
+    parser.add_argument("--batch", metavar="VERZEICHNIS", help="Alle Accounts eines Verzeichnisses ohne Rückfragen auswerten")
+    parser.add_argument("--ausgabe", default=None, help="Ergebnisdatei für den Batch-Modus (Standard: batch_ergebnis.csv), die Monatsberichte oder die Sensitivitätsanalyse")
+    parser.add_argument("--format", choices=["csv", "jsonl"], default="csv", help="Format der Ergebnisdatei")
+    parser.add_argument("--szenarien", action="store_true", help="Vermögensprognose und Reichweite mitberechnen")
+    parser.add_argument("--jahre", type=int, default=10, help="Anzahl Jahre für die Vermögensprognose")
+    parser.add_argument("--prozesse", type=int, default=None, help="Anzahl Worker-Prozesse für Batch, Berichte und Server (Standard: alle Kerne)")
+    parser.add_argument("--berichte", metavar="QUELLE", help="Monatsberichte aller Accounts eines Verzeichnisses (oder einer Datei) in eine Datei schreiben")
+    parser.add_argument("--berichtformat", choices=list(BERICHT_FORMATE), default=None,
+                        help="Format der Monatsberichte (Standard: aus der Endung von --ausgabe, sonst text)")
+    parser.add_argument("--monat", type=_monat_argument, default=None,
+                        help="Monat im Titel der Berichte im Format JJJJ-MM (Standard: aktueller Monat)")
+    parser.add_argument("--server", metavar="[HOST:]PORT", help=f"HTTP/JSON-Schnittstelle starten (z.B. {API_STANDARD_PORT} oder 0.0.0.0:{API_STANDARD_PORT})")
+    parser.add_argument("--datenbank", metavar="DATEI", help="Accounts in dieser SQLite-Datenbank statt in Textdateien speichern")
+    parser.add_argument("--migrieren", metavar="VERZEICHNIS", help="Alle Textdateien eines Verzeichnisses in die Datenbank importieren")
+    parser.add_argument("--binaer", action="store_true", help="Accounts im kompakten Binärformat (.bin) statt als Textdatei speichern")
+    parser.add_argument("--konvertieren", metavar="VERZEICHNIS", help="Alle Textdateien eines Verzeichnisses ins Binärformat umwandeln")
+    parser.add_argument("--sensitivitaet", metavar="DATEI", help="Raster von Varianten (Einkommen, Alter, Kosten) für einen Account berechnen")
+    parser.add_argument("--einkommen", type=_zahlen_liste, help="Bruttoeinkommen pro Monat für die Sensitivitätsanalyse, z.B. 5000,6000,7000")
+    parser.add_argument("--alter", type=_zahlen_liste, help="Alter für die Sensitivitätsanalyse, z.B. 30,40,50")
+    parser.add_argument("--kosten-aenderung", type=_kosten_aenderung, action="append", metavar="KOSTENART=PROZENTE",
+                        help="Änderungen einer Kostenart in Prozent, z.B. Fixkosten=-10,0,10 (mehrfach möglich)")
+    parser.add_argument("--ziel", type=float, default=None, help="Sparziel in CHF für die Sensitivitätsanalyse")
+    parser.add_argument("--eingabe", metavar="DATEI", help="Aufgezeichnete Eingaben abspielen (.json-Liste oder eine Eingabe pro Zeile, '-' = alles von der Standardeingabe)")
+    parser.add_argument("--aufzeichnen", metavar="DATEI", help="Die Eingaben der Sitzung als JSON-Liste in diese Datei schreiben")
+    parser.add_argument("--profil", metavar="ZIEL", default=os.environ.get(PROFIL_UMGEBUNG),
+                        help=f"Laufzeiten messen und beim Ende exportieren: .json, .prom (Prometheus), .pstats (cProfile) oder '-' (Tabelle). Auch über {PROFIL_UMGEBUNG}")
+    return parser.parse_args(argumente)
+
+if __name__ == "__main__":
+    argumente = argumente_parsen()
+    if argumente.profil:
+        profil_starten(argumente.profil)
+    if argumente.datenbank:
+        SPEICHER = SqliteSpeicher(argumente.datenbank)
+    elif argumente.binaer:
+        SPEICHER = DateiSpeicher(binaer=True)
+    if argumente.konvertieren:
+        dateien_konvertieren(argumente.konvertieren)
+    elif argumente.migrieren:
+        if not argumente.datenbank:
+            anzeigen("Fehler: Für die Migration muss mit --datenbank eine Zieldatenbank angegeben werden.")
+            sys.exit(1)
+        text_dateien_migrieren(argumente.migrieren, SPEICHER)
+    elif argumente.batch:
+        batch_auswerten(argumente.batch, argumente.ausgabe or "batch_ergebnis.csv", argumente.format, argumente.szenarien, argumente.jahre, argumente.prozesse)
+    elif argumente.server:
+        api_server_starten(argumente.server, argumente.prozesse)
+    elif argumente.berichte:
+        bericht_format = argumente.berichtformat or bericht_format_erkennen(argumente.ausgabe or "")
+        berichte_erstellen(argumente.berichte, argumente.ausgabe or os.path.join(BERICHT_VERZEICHNIS, "monatsberichte" + BERICHT_ENDUNGEN[bericht_format]),
+                           bericht_format, argumente.monat, argumente.prozesse)
+    elif argumente.sensitivitaet:
+        sensitivitaet_starten(argumente)
+    else:
+        if argumente.eingabe == "-":
+            EINGABE = StdinEingabe()
+        elif argumente.eingabe:
+            EINGABE = AufzeichnungsEingabe.aus_datei(argumente.eingabe)
+        elif argumente.aufzeichnen:
+            EINGABE = InteraktiveEingabe(aufzeichnung=[])
+        try:
+            start_programm()
+        except EOFError:
+            anzeigen("\nKeine weiteren Eingaben. Programm wird beendet.")
+        finally:
+            if argumente.aufzeichnen and isinstance(EINGABE, InteraktiveEingabe):
+                with open(argumente.aufzeichnen, 'w', encoding='utf-8') as datei:
+                    json.dump(EINGABE.aufzeichnung, datei, ensure_ascii=False, indent=1)
+
 # Vorstellung durch Alessio
\ No newline at end of file
@@ -0,0 +1,183 @@
+"""Lasttest für die HTTP/JSON-Schnittstelle des Budget-Rechners (python Budget-Rechner.py --server PORT).
+Aufruf: python Lasttest.py [--adresse HOST:PORT] [--verbindungen 64] [--anfragen 20000] [--mix netto=3,finanzen=3,...]
+Ohne --adresse wird ein Server in einem temporären Verzeichnis gestartet und am Ende wieder beendet."""
+import os
+import sys
+import json
+import math
+import time
+import random
+import shutil
+import socket
+import asyncio
+import argparse
+import tempfile
+import subprocess
+
+PROGRAMM = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Budget-Rechner.py")
+STANDARD_MIX = "status=1,netto=3,finanzen=3,szenarien=2,konto_laden=2,konto_speichern=1"
+ANZAHL_KONTEN = 100 # Accounts, die vor der Messung gespeichert werden (für konto_laden und konto_speichern)
+VORRAT = 500 # Verschiedene vorbereitete Anfragen pro Art, damit der Client während der Messung kaum rechnet
+
+def konto_erzeugen(zufall, nummer, mit_dynamik=False):
+    """Ein zufälliger Account wie bei der Registrierung, auf Wunsch mit Teuerung (dann rechnet der Server im Prozess-Pool)."""
+    konto = {
+        "Name": f"Lasttest{nummer}", "Vorname": "Konto", "Alter": zufall.randint(18, 80),
+        "Aktuelles Gesamtvermögen": round(zufall.uniform(0, 100000), 2), "Finanzielle Reserve": round(zufall.uniform(0, 10000), 2),
+        "Einkommen Netto": round(zufall.uniform(3000, 12000), 2),
+        "Fixkosten": {f"Fixposten {i}": round(zufall.uniform(50, 1500), 2) for i in range(4)},
+        "Variable Kosten": {f"Posten {i}": round(zufall.uniform(5, 500), 2) for i in range(8)},
+    }
+    if mit_dynamik:
+        konto["Kosten Dynamik"] = {"Fixkosten": {"Fixposten 0": {"wachstum": 0.02}}}
+    return konto
+
+def anfrage(methode, pfad, inhalt=None):
+    """Die Bytes einer HTTP/1.1-Anfrage mit Keep-Alive."""
+    daten = b"" if inhalt is None else json.dumps(inhalt).encode("utf-8")
+    return f"{methode} {pfad} HTTP/1.1\r\nHost: lasttest\r\nContent-Length: {len(daten)}\r\n\r\n".encode("latin-1") + daten
+
+def anfragen_vorbereiten(zufall, art):
+    """Ein Vorrat an verschiedenen Anfragen einer Art."""
+    vorrat = []
+    for nummer in range(VORRAT):
+        konto = konto_erzeugen(zufall, nummer % ANZAHL_KONTEN, mit_dynamik=nummer % 2 == 0)
+        if art == "status":
+            vorrat.append(anfrage("GET", "/status"))
+        elif art == "netto":
+            vorrat.append(anfrage("POST", "/netto", {"einkommen": round(zufall.uniform(0, 15000), 2), "alter": zufall.randint(18, 80)}))
+        elif art == "finanzen":
+            vorrat.append(anfrage("POST", "/finanzen", konto))
+        elif art == "szenarien":
+            vorrat.append(anfrage("POST", "/szenarien", {"konto": konto, "jahre": zufall.randint(1, 40), "ziel": 50000}))
+        elif art == "simulation":
+            vorrat.append(anfrage("POST", "/simulation", {"konto": konto, "jahre": 10, "pfade": 1000, "seed": nummer}))
+        elif art == "konto_laden":
+            vorrat.append(anfrage("GET", f"/konten/Lasttest{nummer % ANZAHL_KONTEN}/Konto"))
+        elif art == "konto_speichern":
+            vorrat.append(anfrage("PUT", "/konten", konto))
+        else:
+            raise ValueError(f"Unbekannte Anfrageart '{art}'.")
+    return vorrat
+
+def mix_lesen(text):
+    """Liest die Gewichtung der Anfragearten, z.B. "netto=3,finanzen=1"."""
+    mix = {}
+    for teil in text.split(","):
+        art, _, gewicht = teil.partition("=")
+        mix[art.strip()] = int(gewicht or 1)
+    return mix
+
+async def verbindung_belasten(host, port, anfragen, latenzen, statuscodes):
+    """Schickt die Anfragen einer Verbindung nacheinander (Keep-Alive) und misst die Latenz jeder Antwort."""
+    reader, writer = await asyncio.open_connection(host, port)
+    uhr = time.perf_counter_ns
+    try:
+        for art, rohdaten in anfragen:
+            start = uhr()
+            writer.write(rohdaten)
+            kopf = await reader.readuntil(b"\r\n\r\n")
+            laenge = 0
+            for zeile in kopf.split(b"\r\n"):
+                if zeile[:15].lower() == b"content-length:":
+                    laenge = int(zeile[15:])
+            await reader.readexactly(laenge)
+            latenzen[art].append(uhr() - start)
+            status = int(kopf[9:12])
+            statuscodes[status] = statuscodes.get(status, 0) + 1
+    finally:
+        writer.close()
+
+async def json_abfragen(host, port, methode, pfad, inhalt=None):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        writer.write(anfrage(methode, pfad, inhalt))
+        kopf = await reader.readuntil(b"\r\n\r\n")
+        laenge = next(int(zeile[15:]) for zeile in kopf.split(b"\r\n") if zeile[:15].lower() == b"content-length:")
+        return int(kopf[9:12]), json.loads(await reader.readexactly(laenge))
+    finally:
+        writer.close()
+
+def perzentil(sortiert, anteil):
+    return sortiert[min(len(sortiert) - 1, max(0, math.ceil(anteil * len(sortiert)) - 1))]
+
+async def lasttest(host, port, verbindungen, anzahl, mix, seed=42):
+    zufall = random.Random(seed)
+    for nummer in range(ANZAHL_KONTEN):
+        status, _ = await json_abfragen(host, port, "PUT", "/konten", konto_erzeugen(zufall, nummer))
+        if status != 200:
+            raise RuntimeError(f"Vorbereitung fehlgeschlagen: PUT /konten lieferte {status}")
+    vorraete = {art: anfragen_vorbereiten(zufall, art) for art in mix}
+    arten = zufall.choices(list(mix), weights=list(mix.values()), k=anzahl)
+    anfragen = [(art, vorraete[art][nummer % VORRAT]) for nummer, art in enumerate(arten)]
+    latenzen = {art: [] for art in mix}
+    statuscodes = {}
+
+    start = time.perf_counter()
+    await asyncio.gather(*(verbindung_belasten(host, port, anfragen[nummer::verbindungen], latenzen, statuscodes)
+                           for nummer in range(verbindungen)))
+    dauer = time.perf_counter() - start
+
+    print(f"{anzahl:,} Anfragen über {verbindungen} Verbindungen in {dauer:.2f} s: {anzahl / dauer:,.0f} Anfragen/s")
+    print(f"Statuscodes: {', '.join(f'{status}: {anzahl_status}' for status, anzahl_status in sorted(statuscodes.items()))}")
+    print(f"{'Art':<16} {'Anzahl':>8} {'p50':>10} {'p95':>10} {'p99':>10} {'max':>10}   (Latenz beim Client)")
+    for art, werte in latenzen.items():
+        if werte:
+            werte.sort()
+            spalten = " ".join(f"{perzentil(werte, anteil) / 1e6:>8.2f}ms" for anteil in (0.50, 0.95, 0.99, 1.0))
+            print(f"{art:<16} {len(werte):>8} {spalten}")
+    _, metriken = await json_abfragen(host, port, "GET", "/metriken")
+    print(f"{'Route':<16} {'Anzahl':>8} {'p50':>10} {'p95':>10} {'p99':>10} {'max':>10}   (Bearbeitung im Server)")
+    for route, werte in metriken["anfragen"].items():
+        spalten = " ".join(f"{werte[key] * 1e3:>8.2f}ms" for key in ("p50_s", "p95_s", "p99_s", "max_s"))
+        print(f"{route:<16} {werte['aufrufe']:>8} {spalten}")
+    return 0 if all(status < 400 for status in statuscodes) else 1
+
+def freier_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def server_starten(verzeichnis, prozesse):
+    """Startet einen Server in einem eigenen Verzeichnis und wartet, bis er Verbindungen annimmt."""
+    port = freier_port()
+    befehl = [sys.executable, PROGRAMM, "--server", f"127.0.0.1:{port}"] + (["--prozesse", str(prozesse)] if prozesse else [])
+    prozess = subprocess.Popen(befehl, cwd=verzeichnis, stdout=subprocess.DEVNULL)
+    frist = time.monotonic() + 15
+    while time.monotonic() < frist:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=1).close()
+            return prozess, port
+        except OSError:
+            if prozess.poll() is not None:
+                break
+            time.sleep(0.05)
+    prozess.kill()
+    raise RuntimeError("Der Server konnte nicht gestartet werden.")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Lasttest für python Budget-Rechner.py --server")
+    parser.add_argument("--adresse", metavar="HOST:PORT", help="Laufenden Server testen (Achtung: speichert Lasttest-Accounts dort)")
+    parser.add_argument("--verbindungen", type=int, default=64, help="Gleichzeitige Verbindungen")
+    parser.add_argument("--anfragen", type=int, default=20_000, help="Anzahl Anfragen insgesamt")
+    parser.add_argument("--mix", type=mix_lesen, default=mix_lesen(STANDARD_MIX),
+                        help=f"Gewichtung der Anfragearten (Standard: {STANDARD_MIX}; zusätzlich: simulation)")
+    parser.add_argument("--prozesse", type=int, default=None, help="Worker-Prozesse des gestarteten Servers")
+    argumente = parser.parse_args()
+
+    prozess = verzeichnis = None
+    if argumente.adresse:
+        host, _, port = argumente.adresse.rpartition(":")
+        host, port = host or "127.0.0.1", int(port)
+    else:
+        verzeichnis = tempfile.mkdtemp(prefix="budget_lasttest_")
+        prozess, port = server_starten(verzeichnis, argumente.prozesse)
+        host = "127.0.0.1"
+    try:
+        exit_code = asyncio.run(lasttest(host, port, argumente.verbindungen, argumente.anfragen, argumente.mix))
+    finally:
+        if prozess is not None:
+            prozess.terminate()
+            prozess.wait(timeout=15)
+            shutil.rmtree(verzeichnis)
+    sys.exit(exit_code)
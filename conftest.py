@@ -0,0 +1,38 @@
+"""Gemeinsame Fixtures für die Tests (Aufruf: python -m pytest)."""
+import os
+import sys
+import importlib.util
+
+import pytest
+
+def budget_modul_laden():
+    """Lädt Budget-Rechner.py als Modul (der Bindestrich im Dateinamen verhindert einen normalen Import)."""
+    pfad = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Budget-Rechner.py")
+    spec = importlib.util.spec_from_file_location("budget_rechner", pfad)
+    modul = importlib.util.module_from_spec(spec)
+    sys.modules["budget_rechner"] = modul
+    spec.loader.exec_module(modul)
+    return modul
+
+@pytest.fixture(scope="session")
+def budget():
+    return budget_modul_laden()
+
+@pytest.fixture
+def verzeichnis(tmp_path, monkeypatch):
+    """Ein leeres Arbeitsverzeichnis: Accounts, Index und Verlauf werden relativ dazu gespeichert."""
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+@pytest.fixture
+def konto(budget):
+    """Ein Account wie nach der Registrierung (mit Umlauten in Namen und Kostenpunkten)."""
+    benutzerdaten = {
+        "Vorname": "Anna", "Name": "Müller", "Alter": 34,
+        "Aktuelles Gesamtvermögen": 25000.0, "Finanzielle Reserve": 5000.0,
+        "Einkommen Netto": 6200.0, "Einkommen Brutto": "nicht anwendbar",
+        "Fixkosten": {"Wohnkosten (Miete/Hypothekarzins)": 1850.0, "Krankenkasse/Versicherungen": 412.35},
+        "Variable Kosten": {"Lebensmittel": 650.0, "Öffentlicher Verkehr": 86.5},
+    }
+    budget.gesamtkosten_berechnen(benutzerdaten)
+    return budget.finanzen_berechnen(benutzerdaten)
@@ -0,0 +1,76 @@
+"""Binärformat: Text -> Binär -> Laden ergibt dieselben Daten, auch für Dateien der Schema-Version 1."""
+import json
+import struct
+
+import pytest
+
+def besonderer_account(budget):
+    """Unicode in Namen und Posten, eine leere Kostenliste und Felder, die im JSON-Anhang landen."""
+    benutzerdaten = {
+        "Vorname": "Zoë", "Name": "Müller-Lüdenscheidt 李", "Alter": 58,
+        "Aktuelles Gesamtvermögen": 123456.78, "Finanzielle Reserve": 0.0,
+        "Einkommen Netto": 7310.05, "Einkommen Brutto": "nicht anwendbar",
+        "Fixkosten": {"Wohnkosten (Miete/Hypothekarzins)": 2105.4, "Krankenkasse – Zusatz 🩺": 98.15},
+        "Variable Kosten": {},
+        "Kosten Dynamik": {"Fixkosten": {"Wohnkosten (Miete/Hypothekarzins)": {"wachstum": 0.015}}},
+        "Sparziele": [{"name": "Velo", "kosten": 1500.0, "prioritaet": 1}],
+    }
+    budget.gesamtkosten_berechnen(benutzerdaten)
+    return budget._als_dict(budget.finanzen_berechnen(benutzerdaten))
+
+@pytest.mark.parametrize("besonders", [True, False], ids=["besonders", "registrierung"])
+def test_text_binaer_laden(budget, verzeichnis, konto, besonders):
+    benutzerdaten = besonderer_account(budget) if besonders else budget._als_dict(konto)
+    dateiname = f"{benutzerdaten['Name']}_{benutzerdaten['Vorname']}"
+    budget.datei_schreiben(dateiname + budget.DATEI_ENDUNG, benutzerdaten)
+    aus_text = budget.konto_datei_laden(dateiname + budget.DATEI_ENDUNG)
+    assert aus_text == benutzerdaten
+
+    assert budget.dateien_konvertieren(".") == (1, 0)
+    aus_binaer = budget.konto_datei_laden(dateiname + budget.DATEI_ENDUNG_BINAER)
+    assert aus_binaer == aus_text
+    assert budget._als_dict(budget.DateiSpeicher().laden(dateiname + budget.DATEI_ENDUNG_BINAER)) == aus_text
+
+def test_kostenliste_binaer(budget, verzeichnis):
+    benutzerdaten = besonderer_account(budget)
+    benutzerdaten["Fixkosten"] = budget.Kostenliste(benutzerdaten["Fixkosten"]) # Beträge direkt als Rappen geschrieben
+    budget.binaer_schreiben("Konto.bin", benutzerdaten)
+    assert budget.binaer_lesen("Konto.bin") == budget._als_dict(benutzerdaten)
+
+def version_1_packen(benutzerdaten):
+    """Eine Datei der Schema-Version 1 von Hand gepackt: Beträge der Kostenpunkte als double in CHF."""
+    zahlen = ["Alter", "Aktuelles Gesamtvermögen", "Finanzielle Reserve", "Einkommen Netto", "Einkommen Brutto",
+              "Monatliche Gesamtkosten", "Monatliches Ergebnis"]
+    maske = 0
+    for bit, key in enumerate(zahlen + ["Vorname", "Name", "Fixkosten", "Variable Kosten"]):
+        wert = benutzerdaten.get(key)
+        if wert is not None and (key not in zahlen or not isinstance(wert, str)): # "nicht anwendbar" steht im Anhang
+            maske |= 1 << bit
+    daten = struct.pack("<4sHH7d", b"BUDB", 1, maske,
+                        *(float(benutzerdaten[key]) if maske & (1 << bit) else 0.0 for bit, key in enumerate(zahlen)))
+    for key in ("Vorname", "Name"):
+        text = benutzerdaten[key].encode("utf-8")
+        daten += struct.pack("<H", len(text)) + text
+    for art in ("Fixkosten", "Variable Kosten"):
+        kosten = benutzerdaten.get(art, {})
+        namen = "\0".join(kosten).encode("utf-8")
+        daten += struct.pack("<II", len(kosten), len(namen)) + namen + struct.pack(f"<{len(kosten)}d", *kosten.values())
+    weitere = {key: wert for key, wert in benutzerdaten.items()
+               if key not in ("Vorname", "Name", "Fixkosten", "Variable Kosten") and not (key in zahlen and maske & (1 << zahlen.index(key)))}
+    anhang = json.dumps(weitere).encode("utf-8")
+    return daten + struct.pack("<I", len(anhang)) + anhang
+
+def test_version_1_wird_gelesen(budget, verzeichnis):
+    benutzerdaten = besonderer_account(budget)
+    with open("Alt_Konto.bin", 'wb') as datei:
+        datei.write(version_1_packen(benutzerdaten))
+    assert budget.konto_datei_laden("Alt_Konto.bin") == benutzerdaten
+
+def test_neuere_version_und_beschaedigte_datei(budget, verzeichnis, konto):
+    budget.binaer_schreiben("Konto.bin", konto)
+    with open("Konto.bin", 'rb') as datei:
+        daten = datei.read()
+    with pytest.raises(ValueError, match="Schema-Version"):
+        budget.binaer_auswerten(daten[:4] + struct.pack("<H", budget.BINAER_VERSION + 1) + daten[6:])
+    with pytest.raises(ValueError, match="unvollständig"):
+        budget.binaer_auswerten(daten[:len(daten) // 2])
@@ -0,0 +1,78 @@
+"""Änderungsjournal: Speichern nur der Änderungen, abgebrochene Zeilen nach einem Absturz und Kompaktierung."""
+import os
+import json
+
+import pytest
+
+@pytest.fixture(params=[False, True], ids=["text", "binaer"])
+def speicher(request, budget, verzeichnis):
+    return budget.DateiSpeicher(binaer=request.param)
+
+def aendern(budget, benutzerdaten, nummer=1):
+    """Ändert einen Kostenpunkt, löscht einen und setzt ein Feld neu, wie es das Menü tun würde."""
+    benutzerdaten = budget._stand_kopieren(benutzerdaten)
+    benutzerdaten["Fixkosten"]["Wohnkosten (Miete/Hypothekarzins)"] = 1850.0 + nummer
+    benutzerdaten["Variable Kosten"].pop("Öffentlicher Verkehr", None)
+    benutzerdaten["Variable Kosten"][f"Ferien {nummer % 3}"] = 120.0 + nummer
+    benutzerdaten["Aktuelles Gesamtvermögen"] = 25000.0 + nummer
+    budget.gesamtkosten_berechnen(benutzerdaten)
+    return budget.finanzen_berechnen(benutzerdaten)
+
+def frisch_laden(budget, dateiname):
+    """Lädt ohne Cache (wie ein anderer Prozess) und gibt die Daten als normale Dictionaries zurück."""
+    return budget._als_dict(budget.DateiSpeicher().laden(dateiname))
+
+def journal_zeilen(dateiname, budget):
+    with open(dateiname + budget.JOURNAL_ENDUNG, 'rb') as datei:
+        return datei.read().split(b"\n")
+
+def test_speichern_aendern_speichern_laden(budget, speicher, konto):
+    dateiname = speicher.speichern(konto)
+    snapshot = os.path.getsize(dateiname)
+    geaendert = aendern(budget, konto)
+    assert speicher.speichern(geaendert) == dateiname
+
+    assert os.path.getsize(dateiname) == snapshot # Nur das Journal ist gewachsen
+    assert os.path.exists(dateiname + budget.JOURNAL_ENDUNG)
+    assert frisch_laden(budget, dateiname) == budget._als_dict(geaendert)
+
+def test_unveraendert_speichern_schreibt_nichts(budget, speicher, konto):
+    dateiname = speicher.speichern(konto)
+    speicher.speichern(aendern(budget, konto))
+    vorher = budget._datei_signatur(dateiname)
+    assert speicher.speichern(aendern(budget, konto)) is None
+    assert budget._datei_signatur(dateiname) == vorher
+
+def test_abgebrochene_zeile_wird_ignoriert_und_entfernt(budget, speicher, konto):
+    dateiname = speicher.speichern(konto)
+    erste_aenderung = aendern(budget, konto, 1)
+    speicher.speichern(erste_aenderung)
+    with open(dateiname + budget.JOURNAL_ENDUNG, 'ab') as datei:
+        datei.write(b'{"feld": "Aktuelles Gesamtverm') # Absturz mitten im Schreiben
+
+    assert frisch_laden(budget, dateiname) == budget._als_dict(erste_aenderung)
+
+    zweite_aenderung = aendern(budget, erste_aenderung, 2)
+    speicher.speichern(zweite_aenderung)
+    zeilen = journal_zeilen(dateiname, budget)
+    assert zeilen[-1] == b""
+    for zeile in zeilen[:-1]:
+        json.loads(zeile) # Die abgebrochene Zeile ist nicht mit dem neuen Eintrag verschmolzen
+    assert frisch_laden(budget, dateiname) == budget._als_dict(zweite_aenderung)
+
+def test_kompaktierung_wenn_das_journal_groesser_wird_als_der_stand(budget, speicher, konto):
+    dateiname = speicher.speichern(konto)
+    benutzerdaten = konto
+    kompaktiert = False
+    for nummer in range(1, 500):
+        benutzerdaten = aendern(budget, benutzerdaten, nummer)
+        journal_vorher = os.path.exists(dateiname + budget.JOURNAL_ENDUNG)
+        speicher.speichern(benutzerdaten)
+        if journal_vorher and not os.path.exists(dateiname + budget.JOURNAL_ENDUNG):
+            kompaktiert = True
+            break
+        groesse = os.path.getsize(dateiname + budget.JOURNAL_ENDUNG)
+        assert groesse <= max(budget.JOURNAL_MIN_BYTES, os.path.getsize(dateiname)) # Sonst hätte kompaktiert werden müssen
+    assert kompaktiert
+    assert frisch_laden(budget, dateiname) == budget._als_dict(benutzerdaten)
+    assert budget._als_dict(budget._snapshot_laden(dateiname)) == budget._als_dict(benutzerdaten) # Alles steht im Stand selbst
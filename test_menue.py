@@ -0,0 +1,63 @@
+"""Sehr viele An- und Abmeldungen in einer Sitzung: konstante Stacktiefe und konstanter Speicher."""
+import sys
+import itertools
+import tracemalloc
+
+import pytest
+
+ZYKLEN = 100_000
+
+class Protokollzaehler:
+    """Zählt die Anmeldungen in der Bildschirmausgabe, ohne sie zu behalten (100'000 Zyklen ergäben Hunderte MB Text)."""
+
+    def __init__(self):
+        self.anmeldungen = 0
+        self.letzter_text = ""
+
+    def write(self, text):
+        self.anmeldungen += text.count("erfolgreich geladen.")
+        self.letzter_text = text
+
+    def flush(self):
+        pass
+
+def sitzung(budget, dateiname, zyklen):
+    """Anmelden, Ergebnis anzeigen, abmelden, und am Schluss das Programm beenden."""
+    eingaben = itertools.chain(itertools.chain.from_iterable(itertools.repeat(("2", dateiname, "1", "6"), zyklen)), ["3"])
+    protokoll = Protokollzaehler()
+    budget.sitzung_abspielen(eingaben, protokoll)
+    return protokoll
+
+@pytest.fixture
+def dateiname(budget, verzeichnis, konto):
+    return budget.DateiSpeicher().speichern(konto)
+
+@pytest.fixture
+def tiefes_limit():
+    """Wenig Spielraum über der aktuellen Stacktiefe: ein rekursives Abmelden bräche nach wenigen Zyklen ab."""
+    vorher = sys.getrecursionlimit()
+    tiefe = 0
+    rahmen = sys._getframe()
+    while rahmen is not None:
+        tiefe += 1
+        rahmen = rahmen.f_back
+    sys.setrecursionlimit(tiefe + 200)
+    yield
+    sys.setrecursionlimit(vorher)
+
+def test_viele_anmeldungen_in_einer_sitzung(budget, dateiname, tiefes_limit):
+    protokoll = sitzung(budget, dateiname, ZYKLEN)
+    assert protokoll.anmeldungen == ZYKLEN
+    assert protokoll.letzter_text.rstrip().endswith("Auf Wiedersehen!")
+
+def test_speicher_waechst_nicht_mit_den_zyklen(budget, dateiname, tiefes_limit):
+    tracemalloc.start()
+    try:
+        assert sitzung(budget, dateiname, 1000).anmeldungen == 1000
+        speicher_kurz = tracemalloc.get_traced_memory()[1]
+        tracemalloc.reset_peak()
+        assert sitzung(budget, dateiname, 10 * 1000).anmeldungen == 10 * 1000
+        speicher_lang = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    assert speicher_lang <= speicher_kurz * 1.2, f"Speicherspitze wächst mit den Zyklen: {speicher_kurz} -> {speicher_lang} Bytes"